@@ -0,0 +1,259 @@
+"""
+candidate_store.py
+
+In-process candidate (prosody) store shared by the rhyme engine tools.
+
+- Loads data_paths.STORE_PATH (stress_dictionary.json in the user's data
+  dir, never the package dir) when present (same formats as rhyme_engine):
+    * word -> {stress,vowels,syllables}
+    * word -> [ {..}, {..}, ... ]
+- Otherwise builds the same structure from the CMU data `pronouncing` loads.
+- Loaded once per process per path (load_candidate_store is cached).
+- Every prosody carries a "pos" bitmask (POS_BITS) from the bundled NLTK
+  tagger. Tagging runs once, when the store is built; the tagged store is
+  written back to stress_dictionary.json, so queries only test bits.
+
+Examples (from the repository root):
+    python -m Rhyme_engine.candidate_store --build
+    python -m Rhyme_engine.candidate_store --word fire
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import nltk
+import pronouncing
+
+from Rhyme_engine.data_paths import STORE_PATH
+from Rhyme_engine.phonetic_lexicon import prosody_from_phones
+from Rhyme_engine.rhyme_engine import Prosody, as_prosody_list, load_json, setup_nltk
+
+DEFAULT_DB_PATH = STORE_PATH
+
+CandidateStore = Dict[str, List[Prosody]]
+
+# Coarse part-of-speech bits stored per word under prosody["pos"].
+POS_BITS: Dict[str, int] = {
+    "noun": 1, "verb": 2, "adj": 4, "adv": 8,
+    "pron": 16, "det": 32, "prep": 64, "conj": 128,
+    "num": 256, "intj": 512, "other": 1024,
+}
+
+# Penn Treebank tag -> coarse name; prefixes cover NN/NNS/NNP, VB/VBD/..., JJ/JJR/JJS, RB/RBR/RBS.
+_PENN_PREFIX = {"NN": "noun", "VB": "verb", "JJ": "adj", "RB": "adv"}
+_PENN_EXACT = {
+    "MD": "verb", "WRB": "adv",
+    "PRP": "pron", "PRP$": "pron", "WP": "pron", "WP$": "pron", "EX": "pron",
+    "DT": "det", "PDT": "det", "WDT": "det",
+    "IN": "prep", "TO": "prep", "RP": "prep",
+    "CC": "conj", "CD": "num", "UH": "intj",
+}
+# a word's tags weaker than this share of its strongest are left out ("good" JJ, not RB)
+TAG_SHARE = 0.4
+
+
+def usable_word(word: str, phones: str) -> bool:
+    """
+    True for CMU entries worth offering as candidates.
+    Skips abbreviations ("a.m."), clitics ("'m"), hyphenated compounds,
+    stray letters and vowel-less interjections ("mm", "hmm").
+    """
+    if len(word) == 1:
+        return word in {"a", "i"}
+    if word.startswith("'") or not any(ch.isdigit() for ch in phones):
+        return False
+    return word.replace("'", "").isalpha()
+
+
+@lru_cache(maxsize=1)
+def common_words() -> frozenset:
+    """Frequent words from the bundled NLTK tagger, used as a cheap 'is this a normal word' prior."""
+    path = Path(__file__).parent / "nltk_data" / "taggers" / "averaged_perceptron_tagger_eng" / "averaged_perceptron_tagger_eng.tagdict.json"
+    return frozenset(w.lower() for w in load_json(path))
+
+
+# -----------------------------
+# Part of speech
+# -----------------------------
+def penn_to_bit(tag: str) -> int:
+    name = _PENN_EXACT.get(tag) or _PENN_PREFIX.get(tag[:2], "other")
+    return POS_BITS[name]
+
+
+def pos_mask(pos: Optional[Union[str, Iterable[str]]]) -> int:
+    """
+    "verb" / "noun|adj" / ["noun", "adj"] -> bitmask; None or "" -> 0 (no filter).
+    Raises ValueError for unknown names.
+    """
+    if not pos:
+        return 0
+    names = pos.split("|") if isinstance(pos, str) else list(pos)
+    mask = 0
+    for name in names:
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in POS_BITS:
+            raise ValueError(f"Unknown part of speech {name!r}; expected one of {', '.join(POS_BITS)}")
+        mask |= POS_BITS[name]
+    return mask
+
+
+def pos_names(mask: int) -> List[str]:
+    return [name for name, bit in POS_BITS.items() if mask & bit]
+
+
+def load_tagger():
+    """The bundled averaged perceptron tagger (falls back to the zip when the folder lacks weights)."""
+    from nltk.tag.perceptron import PerceptronTagger
+
+    setup_nltk()
+    try:
+        return PerceptronTagger()
+    except Exception:
+        loc = nltk.data.find("taggers/averaged_perceptron_tagger_eng.zip/averaged_perceptron_tagger_eng/")
+        tagger = PerceptronTagger(load=False)
+        tagger.load_from_json("eng", loc)
+        return tagger
+
+
+def _lexical_scores(weights: Dict[str, Dict[str, float]], word: str) -> Dict[str, float]:
+    """Tagger class scores from the word's own features only (no neighbours)."""
+    scores: Dict[str, float] = {}
+    for feat in ("bias", "i suffix " + word[-3:], "i pref1 " + word[0], "i word " + word):
+        for tag, w in weights.get(feat, {}).items():
+            scores[tag] = scores.get(tag, 0.0) + w
+    return scores
+
+
+def tag_words(words: Iterable[str]) -> Dict[str, int]:
+    """
+    word -> POS bitmask, read straight from the tagger's model instead of
+    tagging sentences (a bare word has no context, so tag() says NN for
+    almost everything):
+    - words in the tagdict (unambiguous in training) take that tag;
+    - words seen in training take the tags their "i word" feature favours,
+      down to TAG_SHARE of the strongest ("use" -> noun|verb, "good" -> adj);
+    - anything else takes the best tag from its suffix/prefix features.
+    """
+    tagger = load_tagger()
+    weights = tagger.model.weights
+    tagdict = {w.lower(): t for w, t in tagger.tagdict.items()}
+    out: Dict[str, int] = {}
+    for word in words:
+        if word in tagdict:
+            out[word] = penn_to_bit(tagdict[word])
+            continue
+        mask = 0
+        favoured = {tag: w for tag, w in weights.get("i word " + word, {}).items() if w > 0}
+        for tag, w in favoured.items():
+            if w >= TAG_SHARE * max(favoured.values()):
+                mask |= penn_to_bit(tag)
+        if not mask:
+            scores = _lexical_scores(weights, word)
+            mask = penn_to_bit(max(scores, key=scores.get)) if scores else POS_BITS["other"]
+        out[word] = mask
+    return out
+
+
+# -----------------------------
+# Store
+# -----------------------------
+def build_from_cmu() -> CandidateStore:
+    pronouncing.init_cmu()
+    store: CandidateStore = {}
+    seen = set()
+    for word, phones in pronouncing.pronunciations:
+        if not usable_word(word, phones):
+            continue
+        p = prosody_from_phones(phones)
+        key = (word, tuple(p["stress"]), tuple(p["vowels"]))
+        if key in seen:
+            continue
+        seen.add(key)
+        store.setdefault(word, []).append(p)
+    return store
+
+
+def tag_store(store: CandidateStore, retag: bool = False) -> None:
+    """Add the "pos" bitmask to every prosody that lacks one, or to all with `retag` (in place)."""
+    todo = [w for w, pros in store.items() if retag or any("pos" not in p for p in pros)]
+    if not todo:
+        return
+    masks = tag_words(todo)
+    for word in todo:
+        for p in store[word]:
+            p["pos"] = masks[word]
+
+
+def save_store(path: Path, store: CandidateStore) -> None:
+    # compact: the store is ~125k entries and only ever read by code
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(store, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_store(db_path: Optional[Path] = None) -> CandidateStore:
+    """Build (or re-tag) the store and write it, and its rhyme families, to disk."""
+    path = store_path(db_path)
+    raw = load_json(path)
+    store = {w: as_prosody_list(v) for w, v in raw.items()} if raw else build_from_cmu()
+    tag_store(store, retag=True)
+    save_store(path, store)
+
+    from Rhyme_engine.rhyme_families import build_families, save_families
+    save_families(path, build_families(store))
+    return store
+
+
+def store_path(db_path: Optional[Path] = None) -> Path:
+    """Resolved store path; use it as the cache key for anything derived from the store."""
+    return Path(db_path or DEFAULT_DB_PATH)
+
+
+def load_candidate_store(db_path: Optional[Path] = None) -> CandidateStore:
+    """
+    word -> [Prosody, ...] for every candidate.
+    Cached per path: callers share one dict, so treat it as read-only.
+    """
+    return _load_candidate_store(store_path(db_path))
+
+
+@lru_cache(maxsize=4)
+def _load_candidate_store(path: Path) -> CandidateStore:
+    raw = load_json(path)
+    store = {w: as_prosody_list(v) for w, v in raw.items()} if raw else build_from_cmu()
+    if any("pos" not in p for pros in store.values() for p in pros):
+        # first run (or an older, untagged file): tag once and persist
+        try:
+            tag_store(store)
+            save_store(path, store)
+        except (RuntimeError, LookupError, OSError) as e:
+            logging.debug(f"POS tagging skipped: {e}")
+    return store
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--db", default=None)
+    p.add_argument("--build", action="store_true", help="build/tag the store and write it to --db")
+    p.add_argument("--word", default=None, help="show the stored prosodies for a word")
+    args = p.parse_args()
+
+    if args.build:
+        store = build_store(args.db)
+        print(f"Wrote {len(store)} words to {store_path(args.db)}")
+    if args.word:
+        store = load_candidate_store(args.db)
+        for pros in store.get(args.word.lower(), []):
+            print(pros, pos_names(pros.get("pos", 0)))
+
+
+if __name__ == "__main__":
+    main()
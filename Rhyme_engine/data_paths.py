@@ -0,0 +1,19 @@
+"""
+data_paths.py
+
+Where the rhyme engine keeps the files it writes. The package directory is
+read-only to it: shipped data (g2p_cache.json, nltk_data) is read from
+there, everything generated or learned goes under DATA_DIR (the candidate
+store, its rhyme families, kept G2P guesses).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).parent
+DATA_DIR = Path.home() / ".lyrical_lab" / "rhyme_engine"
+
+PACKAGED_G2P_CACHE = PACKAGE_DIR / "g2p_cache.json"  # shipped guesses, never written
+USER_G2P_CACHE = DATA_DIR / "g2p_cache.json"          # guesses kept from saved lyrics and lookups
+STORE_PATH = DATA_DIR / "stress_dictionary.json"      # candidate store, built from CMU on first use
@@ -0,0 +1,641 @@
+"""
+line_filler.py
+
+Syllable-budgeted line filler: finds word sequences that fit a stress template
+and (optionally) end on a rhyme.
+
+    fill_line("u-S-u-S", rhyme_with="night")
+    -> [("it made the light", ...), ...]
+
+Template syntax (separators "-", " ", "|" are ignored):
+    S / s / 1   stressed syllable
+    u / U / 0   unstressed syllable
+    x / ? / *   either
+
+How it stays interactive:
+- Every candidate's stress pattern is reduced to (syllables, bits) and the
+  store is bucketed by it once per process (_filler_index). A template slice
+  is then a handful of dict lookups instead of a scan.
+- Buckets hold real, reasonably frequent words only (word_frequency():
+  wordfreq's Zipf scale when installed, else the rank in
+  common_english.txt), pre-sorted by frequency, so only the first
+  `per_bucket` words of each bucket are ever expanded. Rare words can
+  still end a line as the rhyme.
+- Beam search over template positions keeps the best `beam` partial lines.
+- End rhymes come from pronouncing's rhyme index (CMU perfect rhymes), and
+  only those whose stress key fits the last template slice are expanded.
+- Word scores are per syllable, so a line of filler monosyllables does not
+  outscore a line of fewer, longer words. Function words (pronouns,
+  determiners, prepositions, conjunctions) score low, and each one after
+  the first costs extra.
+- Adjacent words must make a phrase (PAIR_SCORES, follows()): "the need"
+  scores, "to a" and "the in" never occur; verbs agree with their subject
+  and auxiliary ("it uses", "will use"), and a clause gets one verb unless
+  a conjunction opens another. Lines that differ only in function words
+  ("the fire" / "my fire") are shown once.
+Examples (from the repository root):
+    python -m Rhyme_engine.line_filler --template u-S-u-u-S --rhyme fire
+    python -m Rhyme_engine.line_filler --template SuSuSu --top 5
+    python -m Rhyme_engine.line_filler --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from Rhyme_engine.candidate_store import POS_BITS, common_words, load_candidate_store, pos_names, store_path
+import pronouncing
+
+from Rhyme_engine.rhyme_engine import Prosody, deterministic_jitter
+
+try:
+    from wordfreq import zipf_frequency  # type: ignore
+    _WORDFREQ_AVAILABLE = True
+except Exception:
+    zipf_frequency = None
+    _WORDFREQ_AVAILABLE = False
+
+StressKey = Tuple[int, int]  # (syllables, bits); bit i set = syllable i (left to right) stressed
+Template = Tuple[int, int, int]  # (syllables, bits, care_mask)
+
+MONO_FLEX_PENALTY = 0.5  # a one-syllable word sitting on the "wrong" stress
+
+COMMON_ENGLISH_PATH = Path(__file__).parent / "common_english.txt"
+MIN_ZIPF = 3.0          # rarer words are left out of the line body (they may still rhyme)
+FUNCTION_PRIOR = 0.5    # per-syllable prior of the most frequent function word ("the")
+FUNCTION_REPEAT_PENALTY = 0.3  # each function word after the first in a line
+PAIR_WEIGHT = 2.0       # part-of-speech pairs against the per-syllable word prior
+
+FUNCTION_POS = POS_BITS["pron"] | POS_BITS["det"] | POS_BITS["prep"] | POS_BITS["conj"]
+
+# Closed-class words by the role they play in a line. The tagger gives a
+# word its part of speech in isolation ("that" det/prep, "her" pron); these
+# say how a line may continue after them. Everything else keeps its POS_BITS
+# names (noun, verb, adj, adv, num, ...).
+CLOSED_CLASSES: Dict[str, str] = {}
+for _cls, _words in {
+    "subj": "i you he she it we they",
+    "obj": "me him us them",
+    "poss": "my your his her its our their",
+    "det": "the a an this that these those every no some any each all",
+    "prep": "in on at by for with from of to into over under through about like without across",
+    "conj": "and or but so if when while because than then",
+    # forms of be/have/do and modals: tagged verbs, but they glue a line like function words
+    "aux": """am is are was were be been being have has had do does did will would shall should
+              can could may might must don't doesn't didn't can't won't isn't wasn't aren't""",
+    # a subject and its auxiliary in one word: starts a clause like "subj", continues like "aux"
+    "subj_aux": "it's i'm i'll i've i'd you're we're they're that's",
+    "neg": "not",
+    "deg": "very just really only quite too more most",
+    "wh": "how what where why who",
+}.items():
+    CLOSED_CLASSES.update(dict.fromkeys(_words.split(), _cls))
+# closed-class words with a second reading ("need you", "hold it", "kiss her")
+EXTRA_READINGS: Dict[str, str] = {"you": "obj", "it": "obj", "her": "obj", "so": "deg"}
+
+# (previous word's class, next word's) -> score: a small grammar of lyric
+# lines ("start" is the beginning of the line). Pairs not listed do not
+# occur in a line. Adjectives read two ways: "adj" before their noun ("the
+# cold night") and "padj" ending a phrase ("is cold", "so cold").
+PAIR_SCORES: Dict[Tuple[str, str], float] = {
+    ("start", "subj"): 0.5, ("start", "subj_aux"): 0.4, ("start", "det"): 0.5, ("start", "poss"): 0.5,
+    ("start", "conj"): 0.3, ("start", "prep"): 0.3, ("start", "adv"): 0.2, ("start", "verb"): 0.1,
+    ("start", "wh"): 0.2, ("start", "noun"): 0.1, ("start", "deg"): 0.1,
+    ("subj", "aux"): 0.5, ("subj", "verb"): 0.5, ("subj", "adv"): 0.1, ("subj", "deg"): 0.1,
+    ("det", "noun"): 0.5, ("det", "adj"): 0.4, ("det", "num"): 0.2,
+    ("poss", "noun"): 0.5, ("poss", "adj"): 0.4,
+    ("adj", "noun"): 0.5, ("num", "noun"): 0.3,
+    ("noun", "aux"): 0.3, ("noun", "verb"): 0.3, ("noun", "prep"): 0.3, ("noun", "conj"): 0.2,
+    ("obj", "prep"): 0.3, ("obj", "conj"): 0.2, ("obj", "adv"): 0.2,
+    ("verb", "det"): 0.4, ("verb", "poss"): 0.4, ("verb", "obj"): 0.4, ("verb", "prep"): 0.3,
+    ("verb", "adv"): 0.2, ("verb", "deg"): 0.1, ("verb", "noun"): 0.1, ("verb", "padj"): 0.1,
+    ("verb", "subj"): 0.3, ("verb", "subj_aux"): 0.3, ("verb", "wh"): 0.2,  # CLAUSE_VERBS only
+    ("aux", "verb"): 0.4, ("aux", "padj"): 0.3, ("aux", "det"): 0.3, ("aux", "poss"): 0.3,
+    ("aux", "prep"): 0.2, ("aux", "adv"): 0.2, ("aux", "deg"): 0.2, ("aux", "neg"): 0.3,
+    ("neg", "verb"): 0.3, ("neg", "padj"): 0.2, ("neg", "det"): 0.1, ("neg", "prep"): 0.1,
+    ("deg", "padj"): 0.3, ("deg", "adv"): 0.2, ("deg", "verb"): 0.1,
+    ("adv", "verb"): 0.2, ("adv", "padj"): 0.2, ("adv", "prep"): 0.1,
+    ("padj", "prep"): 0.2, ("padj", "conj"): 0.2,
+    ("prep", "det"): 0.5, ("prep", "poss"): 0.5, ("prep", "obj"): 0.3, ("prep", "noun"): 0.3,
+    ("prep", "verb"): 0.2, ("prep", "adj"): 0.1,
+    ("conj", "subj"): 0.4, ("conj", "subj_aux"): 0.3, ("conj", "det"): 0.3, ("conj", "poss"): 0.3,
+    ("conj", "prep"): 0.1, ("conj", "adv"): 0.1,
+    ("wh", "subj"): 0.4, ("wh", "subj_aux"): 0.4, ("wh", "aux"): 0.3,
+}
+# classes a line may end on ("the fire", "hold me", "burning bright"; not "the", "to", "is", "very")
+FINAL_CLASSES = frozenset({"noun", "obj", "verb", "padj", "adv", "num"})
+
+# Verb forms, told apart by spelling: "base" (use), "3sg" (uses), "past"
+# (used, said; past participles too), "ing" (using).
+IRREGULAR_PAST = frozenset("""
+    said made came took got gave went saw knew told found felt left kept held stood ran fell thought
+    brought bought heard lost sang sung began begun broke broken spoke spoken wrote written drove rose
+    chose chosen flew flown grew grown threw thrown wore worn tore torn hid hidden lay led met paid sent
+    spent built sat slept swam won woke meant burnt seen done gone known taken given fallen forgotten
+    became stole stolen shone shot struck stuck swore sworn understood
+""".split())
+# what an auxiliary needs after it, and which subjects it agrees with (None: any)
+AUX_TAKES: Dict[str, str] = {
+    **dict.fromkeys("will would shall should can could may might must do does did don't doesn't "
+                    "didn't can't won't i'll i'd to".split(), "base"),
+    **dict.fromkeys("am is are was were be been being isn't wasn't aren't "
+                    "it's i'm you're we're they're that's".split(), "ing_past"),
+    **dict.fromkeys("have has had i've".split(), "past"),
+}
+VERB_FORMS = {"base": {"base"}, "ing_past": {"ing", "past"}, "past": {"past"}}
+AUX_SUBJECTS: Dict[str, frozenset] = {
+    **dict.fromkeys("is isn't has does doesn't".split(), frozenset({"3sg"})),
+    **dict.fromkeys("was wasn't".split(), frozenset({"i", "3sg"})),
+    **dict.fromkeys("are aren't were".split(), frozenset({"plural"})),
+    **dict.fromkeys("have do don't".split(), frozenset({"i", "plural"})),
+    "am": frozenset({"i"}),
+}
+# verbs that report or think: followed by a clause ("said i'm", "thought of you"), not an object
+CLAUSE_VERBS = frozenset("say says said think thinks thought guess hope hoped wish wished wonder wondered".split())
+CLAUSE_BLOCKED = frozenset({"det", "poss", "obj", "noun", "adj", "padj", "num", "deg"})
+CLAUSE_ONLY = frozenset({"subj", "subj_aux", "wh"})
+# verbs that take no object ("fall down", "look good"; not "go him", "came the night")
+INTRANSITIVE_VERBS = frozenset("""
+    go goes going went gone come comes coming came look looks looking looked fall falls falling fell fallen
+    die dies dying died cry cries crying cried sleep sleeps sleeping slept stay stays staying stayed
+    wait waits waiting waited seem seems seemed happen happens happened rise rises rising rose risen
+    smile smiles smiled arrive arrives arrived
+""".split())
+INTRANSITIVE_BLOCKED = frozenset({"det", "poss", "obj", "noun", "adj", "num"}) | CLAUSE_ONLY
+# a verb after these continues the predicate they started ("will go", "not go", "to go")
+PREDICATE_GLUE = frozenset({"aux", "subj_aux", "neg", "prep"})
+# where a line's current clause is: no verb yet, no verb and inside a
+# prepositional phrase (whose noun is no subject), has its verb
+CLAUSE_STATES = ("open", "pp", "done")
+
+
+# -----------------------------
+# Stress bits
+# -----------------------------
+def stress_bits(stress: List[int]) -> int:
+    bits = 0
+    for i, s in enumerate(stress):
+        if s:
+            bits |= 1 << i
+    return bits
+
+
+def parse_template(template: str) -> Template:
+    """'u-S-u-u-S' -> (5, 0b10010, 0b11111)"""
+    bits = care = 0
+    n = 0
+    for ch in template:
+        if ch in "-| \t":
+            continue
+        if ch in "Ss1":
+            bits |= 1 << n
+            care |= 1 << n
+        elif ch in "Uu0":
+            care |= 1 << n
+        elif ch not in "xX?*":
+            raise ValueError(f"Unknown stress mark {ch!r} in template {template!r}")
+        n += 1
+    return n, bits, care
+
+
+def template_slice(t: Template, start: int, length: int) -> Template:
+    mask = (1 << length) - 1
+    return length, (t[1] >> start) & mask, (t[2] >> start) & mask
+
+
+# -----------------------------
+# Word quality
+# -----------------------------
+@lru_cache(maxsize=1)
+def _word_ranks() -> Dict[str, int]:
+    ranks: Dict[str, int] = {}
+    with open(COMMON_ENGLISH_PATH, encoding="utf-8") as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and not word.startswith("#"):
+                ranks.setdefault(word, len(ranks) + 1)
+    return ranks
+
+
+@lru_cache(maxsize=None)
+def word_frequency(word: str) -> float:
+    """
+    Zipf-scale frequency (log10 per billion words; "the" ~7, 0 = unknown).
+    Uses wordfreq when installed; otherwise 7 - log10(rank) for words in
+    common_english.txt and MIN_ZIPF for the tagger's frequent words.
+    """
+    if _WORDFREQ_AVAILABLE:
+        return zipf_frequency(word, "en")
+    rank = _word_ranks().get(word)
+    if rank is not None:
+        return max(7.0 - math.log10(rank), MIN_ZIPF)
+    return MIN_ZIPF if word in common_words() else 0.0
+
+
+def is_real_word(word: str) -> bool:
+    """Letters (and apostrophes) only; single letters only for "a" and "i"."""
+    if len(word) == 1:
+        return word in {"a", "i"}
+    return word.replace("'", "").isalpha()
+
+
+def word_classes(word: str, pos: int) -> Tuple[str, ...]:
+    """The classes PAIR_SCORES knows `word` by."""
+    if word in CLOSED_CLASSES:
+        return (CLOSED_CLASSES[word],) + ((EXTRA_READINGS[word],) if word in EXTRA_READINGS else ())
+    names = tuple("noun" if name == "pron" else name for name in pos_names(pos))  # "something", "whatever"
+    if "adj" in names:
+        names += ("padj",)
+    return tuple(dict.fromkeys(names)) or ("noun",)
+
+
+def verb_form(word: str) -> str:
+    """"base", "3sg", "past" or "ing", by spelling."""
+    if word in IRREGULAR_PAST or word.endswith("ed"):
+        return "past"
+    if word.endswith("ing"):
+        return "ing"
+    if word.endswith("s") and not word.endswith("ss"):
+        return "3sg"
+    return "base"
+
+
+def subject_number(word: str, reading: str) -> Optional[str]:
+    """"i", "3sg" or "plural" for a word read as a subject (pronoun or noun); None otherwise."""
+    if reading == "subj":
+        return "i" if word == "i" else "3sg" if word in ("he", "she", "it") else "plural"
+    if reading == "noun":
+        return "plural" if verb_form(word) == "3sg" else "3sg"
+    return None
+
+
+def follows(prev_word: str, a: str, word: str, b: str, clause: str = "open") -> bool:
+    """
+    Whether `word` read as `b` may follow `prev_word` read as `a`: the
+    pair is in PAIR_SCORES, a verb agrees with its subject and has the form
+    its auxiliary needs ("it uses", "will use", "is using"; not "it use",
+    "will used"), reporting and intransitive verbs take no object, and a
+    new verb only comes in an "open" clause: not a second one without a
+    conjunction ("it made the word did start"), nor one for the noun of a
+    prepositional phrase ("the word to years hire").
+    """
+    if (a, b) not in PAIR_SCORES and ("aux" if a == "subj_aux" else a, b) not in PAIR_SCORES:
+        return False
+    if a == "verb":
+        blocked = (CLAUSE_BLOCKED if prev_word in CLAUSE_VERBS
+                   else INTRANSITIVE_BLOCKED if prev_word in INTRANSITIVE_VERBS else CLAUSE_ONLY)
+        if b in blocked:
+            return False
+    if clause != "open" and starts_predicate(a, b):
+        return False
+    if b == "verb":
+        form = verb_form(word)
+        if prev_word in AUX_TAKES and a in ("aux", "subj_aux", "prep"):
+            return form in VERB_FORMS[AUX_TAKES[prev_word]]
+        if a == "prep":
+            return form == "ing"       # "for running"; "to" was handled above
+        if a in ("start", "neg", "adv"):
+            return form != "3sg"       # "hold on", "not tonight", "never said"
+        if a == "deg":
+            return form != "ing"       # "just want", "only knows"
+        number = subject_number(prev_word, a)
+        if number is not None:
+            return form == "past" or form == ("3sg" if number == "3sg" else "base")
+    elif b == "aux" and word in AUX_SUBJECTS:
+        number = subject_number(prev_word, a)
+        return number is None or number in AUX_SUBJECTS[word]
+    return True
+
+
+def starts_predicate(a: str, b: str) -> bool:
+    """Whether `b` after `a` is the verb of a new clause ("i go", "the night falls", "i'm")."""
+    return b == "subj_aux" or (b in ("verb", "aux") and a not in PREDICATE_GLUE)
+
+
+def clause_after(clause: str, a: str, b: str) -> str:
+    """CLAUSE_STATES entry after a word read as `b` (following `a`) in a `clause`."""
+    if b in ("conj", "wh", "subj"):
+        return "open"
+    if starts_predicate(a, b):
+        return "done"
+    if b == "prep" and clause == "open":
+        return "pp"
+    return clause
+
+
+def pair_score(
+    prev_word: str, prev: Tuple[str, ...], word: str, classes: Tuple[str, ...], clause: str = "open"
+) -> Tuple[Optional[float], Tuple[str, ...], str]:
+    """
+    Best PAIR_SCORES entry over the parts of speech two adjacent words may
+    have, the readings of the second word that may follow (the next pair
+    is checked against those, so every reading kept lies on a grammatical
+    path from the start of the line), and the clause state after `word`
+    (the strictest its readings lead to). (None, (), clause) when no
+    reading may follow.
+    """
+    if not prev or not classes:
+        return 0.0, classes, clause
+    best: Dict[str, float] = {}
+    after = []
+    for b in classes:
+        for a in prev:
+            if follows(prev_word, a, word, b, clause):
+                score = PAIR_SCORES.get((a, b), PAIR_SCORES.get(("aux", b), 0.0))
+                best[b] = max(best.get(b, score), score)
+                after.append(clause_after(clause, a, b))
+    if not best:
+        return None, (), clause
+    return max(best.values()), tuple(b for b in classes if b in best), max(after, key=CLAUSE_STATES.index)
+
+
+# -----------------------------
+# Precomputed index
+# -----------------------------
+class FillerIndex:
+    def __init__(self, store: Mapping[str, List[Prosody]]):
+        buckets: Dict[StressKey, List[str]] = {}
+        self.keys: Dict[str, List[StressKey]] = {}
+        self.keys_by_len: Dict[int, List[int]] = {}
+        self.classes: Dict[str, Tuple[str, ...]] = {}
+        self.function: set = set()
+        self.prior: Dict[str, float] = {}
+
+        for word, pros in store.items():
+            if not is_real_word(word):
+                continue
+            zipf = word_frequency(word)
+            pos = 0
+            for p in pros:
+                pos |= int(p.get("pos", 0))
+            self.classes[word] = word_classes(word, pos)
+            # function words are everywhere: their frequency only ranks them among themselves
+            if word in CLOSED_CLASSES or pos & FUNCTION_POS:
+                self.function.add(word)
+            weight = FUNCTION_PRIOR if word in self.function else 1.0
+            self.prior[word] = weight * zipf / 7.0 + deterministic_jitter(word)
+
+            for p in pros:
+                n = int(p["syllables"])
+                if n == 0:
+                    continue
+                key = (n, stress_bits(p["stress"]))
+                if word in self.keys and key in self.keys[word]:
+                    continue
+                self.keys.setdefault(word, []).append(key)
+                if zipf >= MIN_ZIPF:
+                    buckets.setdefault(key, []).append(word)
+
+        for bucket in buckets.values():
+            bucket.sort(key=lambda w: self.prior[w], reverse=True)
+        for (n, bits) in buckets:
+            self.keys_by_len.setdefault(n, []).append(bits)
+
+        self.buckets = buckets
+
+    def transition(
+        self, words: Tuple[str, ...], last: Tuple[str, ...], clause: str, word: str
+    ) -> Tuple[Optional[float], Tuple[str, ...], str]:
+        """
+        Score change for appending `word` to the partial line `words`, whose
+        last word was read as `last` in a `clause` (CLAUSE_STATES); the
+        readings of `word` that get it, and the clause state after it.
+        None when `word` cannot follow.
+        """
+        pair, classes, clause = pair_score(words[-1] if words else "", last, word, self.classes.get(word, ()), clause)
+        if pair is None:
+            return None, (), clause
+        score = PAIR_WEIGHT * pair
+        if word in self.function and any(w in self.function for w in words):
+            score -= FUNCTION_REPEAT_PENALTY
+        return score, classes, clause
+
+    def matching_keys(self, t: Template) -> Iterable[Tuple[StressKey, float]]:
+        """Bucket keys that fit a template slice, with their stress penalty."""
+        n, bits, care = t
+        for b in self.keys_by_len.get(n, []):
+            if (b & care) == (bits & care):
+                yield (n, b), 0.0
+            elif n == 1:
+                yield (n, b), MONO_FLEX_PENALTY
+
+
+@lru_cache(maxsize=4)
+def _filler_index(path: Path) -> FillerIndex:
+    return FillerIndex(load_candidate_store(path))
+
+
+# -----------------------------
+# Search
+# -----------------------------
+def _word_score(word: str, syllables: int, index: FillerIndex, catalog: Mapping[str, int], catalog_weight: float) -> float:
+    bonus = catalog_weight if word in catalog else 0.0
+    return (index.prior.get(word, 0.0) + bonus) * syllables
+
+
+def fill_line(
+    template: str,
+    *,
+    rhyme_with: Optional[str] = None,
+    top_k: int = 10,
+    catalog: Optional[Mapping[str, int]] = None,
+    catalog_weight: float = 1.0,
+    beam: int = 50,
+    per_bucket: int = 30,
+    max_word_syllables: int = 4,
+    db_path: Optional[Path] = None,
+) -> List[Tuple[str, float]]:
+    """
+    Top-K word sequences matching `template`, ending on a rhyme for
+    `rhyme_with` when given. Words from `catalog` (word -> count, e.g. the
+    user's own lyrics) get `catalog_weight` added to their score.
+
+    Returns (line, score) pairs, best first.
+    """
+    t = parse_template(template)
+    n = t[0]
+    if n == 0:
+        return []
+
+    index = _filler_index(store_path(db_path))
+    catalog = catalog or {}
+
+    # catalog words, bucketed the same way, go in front of the store buckets
+    catalog_buckets: Dict[StressKey, List[str]] = {}
+    if catalog:
+        store = load_candidate_store(db_path)
+        for word in sorted(catalog, key=catalog.get, reverse=True):
+            for p in store.get(word, []):
+                key = (int(p["syllables"]), stress_bits(p["stress"]))
+                catalog_buckets.setdefault(key, []).append(word)
+
+    rhymes: List[str] = []
+    base_word = (rhyme_with or "").strip().lower()
+    if base_word:
+        rhymes = sorted(set(pronouncing.rhymes(base_word)))
+        if not rhymes:
+            return []
+        # names and spellings only the CMU list knows ("hyre", "meir") only when nothing else rhymes
+        rhymes = [w for w in rhymes if word_frequency(w) > 0 and FINAL_CLASSES.intersection(index.classes.get(w, ()))] or rhymes
+
+    def stress_pool(start: int, length: int) -> List[Tuple[str, float]]:
+        out: Dict[str, float] = {}
+        for key, penalty in index.matching_keys(template_slice(t, start, length)):
+            pool = catalog_buckets.get(key, [])[:per_bucket] + index.buckets.get(key, [])[:per_bucket]
+            for w in pool:
+                s = _word_score(w, length, index, catalog, catalog_weight) - penalty
+                if s > out.get(w, float("-inf")):
+                    out[w] = s
+        return list(out.items())
+
+    def rhyme_pool(start: int, length: int) -> List[Tuple[str, float]]:
+        fits = dict(index.matching_keys(template_slice(t, start, length)))
+        out: Dict[str, float] = {}
+        for w in rhymes:
+            for key in index.keys.get(w, []):
+                if key not in fits:
+                    continue
+                s = _word_score(w, length, index, catalog, catalog_weight) - fits[key]
+                if s > out.get(w, float("-inf")):
+                    out[w] = s
+        # keep the rhyme pool about as tight as the stress buckets
+        return heapq.nlargest(per_bucket * 2, out.items(), key=lambda kv: kv[1])
+
+    # slice candidates are shared by every partial line reaching `start`
+    slices: Dict[Tuple[int, int], List[Tuple[str, float]]] = {}
+    for start in range(n):
+        for length in range(1, min(max_word_syllables, n - start) + 1):
+            final = start + length == n
+            slices[(start, length)] = rhyme_pool(start, length) if final and rhymes else stress_pool(start, length)
+
+    # (score, words, readings of the last word, clause state)
+    partial: List[List[Tuple[float, Tuple[str, ...], Tuple[str, ...], str]]] = [[] for _ in range(n + 1)]
+    partial[0] = [(0.0, (), ("start",), "open")]
+    for start in range(n):
+        if not partial[start]:
+            continue
+        partial[start] = heapq.nlargest(beam, partial[start])
+        for length in range(1, min(max_word_syllables, n - start) + 1):
+            for word, ws in slices[(start, length)]:
+                for score, words, last, clause in partial[start]:
+                    if word in words:
+                        continue
+                    ts, classes, after = index.transition(words, last, clause, word)
+                    if ts is None:
+                        continue
+                    partial[start + length].append((score + ws + ts, words + (word,), classes, after))
+
+    # reorderings of the same words, and lines that only trade a function
+    # word ("its good fire" / "his good fire"), read the same: show the best
+    results: List[Tuple[str, float]] = []
+    seen = set()
+    for score, words, last, _ in sorted(partial[n], reverse=True):
+        if not FINAL_CLASSES.intersection(last):
+            continue
+        bag = tuple(sorted(words))
+        content = tuple(w for w in words if w not in index.function)
+        if bag in seen or content in seen:
+            continue
+        seen.update((bag, content))
+        results.append((" ".join(words), score))
+        if len(results) >= top_k:
+            break
+    return results
+
+
+# -----------------------------
+# Readability check
+# -----------------------------
+# the README's examples: (template, rhyme)
+README_EXAMPLES: List[Tuple[str, Optional[str]]] = [
+    ("u-S-u-u-S", "fire"),
+    ("u-S-u-S", "night"),
+    ("u-S-u-S-u-S", "heart"),
+]
+# lines the filler used to give; readability_problems() must reject them
+UNREADABLE_EXAMPLES: List[str] = [
+    "it said its good wire",
+    "its good word use not said",
+    "it use its word said not good part",
+]
+
+
+def readability_problems(line: str, db_path: Optional[Path] = None) -> List[str]:
+    """
+    Why `line` would not read as English: words too rare (the last word,
+    the rhyme, only has to be a real word), adjacent words that cannot
+    follow each other (follows()), a line ending on a function word, or
+    more than three function words per content word. [] = readable.
+    """
+    index = _filler_index(store_path(db_path))
+    words = line.split()
+    problems = []
+    for i, word in enumerate(words):
+        if not is_real_word(word) or word not in index.keys:
+            problems.append(f"{word!r} is not a word")
+        elif i < len(words) - 1 and word_frequency(word) < MIN_ZIPF:
+            problems.append(f"{word!r} is too rare")
+    last: Tuple[str, ...] = ("start",)
+    clause = "open"
+    for prev, word in zip(("",) + tuple(words), words):
+        pair, last, clause = pair_score(prev, last, word, index.classes.get(word, ()), clause)
+        if pair is None:
+            problems.append(f"{prev or '<start>'!r} -> {word!r} is not a phrase")
+            last = index.classes.get(word, ())
+    if words and not FINAL_CLASSES.intersection(last):
+        problems.append(f"ends on {words[-1]!r}")
+    function = sum(w in index.function for w in words)
+    if function > 3 * (len(words) - function):
+        problems.append(f"{function} of {len(words)} words are function words")
+    return problems
+
+
+def check_examples(db_path: Optional[Path] = None) -> List[str]:
+    """
+    The best line for each README example must be readable, and each of
+    UNREADABLE_EXAMPLES must not be; returns the problems found.
+    """
+    problems = [f"{line!r} passes as readable" for line in UNREADABLE_EXAMPLES if not readability_problems(line, db_path)]
+    for template, rhyme in README_EXAMPLES:
+        found = fill_line(template, rhyme_with=rhyme, top_k=1, db_path=db_path)
+        if not found:
+            problems.append(f"{template} / {rhyme}: no line")
+            continue
+        line = found[0][0]
+        problems += [f"{template} / {rhyme}: {line!r}: {p}" for p in readability_problems(line, db_path)]
+    return problems
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--template")
+    p.add_argument("--rhyme", default=None)
+    p.add_argument("--top", type=int, default=10)
+    p.add_argument("--check", action="store_true", help="check that the README examples give readable lines")
+    args = p.parse_args()
+
+    if args.check:
+        problems = check_examples()
+        for problem in problems:
+            print("Unreadable:", problem)
+        if problems:
+            raise SystemExit(1)
+        print(f"{len(README_EXAMPLES)} examples read fine")
+        return
+    if not args.template:
+        p.error("--template is required")
+
+    results = fill_line(args.template, rhyme_with=args.rhyme, top_k=args.top)
+    print(f"\nTemplate: {args.template} | rhyme={args.rhyme} | top={args.top}")
+    print("-" * 60)
+    for line, score in results:
+        print(f"{line:<40} {score:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+mondegreen.py
+
+Mondegreen / pun finder: re-segments the phone string of a word or phrase into
+other dictionary words that sound the same or nearly the same.
+
+    "ice cream"  ->  "i scream"
+    "euthanasia" ->  "youth in asia"
+
+- Uses the CMU data `pronouncing` already loads for the rhyme engine.
+- A phone trie over every CMU pronunciation is built once per process
+  (get_phone_trie, ~1.5 s) and shared by every query; the app builds it on
+  a background thread (warm_phone_trie) before the first query.
+- Segmentation is a bounded-cost DP: each step walks the trie from a phone
+  position, allowing a few "near" phone substitutions (voicing pairs,
+  neighbouring vowels) until the cost budget runs out.
+
+Examples (from the repository root):
+    python -m Rhyme_engine.mondegreen --phrase "ice cream"
+    python -m Rhyme_engine.mondegreen --phrase "kiss the sky" --max_cost 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pronouncing
+
+from Rhyme_engine.candidate_store import common_words, usable_word
+from Rhyme_engine.rhyme_engine import _g2p_phones_for_word, split_phrase
+
+Segmentation = Tuple[str, float]
+
+
+# -----------------------------
+# Phone similarity
+# -----------------------------
+# Phones in the same group cost NEAR_COST to swap; anything else is not allowed.
+_NEAR_GROUPS = [
+    {"P", "B"}, {"T", "D"}, {"K", "G"}, {"F", "V"}, {"S", "Z"},
+    {"SH", "ZH"}, {"CH", "JH"}, {"TH", "DH"}, {"M", "N", "NG"},
+    {"IY", "IH"}, {"EH", "AE"}, {"AH", "AA", "AO"}, {"UW", "UH"},
+    {"EY", "EH"}, {"OW", "AO"}, {"ER", "R"},
+]
+NEAR_COST = 0.5
+
+_NEAR: Dict[str, set] = {}
+for _group in _NEAR_GROUPS:
+    for _ph in _group:
+        _NEAR.setdefault(_ph, set()).update(_group - {_ph})
+
+
+def strip_stress(phones: str) -> List[str]:
+    """'AY1 S K R IY1 M' -> ['AY', 'S', 'K', 'R', 'IY', 'M']"""
+    return [ph.rstrip("012") for ph in phones.split()]
+
+
+def substitution_cost(a: str, b: str) -> Optional[float]:
+    if a == b:
+        return 0.0
+    if b in _NEAR.get(a, ()):
+        return NEAR_COST
+    return None
+
+
+# -----------------------------
+# Phone trie
+# -----------------------------
+class PhoneTrie:
+    """
+    Trie over stress-less CMU phone sequences.
+
+    Nodes are integer ids; node 0 is the root. `_children[n]` maps a phone to a
+    child id (None for leaves, which are the majority) and `_words[n]` holds the
+    words whose pronunciation ends at n.
+    """
+
+    def __init__(self) -> None:
+        self._children: List[Optional[Dict[str, int]]] = [None]
+        self._words: Dict[int, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def insert(self, phones: List[str], word: str) -> None:
+        node = 0
+        for ph in phones:
+            kids = self._children[node]
+            if kids is None:
+                kids = self._children[node] = {}
+            nxt = kids.get(ph)
+            if nxt is None:
+                nxt = len(self._children)
+                kids[ph] = nxt
+                self._children.append(None)
+            node = nxt
+        bucket = self._words.setdefault(node, [])
+        if word not in bucket:
+            bucket.append(word)
+
+    def words_at(self, node: int) -> List[str]:
+        return self._words.get(node, [])
+
+    def walk(self, target: List[str], start: int, budget: float) -> List[Tuple[int, int, float]]:
+        """
+        Word-ending nodes matching target[start:end] within `budget`.
+        Returns (end, node, cost) triples.
+        """
+        out: List[Tuple[int, int, float]] = []
+        stack = [(0, start, 0.0)]
+        while stack:
+            node, pos, cost = stack.pop()
+            if pos > start:
+                if node in self._words:
+                    out.append((pos, node, cost))
+            if pos == len(target):
+                continue
+            kids = self._children[node]
+            if not kids:
+                continue
+            want = target[pos]
+            for ph, child in kids.items():
+                sub = substitution_cost(want, ph)
+                if sub is None or cost + sub > budget:
+                    continue
+                stack.append((child, pos + 1, cost + sub))
+        return out
+
+
+_trie_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _build_phone_trie() -> PhoneTrie:
+    pronouncing.init_cmu()
+    trie = PhoneTrie()
+    for word, phones in pronouncing.pronunciations:
+        if usable_word(word, phones):
+            trie.insert(strip_stress(phones), word)
+    return trie
+
+
+def get_phone_trie() -> PhoneTrie:
+    """The phone trie over the CMU dictionary, built once per process (blocks until it is)."""
+    with _trie_lock:
+        return _build_phone_trie()
+
+
+def phone_trie_ready() -> bool:
+    return _build_phone_trie.cache_info().currsize > 0
+
+
+def warm_phone_trie() -> None:
+    """Build the trie on a daemon thread, so the first query does not wait for it."""
+    threading.Thread(target=get_phone_trie, name="phone-trie", daemon=True).start()
+
+
+def spelling_for(trie: PhoneTrie, node: int, prefer: Iterable[str] = ()) -> str:
+    """
+    One readable spelling for the homophones ending at `node`:
+    a word from the query, then a common word, then the shortest.
+    """
+    words = trie.words_at(node)
+    for w in prefer:
+        if w in words:
+            return w
+    common = common_words()
+    return min(words, key=lambda w: (w not in common, len(w), w))
+
+
+# -----------------------------
+# Segmentation
+# -----------------------------
+Hypothesis = Tuple[float, Tuple[Tuple[int, int], ...]]  # (cost, ((end, node), ...))
+
+
+def phrase_phones(words: List[str], *, use_g2p: bool = True) -> List[List[str]]:
+    """Stress-less phones of the first pronunciation of every word; [] if any word is unknown."""
+    out: List[List[str]] = []
+    for w in words:
+        phones_list = pronouncing.phones_for_word(w)
+        if not phones_list and use_g2p:
+            phones_list = _g2p_phones_for_word(w)
+        if not phones_list:
+            return []
+        out.append(strip_stress(phones_list[0]))
+    return out
+
+
+def segment(
+    target: List[str],
+    *,
+    max_cost: float = 1.0,
+    beam: int = 40,
+    trie: Optional[PhoneTrie] = None,
+) -> List[Hypothesis]:
+    """
+    Bounded-cost DP over phone positions.
+
+    best[i] keeps the `beam` cheapest segmentations of target[:i] (fewer words
+    win ties). A segment is a trie node, i.e. a whole homophone group, so
+    spelling variants do not crowd the beam. Each start position is walked once.
+    """
+    trie = trie or get_phone_trie()
+    n = len(target)
+    best: List[List[Hypothesis]] = [[] for _ in range(n + 1)]
+    best[0] = [(0.0, ())]
+
+    for i in range(n):
+        if not best[i]:
+            continue
+        best[i].sort(key=lambda h: (h[0], len(h[1])))
+        del best[i][beam:]
+        cheapest = best[i][0][0]
+        for end, node, wcost in trie.walk(target, i, max_cost - cheapest):
+            for cost, segs in best[i]:
+                total = cost + wcost
+                if total <= max_cost:
+                    best[end].append((total, segs + ((end, node),)))
+
+    return sorted(best[n], key=lambda h: (h[0], len(h[1])))
+
+
+def find_mondegreens(
+    phrase: str,
+    *,
+    top_n: int = 20,
+    max_cost: float = 1.0,
+    beam: int = 40,
+    max_words: Optional[int] = None,
+    use_g2p: bool = True,
+) -> List[Segmentation]:
+    """
+    Alternative segmentations of `phrase` that sound (nearly) the same.
+
+    Returns (phrase, cost) pairs; cost 0.0 means an exact phonetic match.
+    Re-segmentations ("i scream") rank ahead of same-boundary respellings
+    ("ice creme") at equal cost. The original wording is never returned.
+    """
+    words = split_phrase(phrase)
+    if not words:
+        return []
+    per_word = phrase_phones(words, use_g2p=use_g2p)
+    if not per_word:
+        return []
+
+    target = [ph for phones in per_word for ph in phones]
+    boundaries, pos = [], 0
+    for phones in per_word:
+        pos += len(phones)
+        boundaries.append(pos)
+    original_bounds = tuple(boundaries)
+
+    trie = get_phone_trie()
+    ranked = []
+    for cost, segs in segment(target, max_cost=max_cost, beam=beam, trie=trie):
+        if max_words is not None and len(segs) > max_words:
+            continue
+        text = " ".join(spelling_for(trie, node, words) for _, node in segs)
+        same_bounds = tuple(end for end, _ in segs) == original_bounds
+        ranked.append((cost, same_bounds, len(segs), text))
+    ranked.sort()
+
+    original = " ".join(words)
+    out: List[Segmentation] = []
+    seen = {original}
+    for cost, _, _, text in ranked:
+        if text in seen:
+            continue
+        seen.add(text)
+        out.append((text, cost))
+        if len(out) >= top_n:
+            break
+    return out
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--phrase", required=True)
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--max_cost", type=float, default=1.0)
+    p.add_argument("--max_words", type=int, default=None)
+    args = p.parse_args()
+
+    results = find_mondegreens(args.phrase, top_n=args.top, max_cost=args.max_cost, max_words=args.max_words)
+    print(f"\nPhrase: {args.phrase} | max_cost={args.max_cost} | top={args.top}")
+    print("-" * 60)
+    for seg, cost in results:
+        print(f"{seg:<40} {cost:.2f}")
+
+
+if __name__ == "__main__":
+    main()
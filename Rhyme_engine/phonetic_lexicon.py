@@ -0,0 +1,207 @@
+"""
+phonetic_lexicon.py
+
+One in-process word -> (phones, stress, syllables) table shared by the rhyme
+engine, flow analysis and the editor's syllable counter.
+
+- CMU pronunciations come from `pronouncing`; each word is resolved once per
+  process and kept as a small tuple (WordEntry).
+- Words CMU does not know get a syllable count from pyphen (memoized too),
+  and "?" as their stress pattern, as flow analysis has always shown them.
+- resolve_g2p() upgrades such words with a guessed pronunciation through
+  the rhyme engine's G2P path: the shipped g2p_cache.json and the user's one
+  (data_paths.USER_G2P_CACHE), then the model. It can be slow (model
+  inference), so callers run it off the GUI thread. Guesses stay in memory;
+  only those for words from saved lyrics or explicit lookups (`persist`)
+  are written to the user's cache. Guessed prosodies are
+  kept apart from CMU ones: only prosodies(word, use_g2p=True) returns them.
+- get_lexicon() returns the shared instance.
+
+Examples:
+    python -m Rhyme_engine.phonetic_lexicon --line "I am here, have no fear"
+"""
+
+from __future__ import annotations
+
+import argparse
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import pronouncing
+
+from Rhyme_engine.data_paths import PACKAGED_G2P_CACHE, USER_G2P_CACHE
+
+_PYPHEN_AVAILABLE = False
+try:
+    import pyphen  # type: ignore
+    _PYPHEN_AVAILABLE = True
+except Exception:
+    _PYPHEN_AVAILABLE = False
+
+Prosody = Dict[str, Any]
+
+_PUNCT = ".,;:!?\"()[]{}-—–'"
+
+
+class WordEntry(NamedTuple):
+    phones: Tuple[str, ...]  # every CMU pronunciation; () when the word is unknown
+    stress: str              # "Su" pattern of the first pronunciation; "?" when unknown
+    syllables: int           # CMU count, else pyphen's, else 1
+    guessed: bool = False    # stress/syllables come from G2P, not CMU
+
+
+def prosody_from_phones(phones: str) -> Prosody:
+    """'D IH0 Z AY1 ER0' -> {'stress': [0, 1, 0], 'vowels': ['IH', 'AY', 'ER'], 'syllables': 3} (2 -> 1)."""
+    parts = phones.split()
+    vowels = [ph for ph in parts if ph[-1].isdigit()]
+    stress = [1 if v[-1] in "12" else 0 for v in vowels]
+    return {"stress": stress, "vowels": [v[:-1] for v in vowels], "syllables": len(vowels)}
+
+
+def _fallback_syllables(word: str) -> int:
+    """Syllables for a word CMU does not know: pyphen hyphenation, else vowel groups."""
+    if _PYPHEN_AVAILABLE:
+        return len(_pyphen_dic().inserted(word).split("-"))
+    groups, prev = 0, False
+    for ch in word.lower():
+        vowel = ch in "aeiouy"
+        if vowel and not prev:
+            groups += 1
+        prev = vowel
+    return max(1, groups)
+
+
+@lru_cache(maxsize=1)
+def _pyphen_dic():
+    return pyphen.Pyphen(lang="en")
+
+
+class PhoneticLexicon:
+    def __init__(self, g2p_cache_path: Optional[Path] = None) -> None:
+        self._entries: Dict[str, WordEntry] = {}
+        self._prosodies: Dict[str, List[Prosody]] = {}  # CMU only (get_prosodies_cmu)
+        self._guessed: Dict[str, List[Prosody]] = {}    # resolve_g2p() results
+        self.g2p_cache_path = g2p_cache_path or USER_G2P_CACHE
+        self._g2p_cache: Optional[Dict[str, Any]] = None  # shipped + saved guesses, and this session's
+        self._kept: Set[str] = set()                      # words whose guess is on disk already
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, word: str) -> WordEntry:
+        key = word.lower()
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = self._resolve(key)
+        return entry
+
+    def _resolve(self, word: str) -> WordEntry:
+        phones = tuple(pronouncing.phones_for_word(word))
+        if not phones:
+            return WordEntry((), "?", _fallback_syllables(word) if word else 0)
+        stress = "".join("S" if c in "12" else "u" for c in pronouncing.stresses(phones[0]))
+        return WordEntry(phones, stress, len(stress))
+
+    def needs_g2p(self, word: str) -> bool:
+        entry = self.lookup(word)
+        return not entry.phones and not entry.guessed
+
+    def resolve_g2p(self, words: Iterable[str], *, use_model: bool = True, persist: Iterable[str] = ()) -> List[str]:
+        """
+        Guess pronunciations for words CMU lacks: the G2P caches first, then
+        the G2P model (when installed and `use_model`). Guesses are kept in
+        memory; those for `persist` words (saved lyrics, explicit lookups)
+        are also written to g2p_cache_path. Returns the words whose entry changed.
+        """
+        from Rhyme_engine.rhyme_engine import get_prosodies, load_json, save_json
+
+        if self._g2p_cache is None:
+            shipped, saved = load_json(PACKAGED_G2P_CACHE), load_json(self.g2p_cache_path)
+            self._g2p_cache = {**shipped, **saved}
+            self._kept = set(shipped) | set(saved)
+        dirty = [False]
+        changed: List[str] = []
+        for word in dict.fromkeys(w.lower() for w in words):
+            if not word or not self.needs_g2p(word):
+                continue
+            core = word.strip(_PUNCT)
+            if core != word and core and not self.needs_g2p(core):
+                # "here," -> "here": no model needed
+                self._entries[word] = self.lookup(core)
+                changed.append(word)
+                continue
+            pros = get_prosodies(word, use_g2p=use_model, cache=self._g2p_cache, dirty=dirty)
+            if not pros:
+                continue
+            stress = "".join("S" if s else "u" for s in pros[0]["stress"])
+            self._guessed[word] = pros
+            self._entries[word] = WordEntry((), stress, int(pros[0]["syllables"]), guessed=True)
+            changed.append(word)
+        keep = {w.lower() for w in persist} & self._g2p_cache.keys() - self._kept
+        if keep:
+            self._kept |= keep
+            saved = load_json(self.g2p_cache_path)
+            saved.update((w, self._g2p_cache[w]) for w in keep)
+            save_json(self.g2p_cache_path, saved)
+        return changed
+
+    def in_dictionary(self, word: str) -> bool:
+        return bool(self.lookup(word).phones)
+
+    def phones(self, word: str) -> List[str]:
+        return list(self.lookup(word).phones)
+
+    def stress(self, word: str) -> str:
+        return self.lookup(word).stress
+
+    def syllables(self, word: str) -> int:
+        return self.lookup(word).syllables
+
+    def prosodies(self, word: str, use_g2p: bool = False) -> List[Prosody]:
+        """
+        Distinct prosodies over every CMU pronunciation (shared list: read-only).
+        use_g2p=True falls back to the guess resolve_g2p() made for the word.
+        """
+        key = word.lower()
+        if use_g2p and key in self._guessed:
+            return self._guessed[key]
+        pros = self._prosodies.get(key)
+        if pros is None:
+            pros, seen = [], set()
+            for phones in self.lookup(key).phones:
+                p = prosody_from_phones(phones)
+                sig = (tuple(p["stress"]), tuple(p["vowels"]))
+                if p["syllables"] and sig not in seen:
+                    seen.add(sig)
+                    pros.append(p)
+            self._prosodies[key] = pros
+        return pros
+
+    def line_stress(self, line: str) -> str:
+        """Stress pattern of a whole line, one mark per syllable ('?' per unknown word)."""
+        return "".join(self.stress(w) for w in line.lower().split())
+
+    def line_syllables(self, line: str) -> int:
+        return sum(self.syllables(w) for w in line.split())
+
+
+@lru_cache(maxsize=1)
+def get_lexicon() -> PhoneticLexicon:
+    return PhoneticLexicon()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--line", required=True)
+    args = p.parse_args()
+
+    lex = get_lexicon()
+    for w in args.line.split():
+        e = lex.lookup(w)
+        print(f"{w:<20} {e.stress:<10} {e.syllables}  {e.phones[0] if e.phones else '(not in CMU)'}")
+    print(f"\nline: {lex.line_stress(args.line)} ({lex.line_syllables(args.line)} syllables)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ Ranked prosody rhyme engine + OPTIONAL G2P fallback (via g2p_en).
 
 - Uses CMU (pronouncing) when available.
 - If --use_g2p and g2p_en is installed, generates pronunciations for OOV words.
-- Caches G2P prosodies to g2p_cache.json to avoid recomputation.
+- Caches G2P prosodies to avoid recomputation: the shipped g2p_cache.json
+  is read only; new guesses go to data_paths.USER_G2P_CACHE.
 - Compatible with existing stress_dictionary.json formats:
     * word -> {stress,vowels,syllables}
     * word -> [ {..}, {..}, ... ]
@@ -14,27 +15,39 @@ Ranked prosody rhyme engine + OPTIONAL G2P fallback (via g2p_en).
 Install optional dependency:
     pip install g2p_en
 
-Examples:
-    python rhyme_engine.py --word precarious --mode strict --top 20
-    python rhyme_engine.py --word mspacium --mode strict --top 20 --use_g2p
+Examples (from the repository root):
+    python -m Rhyme_engine.rhyme_engine --word precarious --mode strict --top 20
+    python -m Rhyme_engine.rhyme_engine --word mspacium --mode strict --top 20 --use_g2p
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 import pronouncing
 import logging
 logging.basicConfig(level=logging.DEBUG)
 import nltk
 from pathlib import Path
+from Rhyme_engine.data_paths import PACKAGED_G2P_CACHE, USER_G2P_CACHE
+from Rhyme_engine.phonetic_lexicon import get_lexicon
 
 Prosody = Dict[str, Any]
 ProsodyStore = Union[Prosody, List[Prosody]]
 
+if TYPE_CHECKING:
+    from Rhyme_engine.rhyme_families import RhymeFamilies
+
+_NLTK_READY = False
+
 def setup_nltk():
+    """Point nltk at the bundled nltk_data (once per process)."""
+    global _NLTK_READY
+    if _NLTK_READY:
+        return
 
     base = Path(__file__).parent
     nltk_path = base / "nltk_data"
@@ -47,6 +60,7 @@ def setup_nltk():
         raise RuntimeError(
             "NLTK tagger missing. Ensure nltk_data folder is included."
         )
+    _NLTK_READY = True
 
 # -----------------------------
 # Optional G2P
@@ -59,12 +73,17 @@ except Exception:
     _G2P_AVAILABLE = False
 
 
+@lru_cache(maxsize=1)
+def _g2p_model() -> "G2p":
+    # loading the model is the slow part; batches of unknown words share one instance
+    return G2p()
+
+
 def _g2p_phones_for_word(word: str) -> List[str]:
     """Return a list of phones strings (CMU-ish) from g2p_en."""
     if not _G2P_AVAILABLE:
         return []
-    g2p = G2p()
-    toks = g2p(word) # example: ['M', 'AH0', 'S', 'P', 'IY1', 'Z', 'AH0', 'M']
+    toks = _g2p_model()(word) # example: ['M', 'AH0', 'S', 'P', 'IY1', 'Z', 'AH0', 'M']
     phones: List[str] = []
     for t in toks:
         if not t or t.isspace():
@@ -109,11 +128,8 @@ def _prosodies_from_phones(phones_list: List[str], normalize_secondary_stress: b
 
 
 def get_prosodies_cmu(word: str) -> List[Prosody]:
-    phones_list = pronouncing.phones_for_word(word)
-    logging.debug(f"The phones_list of the word: {phones_list}") #['TH AH1 N D ER0 B AO2 L T']
-    if not phones_list:
-        return []
-    return _prosodies_from_phones(phones_list, normalize_secondary_stress=True)
+    # resolved once per process by the shared lexicon (same reduction as _prosodies_from_phones)
+    return get_lexicon().prosodies(word)
 
 
 def as_prosody_list(value: Optional[ProsodyStore]) -> List[Prosody]:
@@ -260,10 +276,22 @@ def load_json(path: Path) -> Dict[str, Any]:
 
 
 def save_json(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+def load_g2p_cache(path: Optional[Path] = None) -> Dict[str, Any]:
+    """The shipped G2P guesses overlaid with the user's (`path`, default USER_G2P_CACHE)."""
+    return {**load_json(PACKAGED_G2P_CACHE), **load_json(path or USER_G2P_CACHE)}
+
+
+def save_g2p_cache(path: Optional[Path], cache: Dict[str, Any]) -> None:
+    """Write the guesses of `cache` that were not shipped to `path` (default USER_G2P_CACHE)."""
+    shipped = load_json(PACKAGED_G2P_CACHE)
+    save_json(path or USER_G2P_CACHE, {w: p for w, p in cache.items() if w not in shipped})
+
+
 def get_prosodies(word: str, *, use_g2p: bool, cache: Dict[str, Any], dirty: List[bool]) -> List[Prosody]:
     cmu = get_prosodies_cmu(word)
     if cmu:
@@ -299,20 +327,33 @@ def find_rhymes(
     use_g2p: bool,
     g2p_cache: Dict[str, Any],
     dirty: List[bool],
+    pos_mask: int = 0,
+    families: Optional[RhymeFamilies] = None,
 ) -> List[Tuple[str, float]]:
+    """
+    pos_mask: candidate_store.pos_mask(...) bits; 0 = no part-of-speech filter.
+    families: only score words sharing the base word's last stressed vowel
+    (rhyme_families.RhymeFamilies.slant_candidates) instead of the whole db.
+    """
     base_pros = get_prosodies(word, use_g2p=use_g2p, cache=g2p_cache, dirty=dirty)
     if not base_pros:
         return []
 
     max_diff = 0 if strict_length else max_syll_diff_loose
 
+    pool = db.items()
+    if families is not None:
+        pool = [(w, db[w]) for w in families.slant_candidates(base_pros) if w in db]
+
     out: List[Tuple[str, float]] = []
-    for cand, stored in db.items():
+    for cand, stored in pool:
         if cand.lower() == word.lower():
             continue
         cand_pros = as_prosody_list(stored)
         if not cand_pros:
             continue
+        if pos_mask and not (cand_pros[0].get("pos", 0) & pos_mask):
+            continue
         final, core = best_score(word, cand, base_pros, cand_pros, max_syll_diff=max_diff, max_syllables=max_syllables)
         if core >= threshold and final > 0:
             out.append((cand, final))
@@ -446,19 +487,28 @@ def find_rhymes_api(
     max_syllables: Optional[int] = None,
     use_g2p: bool = True,
     top_phrases: int = 50,
-    min_phrase_score: float = 0.8
+    min_phrase_score: float = 0.8,
+    pos: Optional[Union[str, List[str]]] = None,
+    use_families: bool = False
 ) -> Dict[str, Any]:
+    """
+    pos: only return candidates tagged with this part of speech,
+    e.g. "verb", "noun|adj" or ["noun", "adj"] (see candidate_store.POS_BITS).
+    use_families: prefilter candidates by rhyme family (same last stressed
+    vowel); much faster, but drops rhymes that only match on stress.
+    """
+    from Rhyme_engine.candidate_store import load_candidate_store, pos_mask as to_pos_mask
+    from Rhyme_engine.rhyme_families import load_families
 
-    default_db = Path(__file__).parent / "stress_dictionary.json"
-    default_g2p = Path(__file__).parent / "g2p_cache.json"
-
-    db_path = db_path or default_db
-    g2p_cache_path = g2p_cache_path or default_g2p
+    g2p_cache_path = g2p_cache_path or USER_G2P_CACHE
 
     setup_nltk()
 
-    db: Dict[str, Any] = load_json(db_path)
-    g2p_cache: Dict[str, Any] = load_json(g2p_cache_path)
+    # cached per path; tagged with part-of-speech bits when it was built
+    db: Dict[str, Any] = load_candidate_store(db_path)
+    g2p_cache: Dict[str, Any] = load_g2p_cache(g2p_cache_path)
+    pos_mask = to_pos_mask(pos)
+    families = load_families(db_path) if use_families else None
 
     dirty = [False]
 
@@ -480,7 +530,9 @@ def find_rhymes_api(
             max_syllables=max_syllables,
             use_g2p=use_g2p,
             g2p_cache=g2p_cache,
-            dirty=dirty
+            dirty=dirty,
+            pos_mask=pos_mask,
+            families=families
         )
 
         phrase_results[words[0]] = results
@@ -500,7 +552,9 @@ def find_rhymes_api(
                 max_syllables=max_syllables,
                 use_g2p=use_g2p,
                 g2p_cache=g2p_cache,
-                dirty=dirty
+                dirty=dirty,
+                pos_mask=pos_mask,
+                families=families
             )
 
             phrase_results[word] = results
@@ -516,7 +570,7 @@ def find_rhymes_api(
 
     # Save cache
     if dirty[0]:
-        save_json(g2p_cache_path, g2p_cache)
+        save_g2p_cache(g2p_cache_path, g2p_cache)
 
     return {
         "input": phrase,
@@ -531,23 +585,24 @@ def find_rhymes_api(
 def main() -> None:
     p = argparse.ArgumentParser()
     p.add_argument("--word", required=True)
-    p.add_argument("--db", default="stress_dictionary.json")
+    p.add_argument("--db", default=None, help="candidate store (default: the one the app uses)")
     p.add_argument("--mode", choices=["strict", "end"], default="strict")
     p.add_argument("--top", type=int, default=30)
     p.add_argument("--threshold", type=float, default=0.65)
     p.add_argument("--max_syll_diff", type=int, default=1)
     p.add_argument("--max_syllables", type=int, default=None)
     p.add_argument("--use_g2p", action="store_true")
-    p.add_argument("--g2p_cache", default="g2p_cache.json")
+    p.add_argument("--g2p_cache", type=Path, default=USER_G2P_CACHE)
+    p.add_argument("--pos", default=None, help='e.g. "verb" or "noun|adj"')
     args = p.parse_args()
 
+    from Rhyme_engine.candidate_store import load_candidate_store, pos_mask
+
     strict = args.mode == "strict"
-    db_path = Path(args.db)
-    with open(db_path, "r", encoding="utf-8") as f:
-        db = json.load(f)
+    db = load_candidate_store(args.db)
 
-    cache_path = Path(args.g2p_cache)
-    cache = load_json(cache_path)
+    cache_path = args.g2p_cache
+    cache = load_g2p_cache(cache_path)
     dirty = [False]
 
     if args.use_g2p and not _G2P_AVAILABLE:
@@ -564,10 +619,11 @@ def main() -> None:
         use_g2p=args.use_g2p and _G2P_AVAILABLE,
         g2p_cache=cache,
         dirty=dirty,
+        pos_mask=pos_mask(args.pos),
     )
 
     if dirty[0]:
-        save_json(cache_path, cache)
+        save_g2p_cache(cache_path, cache)
 
     print(f"\nWord: {args.word} | mode={args.mode} | threshold(core)={args.threshold} | top={args.top}")
     if args.max_syllables is not None:
@@ -578,8 +634,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    import json
-    # main()
-    rhymes = find_rhymes_api("Time will")
-    rhymes = json.dumps(rhymes)
-    print(rhymes)
+    main()
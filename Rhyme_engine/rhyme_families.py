@@ -0,0 +1,219 @@
+"""
+rhyme_families.py
+
+Rhyme families: every candidate grouped by its rhyming part, i.e. the phones
+(vowels with stress, and the consonants) from the last stressed vowel to the
+end of the word. Members of a family rhyme perfectly.
+
+    "nation", "station"               -> family "EY1-SH-AH0-N"
+    "fire", "desire", "higher"        -> family "AY1-ER0"   ("fighter": "AY1-T-ER0")
+
+- Slant tier: the same tail without consonants ("EY1-AH0" covers "nation"
+  and "patience"; family_key() of a prosody). families_in_tier() lists the
+  families of one tier.
+- A family ID is its tail signature, so IDs stay stable across rebuilds and
+  dictionary updates (a new word just joins or creates a family).
+- Families are built with the candidate store (candidate_store.build_store)
+  and saved next to it as <store>.families.json; load_families() rebuilds the
+  file if it is missing. Lookups are plain dict reads.
+- families_sharing_vowel() / slant_candidates() narrow a slant-rhyme query to
+  words whose last stressed vowel matches, before find_rhymes scores them.
+- Words CMU does not know (G2P guesses in the store) have no consonants to go
+  by and join the family named by their slant key.
+
+Examples:
+    python -m Rhyme_engine.rhyme_families --word nation
+    python -m Rhyme_engine.rhyme_families --family AY1-ER0 --top 40
+    python -m Rhyme_engine.rhyme_families --tier EY1-AH0
+    python -m Rhyme_engine.rhyme_families --list --vowel AY
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pronouncing
+
+from Rhyme_engine.candidate_store import CandidateStore, common_words, load_candidate_store, store_path
+from Rhyme_engine.rhyme_engine import Prosody, load_json
+
+FAMILIES_VERSION = 2  # 2: family ids include consonants
+
+
+# -----------------------------
+# Family signature
+# -----------------------------
+def family_key(p: Prosody) -> str:
+    """Slant key, vowels only from the last stressed vowel: {'vowels': [N, EY, AH], 'stress': [0, 1, 0]} -> 'EY1-AH0'."""
+    vowels, stress = p["vowels"], p["stress"]
+    if not vowels:
+        return ""
+    start = len(vowels) - 1
+    for i in range(len(vowels) - 1, -1, -1):
+        if i < len(stress) and stress[i]:
+            start = i
+            break
+    return "-".join(f"{v}{stress[i] if i < len(stress) else 0}" for i, v in enumerate(vowels[start:], start))
+
+
+def rhyme_key(phones: str) -> str:
+    """
+    Family id of one CMU pronunciation, from the last stressed vowel to the
+    end with consonants: 'N EY1 SH AH0 N' -> 'EY1-SH-AH0-N' (2 -> 1).
+    """
+    parts = phones.split()
+    vowels = [i for i, ph in enumerate(parts) if ph[-1].isdigit()]
+    if not vowels:
+        return ""
+    stressed = [i for i in vowels if parts[i][-1] in "12"]
+    start = stressed[-1] if stressed else vowels[-1]
+    return "-".join(
+        ph[:-1] + ("1" if ph[-1] in "12" else "0") if ph[-1].isdigit() else ph
+        for ph in parts[start:]
+    )
+
+
+def slant_key(fid: str) -> str:
+    """'EY1-SH-AH0-N' -> 'EY1-AH0': the family's slant tier."""
+    return "-".join(ph for ph in fid.split("-") if ph[-1:].isdigit())
+
+
+def family_vowel(fid: str) -> str:
+    """'EY1-SH-AH0-N' -> 'EY'"""
+    return fid.split("-", 1)[0].rstrip("012")
+
+
+def _member_order(common: frozenset):
+    return lambda w: (w not in common, len(w), w)
+
+
+def build_families(store: CandidateStore) -> Dict[str, List[str]]:
+    """family id -> members, common words first, then shortest."""
+    families: Dict[str, Set[str]] = {}
+    for word, pros in store.items():
+        phones = pronouncing.phones_for_word(word)
+        fids = {rhyme_key(ph) for ph in phones} if phones else {family_key(p) for p in pros}
+        for fid in fids:
+            if fid:
+                families.setdefault(fid, set()).add(word)
+    order = _member_order(common_words())
+    return {fid: sorted(words, key=order) for fid, words in sorted(families.items())}
+
+
+# -----------------------------
+# Index
+# -----------------------------
+class RhymeFamilies:
+    def __init__(self, families: Dict[str, List[str]]):
+        self.families = families
+        self.by_word: Dict[str, List[str]] = {}
+        self.by_vowel: Dict[str, List[str]] = {}
+        self.by_tier: Dict[str, List[str]] = {}
+        for fid, members in families.items():
+            self.by_vowel.setdefault(family_vowel(fid), []).append(fid)
+            self.by_tier.setdefault(slant_key(fid), []).append(fid)
+            for w in members:
+                self.by_word.setdefault(w, []).append(fid)
+
+    def __len__(self) -> int:
+        return len(self.families)
+
+    def members(self, fid: str) -> List[str]:
+        return self.families.get(fid, [])
+
+    def size(self, fid: str) -> int:
+        return len(self.families.get(fid, ()))
+
+    def families_of(self, word: str) -> List[str]:
+        return self.by_word.get(word.lower(), [])
+
+    def families_in_tier(self, tier: str) -> List[str]:
+        """Families whose slant key is `tier` (e.g. 'EY1-AH0'), largest first."""
+        return sorted(self.by_tier.get(tier.upper(), []), key=lambda fid: (-self.size(fid), fid))
+
+    def list_families(self, *, vowel: Optional[str] = None, min_size: int = 2) -> List[Tuple[str, int]]:
+        """(family id, size) pairs, largest first."""
+        fids = self.by_vowel.get(vowel.upper(), []) if vowel else self.families
+        out = [(fid, self.size(fid)) for fid in fids if self.size(fid) >= min_size]
+        out.sort(key=lambda kv: (-kv[1], kv[0]))
+        return out
+
+    def families_sharing_vowel(self, prosodies: Iterable[Prosody]) -> List[str]:
+        """Every family whose stressed vowel matches one of `prosodies`' families."""
+        out: List[str] = []
+        for vowel in {family_vowel(family_key(p)) for p in prosodies if p.get("vowels")}:
+            out.extend(self.by_vowel.get(vowel, []))
+        return out
+
+    def slant_candidates(self, prosodies: Iterable[Prosody]) -> Set[str]:
+        """Words worth scoring for a slant rhyme: same last stressed vowel, any tail."""
+        words: Set[str] = set()
+        for fid in self.families_sharing_vowel(prosodies):
+            words.update(self.families[fid])
+        return words
+
+
+# -----------------------------
+# Persistence
+# -----------------------------
+def families_path(db_path: Optional[Path] = None) -> Path:
+    path = store_path(db_path)
+    return path.with_name(path.stem + ".families.json")
+
+
+def save_families(db_path: Optional[Path], families: Dict[str, List[str]]) -> None:
+    path = families_path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": FAMILIES_VERSION, "families": families}, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_families(db_path: Optional[Path] = None) -> RhymeFamilies:
+    """Cached per store path; builds and saves the families file on first use."""
+    return _load_families(store_path(db_path))
+
+
+@lru_cache(maxsize=4)
+def _load_families(path: Path) -> RhymeFamilies:
+    raw = load_json(families_path(path))
+    if raw.get("version") == FAMILIES_VERSION:
+        return RhymeFamilies(raw["families"])
+    families = build_families(load_candidate_store(path))
+    try:
+        save_families(path, families)
+    except OSError:
+        pass
+    return RhymeFamilies(families)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("--word", default=None, help="show the families of a word")
+    p.add_argument("--family", default=None, help="show the members of a family, e.g. AY1-ER0")
+    p.add_argument("--tier", default=None, help="show the families of a slant tier, e.g. EY1-AH0")
+    p.add_argument("--list", action="store_true", help="list families, largest first")
+    p.add_argument("--vowel", default=None, help="with --list: only families on this stressed vowel")
+    p.add_argument("--top", type=int, default=30)
+    args = p.parse_args()
+
+    fam = load_families()
+    if args.word:
+        for fid in fam.families_of(args.word):
+            print(f"{fid:<16} {fam.size(fid):>6}  {', '.join(fam.members(fid)[:args.top])}")
+    if args.family:
+        print(f"{args.family} ({fam.size(args.family)} words)")
+        print(", ".join(fam.members(args.family)[:args.top]))
+    if args.tier:
+        for fid in fam.families_in_tier(args.tier):
+            print(f"{fid:<16} {fam.size(fid):>6}  {', '.join(fam.members(fid)[:args.top])}")
+    if args.list:
+        for fid, size in fam.list_families(vowel=args.vowel)[:args.top]:
+            print(f"{fid:<16} {size:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import json
+import sqlite3
+from pathlib import Path
+import logging
+from db_connection import commit, get_connection, rollback
+logging.basicConfig(level=logging.DEBUG)
+
+
+class AnalysisCache():
+    """
+    Stores analyzer results per song text: one row per
+    (lyrics_hash, analyzer, analyzer_version), the result serialized as JSON.
+
+    An edited song has a new lyrics_hash and a changed analyzer has a new
+    version, so either simply misses the cache; prune() removes the rows
+    nothing can hit any more.
+
+    Used from the GUI thread and the background analysis thread, so every
+    call runs on the calling thread's own connection (db_connection.py).
+    """
+
+    def __init__(self):
+        self.db_path = Path(__file__).parent / "lyrical_lab.db"
+        self.analysis_cache = "analysis_cache"
+
+        # same statement as migration 004, for databases that have not been migrated yet
+        try:
+            self.conn.execute(CREATE_ANALYSIS_CACHE)
+            self._commit_data()
+        except sqlite3.DatabaseError as e:
+            rollback(self.conn)
+            logging.debug(e)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return get_connection(self.db_path)
+
+    def _commit_data(self):
+        """Commits data to data base (does not close connection)"""
+        commit(self.conn)
+
+    def get(self, lyrics_hash: str, analyzer: str, analyzer_version: str):
+        """Decoded result, or None on a miss."""
+
+        query = f"""SELECT result FROM {self.analysis_cache}
+            WHERE lyrics_hash = ? AND analyzer = ? AND analyzer_version = ?;"""
+        try:
+            row = self.conn.execute(query, (lyrics_hash, analyzer, analyzer_version)).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.DatabaseError, ValueError) as e:
+            logging.debug(e)
+            return None
+
+    def missing(self, hashes: list, analyzer: str, analyzer_version: str) -> set:
+        """The hashes among `hashes` that have no result for this analyzer version."""
+
+        query = f"""SELECT lyrics_hash FROM {self.analysis_cache}
+            WHERE analyzer = ? AND analyzer_version = ?;"""
+        try:
+            cached = {row[0] for row in self.conn.execute(query, (analyzer, analyzer_version))}
+            return set(hashes) - cached
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+            return set(hashes)
+
+    def put(self, lyrics_hash: str, analyzer: str, analyzer_version: str, result) -> dict:
+
+        query = f"""INSERT OR REPLACE INTO {self.analysis_cache}
+            (lyrics_hash, analyzer, analyzer_version, result) VALUES (?, ?, ?, ?);"""
+        try:
+            payload = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+            self.conn.execute(query, (lyrics_hash, analyzer, analyzer_version, payload))
+            self._commit_data()
+            return {"message": "Analysis cached", "state": True}
+        except sqlite3.DatabaseError as e:
+            rollback(self.conn)
+            logging.debug(e)
+            return {"message": "Database Error - Please try again", "state": False}
+        except Exception as e:
+            rollback(self.conn)
+            logging.debug(e)
+            return {"message": "Error - Please try again", "state": False}
+
+    def prune(self, analyzer: str, analyzer_version: str) -> dict:
+        """
+        Drop this analyzer's rows from other versions, and rows for texts that
+        are no longer any song's current lyrics.
+        """
+
+        query = f"""DELETE FROM {self.analysis_cache}
+            WHERE analyzer = ?
+              AND (analyzer_version != ?
+                   OR lyrics_hash NOT IN (SELECT lyrics_hash FROM lyrics_table WHERE lyrics_hash IS NOT NULL));"""
+        try:
+            removed = self.conn.execute(query, (analyzer, analyzer_version)).rowcount
+            self._commit_data()
+            return {"message": f"Removed {removed} stale analyses", "state": True}
+        except sqlite3.DatabaseError as e:
+            rollback(self.conn)
+            logging.debug(e)
+            return {"message": "Database Error - Please try again", "state": False}
+
+
+CREATE_ANALYSIS_CACHE = """
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        lyrics_hash TEXT NOT NULL,
+        analyzer TEXT NOT NULL,
+        analyzer_version TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (lyrics_hash, analyzer, analyzer_version)
+    ) WITHOUT ROWID;
+"""
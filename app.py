@@ -1,4 +1,5 @@
 from pathlib import Path
+import logging
 import sys
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
@@ -9,10 +10,12 @@ from lyrics_db import Lyrics
 from stats_db import Stats
 from services.models import Note, SongPreview
 from services.lyrics_library import LyricsLibrary
-from db_migration_table import MigrationManager
+from db_migration_table import MigrationManager, MIGRATIONS
+from db_writer import get_writer
 
 # ── App version (bump this with each release) ─────────────────────────────────
 CURRENT_VERSION = "1.0.0"
+RECENT_SONGS = 9  # cards on the dashboard (three rows)
 
 
 def check_for_updates_async(parent_window):
@@ -52,10 +55,18 @@ def main():
 
     window_icon = Path(__file__).parent / "ui" / "Icons" / "logo_no_bg.png"
 
+    # apply pending schema migrations (search index, caches) before any DB class is used
+    try:
+        MigrationManager().migrate(MIGRATIONS, app_version=CURRENT_VERSION)
+    except Exception as e:
+        logging.error(f"Migrations not applied: {e}")
+
     scratch_pad = ScratchPad()
     lyrics = Lyrics()
 
     app = QApplication(sys.argv)
+    # commit whatever the write-behind queue still holds before the process exits
+    app.aboutToQuit.connect(lambda: get_writer().close(timeout=10))
     w = LLDashboard()
     w.setWindowTitle("M-Prosody - Dashboard")
     w.setWindowIcon(QIcon(str(window_icon)))
@@ -69,8 +80,6 @@ def main():
         from ui.main_window import MProsody
         lyrics_library = LyricsLibrary()
 
-        latest_songs = get_lastest_songs()
-        
         window = MProsody() 
         window.showMaximized()
         window.theme_changed_signal.connect(w.apply_theme)
@@ -85,9 +94,7 @@ def main():
             song_id, title, artist, album, genre, mood, lyrics = song_data[:7]
             data = lyrics_library.get_song_by_id(song_id)
             lyrics = data[6]
-            window.current_song_id = song_id
-            window.editor.load_song_fields(title or "", artist or "", album or "", genre or "", mood or "")
-            window.editor.load_lyrics(lyrics or "")
+            window.load_song(song_id, title, artist, album, genre, mood, lyrics)
 
     def get_notes():
         notes = scratch_pad.get_all_content()
@@ -100,7 +107,7 @@ def main():
         return notes_obj_list
 
     def create_note(note):
-        return scratch_pad.add_content(note)
+        return get_writer().submit(ScratchPad, "add_content", note)
     
     def delete_note(id): 
         return scratch_pad.delete_content(id)
@@ -109,8 +116,10 @@ def main():
         return scratch_pad.update_content(id, note)
 
     def get_lastest_songs():
-        songs = lyrics.get_all_songs()
+        songs = lyrics.get_recent_songs(limit=RECENT_SONGS)
         songs_obj_list = []
+        if isinstance(songs, dict):
+            return songs_obj_list
 
         for s in songs:
             song = SongPreview(id=s[0], title=s[1], artist=s[2])
@@ -123,23 +132,9 @@ def main():
         w.set_recent_songs(latest_songs)
 
     def get_stats():
-        stats = Stats()
-
-        ls = lyrics.get_latest_songs_count()
-        ts = lyrics.get_all_songs_count()
-
-        # if ls.get("status"):
-        #     songs_num = ls.get("message", 0)[0]
-        
-        # if ts.get('status'):
-        #     total_songs_num = ts.get('message', 0)[0]
-
-        songs_num = ls.get("message", [0])[0] if ls.get("status") else 0
-        total_songs_num = ts.get("message", [0])[0] if ts.get("status") else 0
-            
-        stats = stats.get_res_stats()
-        writing_time = stats[1]
-        sessions = stats[2] 
+        # this week's writing time, sessions and new songs, and the library size:
+        # one fetch from the trigger-maintained counters
+        writing_time, sessions, songs_num, total_songs_num = Stats().get_dashboard()
 
         return writing_time, sessions, songs_num, total_songs_num
     
@@ -0,0 +1,124 @@
+"""
+One place that opens lyrical_lab.db.
+
+- WAL journaling: readers never wait on a writer and a writer does not wait
+  on readers. The journal mode is stored in the database file, so it is set
+  once per file and every later connection inherits it.
+- Per-connection pragmas tuned for a desktop app (see PRAGMAS).
+- get_connection() hands each thread its own connection, created once and
+  reused by every DB class on that thread (Lyrics, Stats, ScratchPad,
+  Themes, AnalysisCache), so worker threads never share a connection.
+- Prepared statements: sqlite3 keeps an LRU of compiled statements per
+  connection keyed by SQL text. With one long-lived connection per thread
+  and parameterized queries (? placeholders, never values formatted into
+  the SQL), a repeated query skips the SQL compiler.
+- commit()/rollback() for the DB classes: inside write_batch() (the
+  write-behind thread, db_writer.py) a commit waits for the end of the batch
+  and a rollback undoes only the current operation.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import logging
+logging.basicConfig(level=logging.DEBUG)
+
+DB_PATH = Path(__file__).parent / "lyrical_lab.db"
+
+PRAGMAS = {
+    "synchronous": "NORMAL",      # durable at checkpoints; safe with WAL
+    "cache_size": "-16000",       # 16 MB page cache (negative = KiB)
+    "mmap_size": str(64 * 1024 * 1024),
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",       # ms to wait for another writer instead of failing
+}
+
+STATEMENT_CACHE_SIZE = 256
+
+OPERATION_SAVEPOINT = "write_op"
+
+_local = threading.local()
+_wal_ready = set()
+_wal_lock = threading.Lock()
+
+
+def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """A new connection with WAL and PRAGMAS applied (for callers that need one of their own)."""
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+    key = str(Path(db_path).resolve())
+    with _wal_lock:
+        if key not in _wal_ready:
+            mode = conn.execute("PRAGMA journal_mode=WAL;").fetchone()[0]
+            if mode.lower() != "wal":
+                logging.debug(f"WAL not available for {db_path}, using {mode}")
+            _wal_ready.add(key)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value};")
+    return conn
+
+
+def get_connection(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """This thread's shared connection to `db_path`, opened on first use."""
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    key = str(db_path)
+    conn = conns.get(key)
+    if conn is None:
+        conn = conns[key] = connect(db_path)
+    return conn
+
+
+def close_connection(db_path: Path = DB_PATH) -> None:
+    """Close this thread's connection (worker threads call this before they exit)."""
+    conns = getattr(_local, "conns", {})
+    conn = conns.pop(str(db_path), None)
+    if conn is not None:
+        conn.close()
+
+
+def in_batch() -> bool:
+    """True while this thread runs the operations of a write_batch()."""
+    return getattr(_local, "batching", False)
+
+
+def commit(conn: sqlite3.Connection) -> None:
+    """conn.commit(), deferred to the end of the batch inside write_batch()."""
+    if not in_batch():
+        conn.commit()
+
+
+def rollback(conn: sqlite3.Connection) -> None:
+    """conn.rollback(); inside write_batch() only the current operation is undone."""
+    if in_batch():
+        conn.execute(f"ROLLBACK TO {OPERATION_SAVEPOINT};")
+    else:
+        conn.rollback()
+
+
+@contextmanager
+def write_batch(conn: sqlite3.Connection):
+    """One transaction (one commit, one fsync) around several write operations."""
+    conn.execute("BEGIN;")
+    _local.batching = True
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _local.batching = False
+
+
+@contextmanager
+def write_operation(conn: sqlite3.Connection):
+    """One operation of a write_batch(): if it raises, its own changes are undone and the batch goes on."""
+    conn.execute(f"SAVEPOINT {OPERATION_SAVEPOINT};")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {OPERATION_SAVEPOINT};")
+        raise
+    finally:
+        conn.execute(f"RELEASE {OPERATION_SAVEPOINT};")
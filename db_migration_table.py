@@ -1,7 +1,17 @@
 import sqlite3
 from pathlib import Path
 import logging
-import shutil
+
+from analysis_cache_db import CREATE_ANALYSIS_CACHE
+from db_connection import connect
+from lyrics_db import (
+    LYRICS_INDEXES_MIGRATION,
+    SONGS_FTS_MIGRATION,
+    VERSION_HISTORY_MIGRATION,
+    Lyrics,
+    compress_version_history,
+)
+from stats_db import DASHBOARD_COUNTERS_MIGRATION, STATS_ROLLUPS_MIGRATION
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -9,7 +19,9 @@ logging.basicConfig(level=logging.DEBUG)
 class MigrationManager:
     def __init__(self, db_name="lyrical_lab.db"):
         self.db_path = Path(__file__).parent / db_name
-        self.conn = sqlite3.connect(self.db_path)
+        # its own connection: migrations run in their own transactions, and
+        # row_factory must not leak into the connection the DB classes share
+        self.conn = connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
 
     # -------------------------
@@ -56,12 +68,27 @@ class MigrationManager:
         return {row["id"] for row in cur.fetchall()}
 
     def apply_migration(self, migration):
-        """Apply a single migration inside an atomic transaction."""
+        """
+        Apply a single migration inside an atomic transaction.
+        "sql" is one statement or a list of them (e.g. create, triggers, backfill).
+        "run" (optional) is a function of the connection, called after the sql
+        in the same transaction, for data conversions SQL cannot express.
+        "vacuum": True reclaims the space the migration freed, once committed.
+        """
         logging.debug(f"Applying migration: {migration['id']}")
 
+        statements = migration.get("sql", [])
+        if isinstance(statements, str):
+            statements = [statements]
+
         try:
             with self.conn:
-                self.conn.execute(migration["sql"])
+                # explicit BEGIN: sqlite3 does not open a transaction before DDL on its own
+                self.conn.execute("BEGIN")
+                for sql in statements:
+                    self.conn.execute(sql)
+                if migration.get("run"):
+                    migration["run"](self.conn)
                 self.conn.execute(
                     "INSERT INTO migrations (id) VALUES (?)",
                     (migration["id"],)
@@ -70,12 +97,24 @@ class MigrationManager:
             logging.error(f"Migration failed: {migration['id']} → {e}")
             raise
 
+        if migration.get("vacuum"):
+            # outside any transaction; a failure only leaves the file larger
+            try:
+                self.conn.execute("VACUUM")
+            except sqlite3.DatabaseError as e:
+                logging.debug(f"VACUUM after {migration['id']} skipped: {e}")
+
     # -------------------------
     # Safety
     # -------------------------
     def backup(self):
         backup_path = self.db_path.with_suffix(".backup.db")
-        shutil.copy(self.db_path, backup_path)
+        # sqlite's online backup: a file copy would miss pages still in the WAL
+        target = sqlite3.connect(backup_path)
+        try:
+            self.conn.backup(target)
+        finally:
+            target.close()
         logging.debug(f"Backup created at: {backup_path}")
 
     # -------------------------
@@ -85,14 +124,14 @@ class MigrationManager:
         self.initialize()
 
         applied = self.get_applied_migrations()
+        pending = [m for m in migrations if m["id"] not in applied]
 
-        # Backup BEFORE any changes
-        if self.db_path.exists():
+        # Backup BEFORE any changes (only when there is something to apply)
+        if pending and self.db_path.exists():
             self.backup()
 
-        for migration in migrations:
-            if migration["id"] not in applied:
-                self.apply_migration(migration)
+        for migration in pending:
+            self.apply_migration(migration)
 
         # Optional: store app version AFTER successful migration
         if app_version:
@@ -124,6 +163,32 @@ MIGRATIONS = [
             ALTER TABLE notes ADD COLUMN updated_at TEXT;
         """
     },
+    {
+        "id": "004_create_analysis_cache",
+        "sql": CREATE_ANALYSIS_CACHE,
+    },
+    {
+        "id": "005_create_songs_fts",
+        "sql": SONGS_FTS_MIGRATION,
+    },
+    {
+        "id": "006_add_lyrics_indexes",
+        "sql": LYRICS_INDEXES_MIGRATION,
+    },
+    {
+        "id": "007_compress_version_history",
+        "sql": VERSION_HISTORY_MIGRATION,
+        "run": compress_version_history,
+        "vacuum": True,
+    },
+    {
+        "id": "008_stats_upsert_rollups",
+        "sql": STATS_ROLLUPS_MIGRATION,
+    },
+    {
+        "id": "009_dashboard_counters",
+        "sql": DASHBOARD_COUNTERS_MIGRATION,
+    },
 ]
 
 
@@ -135,4 +200,11 @@ if __name__ == "__main__":
         app_version="1.0.0"
     )
 
-    print("DB Version:", manager.get_db_version())
\ No newline at end of file
+    print("DB Version:", manager.get_db_version())
+
+    # every hot lookup must stay on an index; exit non-zero if one regressed to a scan
+    problems = Lyrics().check_query_plans()
+    for problem in problems:
+        print("Full scan:", problem)
+    if problems:
+        raise SystemExit(1)
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Write-behind queue for DB writes made from the GUI thread.
+
+submit(Stats, "add_writing_time", seconds) returns at once; a single
+background thread runs the call on its own instance of the DB class (so on
+its own connection, db_connection.py) and resolves the returned Future with
+the method's result once it is committed. Writes that arrive within
+WRITE_INTERVAL of each other share one transaction, so one commit (one
+fsync) covers the whole group. Each call runs inside its own savepoint: a
+call that fails is undone without taking the rest of the group with it.
+
+flush() blocks until everything submitted so far is committed: at shutdown
+and before anything that must read back what was just written.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from db_connection import DB_PATH, get_connection, write_batch, write_operation
+logging.basicConfig(level=logging.DEBUG)
+
+WRITE_INTERVAL = 0.05   # s to keep collecting writes after the first one
+MAX_BATCH = 64
+
+
+class DBWriter:
+
+    def __init__(self, db_path=DB_PATH, interval: float = WRITE_INTERVAL, max_batch: int = MAX_BATCH):
+        self.db_path = db_path
+        self.interval = interval
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._instances = {}  # DB class -> its instance on the writer thread
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, db_class, method: str, *args, **kwargs) -> Future:
+        """Queue db_class().method(*args, **kwargs); the Future gets its return value after the commit."""
+        future = Future()
+        self._queue.put((future, db_class, method, args, kwargs))
+        return future
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every write submitted before this call is committed. False on timeout."""
+        if not self._thread.is_alive():
+            return self._queue.empty()
+        marker = Future()
+        self._queue.put((marker, None, None, (), {}))
+        try:
+            marker.result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: float | None = None) -> bool:
+        """flush(), then stop the writer thread."""
+        flushed = self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+        return flushed
+
+    def _next_batch(self) -> list | None:
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        conn = get_connection(self.db_path)
+        while (batch := self._next_batch()) is not None:
+            # DB classes set up their connection (and may migrate columns) outside the batch
+            for _, db_class, _, _, _ in batch:
+                if db_class is not None and db_class not in self._instances:
+                    try:
+                        self._instances[db_class] = db_class()
+                    except Exception as e:
+                        logging.debug(f"db writer: cannot create {db_class.__name__}: {e}")
+
+            results = []
+            try:
+                with write_batch(conn):
+                    for future, db_class, method, args, kwargs in batch:
+                        if db_class is None:
+                            results.append((future, None, None))
+                            continue
+                        try:
+                            with write_operation(conn):
+                                instance = self._instances[db_class]
+                                results.append((future, getattr(instance, method)(*args, **kwargs), None))
+                        except Exception as e:
+                            logging.debug(f"db writer: {getattr(db_class, '__name__', db_class)}.{method} failed: {e}")
+                            results.append((future, None, e))
+            except Exception as e:
+                # the commit itself failed: nothing in the batch was written
+                logging.debug(f"db writer: batch of {len(batch)} not committed: {e}")
+                results = [(future, None, e) for future, *_ in batch]
+
+            for future, result, error in results:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> DBWriter:
+    """The app's write-behind queue, started on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DBWriter()
+        return _writer
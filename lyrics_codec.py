@@ -0,0 +1,250 @@
+"""
+At-rest compression of lyrics_versions.lyrics: zlib with a preset dictionary
+trained from the writer's own catalog (hooks, chorus lines, common words).
+
+- Optional: nothing is compressed until a dictionary has been trained
+  (`python lyrics_codec.py train`). From then on Lyrics stores new history
+  rows compressed; `recompress` converts the existing ones.
+- Only when it pays: train keeps a dictionary only if the history bytes it
+  saves exceed what the dictionary itself takes in meta (--force keeps it
+  anyway). Since version history is stored as deltas (lyrics_db), a small
+  catalog's history is a few KB and a 32 KB dictionary makes the file
+  larger, not smaller; `bench` shows the numbers for a given database.
+  Reads always cost more: every compressed row primes zlib with the whole
+  dictionary (a few us per row instead of ~1.5 us).
+- Dictionaries are versioned in the meta table (lyrics_zdict:<id>, base64).
+  Every compressed value carries the id of its dictionary, so retraining
+  never strands older rows, and plain text rows keep reading as they are.
+  A codec that meets an id it has not loaded (a dictionary trained while
+  the app was open) reloads meta before giving up.
+- Compressed values are BLOBs (MAGIC + id + zlib stream); decode() turns
+  them back into str, so callers of the DB layer only ever see text.
+
+lyrics_table.lyrics stays plain: the songs_fts index, its snippets and the
+LIKE search read that column directly in SQL.
+"""
+import argparse
+import base64
+import logging
+import sqlite3
+import struct
+import tempfile
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+
+from db_connection import DB_PATH, connect
+logging.basicConfig(level=logging.DEBUG)
+
+MAGIC = b"LZ"
+DICT_KEY = "lyrics_zdict:"
+DICT_SIZE = 32 * 1024   # zlib's window: dictionary bytes past this are never referenced
+MIN_COMPRESS = 64       # shorter texts do not win back the header
+
+# delta rows (lyrics_db.make_delta) are JSON; seed the dictionary with their framing
+_DELTA_SEEDS = ('[[', ']]', '],[', ',"', '\\n"', '\\n')
+
+
+def train_dictionary(texts, size: int = DICT_SIZE) -> bytes:
+    """
+    A zlib preset dictionary from a corpus: repeated lines first, then
+    frequent words, most valuable last (zlib reaches the end of the
+    dictionary with the shortest distances).
+    """
+    lines, words = Counter(), Counter()
+    for text in texts:
+        for line in (text or "").splitlines():
+            line = line.strip()
+            if line:
+                lines[line] += 1
+                words.update(line.split())
+
+    candidates = [(count * len(line), line + "\n") for line, count in lines.items() if count > 1]
+    candidates += [(count * len(word), word + " ") for word, count in words.items() if count > 1]
+    candidates.sort(reverse=True)
+
+    picked, used = [], sum(len(s) for s in _DELTA_SEEDS)
+    for _, segment in candidates:
+        n = len(segment.encode("utf-8"))
+        if used + n > size:
+            continue
+        picked.append(segment)
+        used += n
+    picked.reverse()
+    return ("".join(_DELTA_SEEDS) + "".join(picked)).encode("utf-8")
+
+
+def save_dictionary(conn: sqlite3.Connection, zdict: bytes) -> int:
+    """Store `zdict` under the next id in meta (the caller commits); returns the id."""
+    # same table MigrationManager.initialize creates, for databases not migrated yet
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);")
+    rows = conn.execute("SELECT key FROM meta WHERE key LIKE ?;", (DICT_KEY + "%",)).fetchall()
+    dict_id = max((int(key[len(DICT_KEY):]) for key, in rows), default=0) + 1
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?);",
+                 (f"{DICT_KEY}{dict_id}", base64.b64encode(zdict).decode("ascii")))
+    return dict_id
+
+
+def load_dictionaries(conn: sqlite3.Connection) -> dict:
+    """id -> dictionary for every dictionary stored in meta ({} if there are none)."""
+    try:
+        rows = conn.execute("SELECT key, value FROM meta WHERE key LIKE ?;", (DICT_KEY + "%",)).fetchall()
+    except sqlite3.DatabaseError as e:
+        logging.debug(e)
+        rows = []
+    return {int(key[len(DICT_KEY):]): base64.b64decode(value) for key, value in rows}
+
+
+class LyricsCodec:
+    """Compresses with the newest dictionary, decompresses with whichever one a value names."""
+
+    def __init__(self, dictionaries: dict | None = None, conn: sqlite3.Connection | None = None):
+        self.conn = conn  # where to look for dictionaries added after loading
+        self._set(dictionaries or {})
+
+    def _set(self, dictionaries: dict) -> None:
+        self.dictionaries = dictionaries
+        self.current = max(self.dictionaries) if self.dictionaries else None
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection) -> "LyricsCodec":
+        """The dictionaries stored in meta; an empty codec (no compression) if there are none."""
+        return cls(load_dictionaries(conn), conn)
+
+    def _dictionary(self, dict_id: int) -> bytes:
+        if dict_id not in self.dictionaries and self.conn is not None:
+            self._set(load_dictionaries(self.conn))
+        try:
+            return self.dictionaries[dict_id]
+        except KeyError:
+            raise LookupError(f"lyrics dictionary {dict_id} is not in meta ({DICT_KEY}{dict_id})") from None
+
+    @property
+    def enabled(self) -> bool:
+        return self.current is not None
+
+    def encode(self, text: str):
+        """A compressed BLOB, or `text` itself when compression is off or does not pay."""
+        if not self.enabled or not text or len(text) < MIN_COMPRESS:
+            return text
+        raw = text.encode("utf-8")
+        c = zlib.compressobj(9, zdict=self.dictionaries[self.current])
+        blob = MAGIC + struct.pack(">H", self.current) + c.compress(raw) + c.flush()
+        return blob if len(blob) < len(raw) else text
+
+    def decode(self, value) -> str:
+        if isinstance(value, bytes) and value[:2] == MAGIC:
+            (dict_id,) = struct.unpack(">H", value[2:4])
+            d = zlib.decompressobj(zdict=self._dictionary(dict_id))
+            return (d.decompress(value[4:]) + d.flush()).decode("utf-8")
+        return value
+
+
+def recompress(conn: sqlite3.Connection, codec: LyricsCodec, compress: bool = True) -> int:
+    """Re-encode every lyrics_versions row with codec's newest dictionary (compress=False: as plain text)."""
+    rows = conn.execute("SELECT id, lyrics FROM lyrics_versions;").fetchall()
+    encode = codec.encode if compress else str
+    with conn:
+        conn.executemany("UPDATE lyrics_versions SET lyrics = ? WHERE id = ?;",
+                         [(encode(codec.decode(value)), row_id) for row_id, value in rows])
+    return len(rows)
+
+
+def payoff(conn: sqlite3.Connection, zdict: bytes) -> tuple:
+    """(history bytes `zdict` would save, bytes it takes in meta)."""
+    codec, trial = LyricsCodec.load(conn), LyricsCodec({1: zdict})
+    saved = 0
+    for value, in conn.execute("SELECT lyrics FROM lyrics_versions;"):
+        text = codec.decode(value)
+        if text:
+            encoded = trial.encode(text)
+            saved += len(text.encode("utf-8")) - len(encoded if isinstance(encoded, bytes) else encoded.encode("utf-8"))
+    return saved, len(base64.b64encode(zdict))
+
+
+def train(conn: sqlite3.Connection, force: bool = False) -> int | None:
+    """
+    Train a dictionary from the current catalog and, if it saves more than
+    it costs to store (or `force`), store it and recompress history with
+    it. Returns its id, or None when it was not kept.
+    """
+    texts = [lyrics for lyrics, in conn.execute("SELECT lyrics FROM lyrics_table;")]
+    zdict = train_dictionary(texts)
+    saved, cost = payoff(conn, zdict)
+    if saved <= cost and not force:
+        logging.info(f"lyrics dictionary not kept: saves {saved:,} bytes of history, costs {cost:,} in meta")
+        return None
+    with conn:
+        dict_id = save_dictionary(conn, zdict)
+    recompress(conn, LyricsCodec.load(conn))
+    return dict_id
+
+
+def benchmark(db_path: Path) -> None:
+    """
+    DB size and history read latency of `db_path` stored plain vs compressed
+    (on copies). The compressed copy keeps a dictionary even when train()
+    would reject it, so the cost shows up in the numbers.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for mode in ("plain", "compressed"):
+            copy = Path(tmp) / f"{mode}.db"
+            source, conn = sqlite3.connect(db_path), connect(copy)
+            source.backup(conn)  # a file copy would miss pages still in the WAL
+            source.close()
+            codec = LyricsCodec.load(conn)
+            if mode == "plain":
+                recompress(conn, codec, compress=False)
+            elif codec.enabled:
+                recompress(conn, codec)
+            else:
+                train(conn, force=True)
+            codec = LyricsCodec.load(conn)
+            conn.execute("VACUUM;")
+
+            payload = conn.execute(
+                "SELECT count(*), coalesce(sum(length(CAST(lyrics AS BLOB))), 0) FROM lyrics_versions;"
+            ).fetchone()
+            start, rounds = time.perf_counter(), 20
+            for _ in range(rounds):
+                for value, in conn.execute("SELECT lyrics FROM lyrics_versions;"):
+                    codec.decode(value)
+            per_row = (time.perf_counter() - start) / max(payload[0] * rounds, 1)
+            conn.close()
+            results[mode] = (copy.stat().st_size, payload[1], per_row)
+
+        print(f"{'':12}{'db file':>12}{'history':>12}{'read/row':>12}")
+        for mode, (size, payload_bytes, per_row) in results.items():
+            print(f"{mode:12}{size:>12,}{payload_bytes:>12,}{per_row * 1e6:>10.1f}us")
+        if results["compressed"][0] >= results["plain"][0]:
+            print("Compression does not pay off on this database: keep history plain.")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compression of lyrics version history.")
+    p.add_argument("command", choices=("train", "recompress", "decompress", "bench"))
+    p.add_argument("--db", type=Path, default=DB_PATH)
+    p.add_argument("--force", action="store_true", help="train: keep the dictionary even if it does not pay off")
+    args = p.parse_args()
+
+    if args.command == "bench":
+        benchmark(args.db)
+        return
+    conn = connect(args.db)
+    if args.command == "train":
+        dict_id = train(conn, args.force)
+        print(f"Trained dictionary {dict_id}" if dict_id else
+              "Dictionary not kept: it would cost more than it saves (--force to keep it)")
+    elif args.command == "recompress":
+        print(f"Recompressed {recompress(conn, LyricsCodec.load(conn))} versions")
+    else:
+        # back to plain text; the dictionaries stay in meta
+        print(f"Decompressed {recompress(conn, LyricsCodec.load(conn), compress=False)} versions")
+    conn.execute("VACUUM;")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
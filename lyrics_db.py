@@ -1,19 +1,201 @@
 import re
+import json
 import sqlite3
 from pathlib import Path
 import hashlib
+from difflib import SequenceMatcher
 from datetime import datetime, timedelta
 import logging
+from db_connection import commit, connect, get_connection, in_batch, rollback
+from lyrics_codec import LyricsCodec
 import uuid
 logging.basicConfig(level=logging.DEBUG)
 
+
+def normalize_lyrics(lyrics: str) -> str:
+    """Line endings to \\n, trailing whitespace and trailing blank lines dropped."""
+    if not lyrics:
+        return ""
+    lyrics = lyrics.replace("\r\n", "\n").replace("\r", "\n")
+    lyrics = "\n".join(line.rstrip() for line in lyrics.split("\n"))
+    return lyrics.rstrip("\n")
+
+
+def hash_lyrics(lyrics: str) -> str:
+    """lyrics_hash as stored in lyrics_table (sha256 of the normalized text)."""
+    return hashlib.sha256(normalize_lyrics(lyrics).encode("utf-8")).hexdigest()
+
+
+# version history: lyrics_versions stores each older version as a line diff
+# against the version after it (the newest against HEAD in lyrics_table), and
+# every SNAPSHOT_EVERY-th version in full, so rebuilding any version applies
+# fewer than SNAPSHOT_EVERY diffs and the latest few need only one or two.
+SNAPSHOT_EVERY = 16
+
+
+def make_delta(base: str, target: str) -> str:
+    """Line diff turning `base` into `target`: JSON [[i1, i2, text], ...] (replace base lines i1:i2 with text)."""
+    a, b = base.splitlines(keepends=True), target.splitlines(keepends=True)
+    ops = [[i1, i2, "".join(b[j1:j2])]
+           for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+           if tag != "equal"]
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    lines = base.splitlines(keepends=True)
+    out, pos = [], 0
+    for i1, i2, text in json.loads(delta):
+        out.extend(lines[pos:i1])
+        out.append(text)
+        pos = i2
+    out.extend(lines[pos:])
+    return "".join(out)
+
+
+def encode_version(version: int, lyrics: str, next_lyrics: str) -> tuple:
+    """(storage, payload) for archiving `lyrics` as `version`, whose successor is `next_lyrics`."""
+    if version % SNAPSHOT_EVERY:
+        delta = make_delta(next_lyrics, lyrics)
+        if len(delta) < len(lyrics):
+            return "delta", delta
+    return "full", lyrics
+
+
+def rebuild_versions(rows, next_version: int, next_lyrics: str):
+    """
+    Yield (version, lyrics) for `rows` of (version, storage, payload), newest
+    first, starting from the text of `next_version`. A delta row needs the
+    version right after it; ValueError if that is missing.
+    """
+    for version, storage, payload in rows:
+        if storage == "full":
+            lyrics = payload
+        elif version + 1 == next_version:
+            lyrics = apply_delta(next_lyrics, payload)
+        else:
+            raise ValueError(f"version {version} is a diff against missing version {version + 1}")
+        next_version, next_lyrics = version, lyrics
+        yield version, lyrics
+
+
+def compress_version_history(conn: sqlite3.Connection) -> None:
+    """Rewrite every full-text row of lyrics_versions in diff/snapshot form (migration 007)."""
+    heads = conn.execute("SELECT id, version, lyrics FROM lyrics_table;").fetchall()
+    for song_id, head_version, head_lyrics in heads:
+        rows = conn.execute(
+            "SELECT version, storage, lyrics FROM lyrics_versions WHERE lyrics_id = ? ORDER BY version DESC;",
+            (song_id,),
+        ).fetchall()
+        next_version, next_lyrics = head_version, head_lyrics or ""
+        for version, lyrics in rebuild_versions(rows, head_version, head_lyrics or ""):
+            # a gap in the history: keep that version whole
+            storage, payload = (encode_version(version, lyrics, next_lyrics)
+                                if version + 1 == next_version else ("full", lyrics))
+            conn.execute(
+                "UPDATE lyrics_versions SET storage = ?, lyrics = ? WHERE lyrics_id = ? AND version = ?;",
+                (storage, payload, song_id, version),
+            )
+            next_version, next_lyrics = version, lyrics
+
+
+VERSION_HISTORY_MIGRATION = "ALTER TABLE lyrics_versions ADD COLUMN storage TEXT NOT NULL DEFAULT 'full';"
+
+
+# full-text index over lyrics_table (external content: the text lives only in
+# lyrics_table, songs_fts holds the index). Applied by migration 005.
+SONGS_FTS_MIGRATION = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+        title, artist, album, mood, lyrics,
+        content='lyrics_table', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    );
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS songs_fts_ai AFTER INSERT ON lyrics_table BEGIN
+        INSERT INTO songs_fts(rowid, title, artist, album, mood, lyrics)
+        VALUES (new.id, new.title, new.artist, new.album, new.mood, new.lyrics);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS songs_fts_ad AFTER DELETE ON lyrics_table BEGIN
+        INSERT INTO songs_fts(songs_fts, rowid, title, artist, album, mood, lyrics)
+        VALUES ('delete', old.id, old.title, old.artist, old.album, old.mood, old.lyrics);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS songs_fts_au AFTER UPDATE OF title, artist, album, mood, lyrics ON lyrics_table BEGIN
+        INSERT INTO songs_fts(songs_fts, rowid, title, artist, album, mood, lyrics)
+        VALUES ('delete', old.id, old.title, old.artist, old.album, old.mood, old.lyrics);
+        INSERT INTO songs_fts(rowid, title, artist, album, mood, lyrics)
+        VALUES (new.id, new.title, new.artist, new.album, new.mood, new.lyrics);
+    END;
+    """,
+    # backfill the songs saved before the index existed
+    "INSERT INTO songs_fts(songs_fts) VALUES ('rebuild');",
+]
+
+# hot lookups; check_query_plans() keeps each of them on an index (migration 006)
+TITLE_TAKEN_SQL = "SELECT 1 FROM lyrics_table WHERE title = ? COLLATE NOCASE LIMIT 1;"
+TITLES_STARTING_WITH_SQL = "SELECT title FROM lyrics_table WHERE title LIKE ?;"  # LIKE is case-insensitive: uses the NOCASE index
+CLOUD_SONG_EXISTS_SQL = "SELECT 1 FROM lyrics_table WHERE cloud_owner_user_id = ? AND cloud_song_id = ?;"
+SONG_VERSIONS_SQL = "SELECT id, lyrics_id, version, created_at, lyrics_hash, hash_algo, storage, lyrics FROM lyrics_versions WHERE lyrics_id = ? ORDER BY version DESC;"
+# rows needed to rebuild one version: down from the nearest snapshot at or above it (or from HEAD)
+SONG_VERSION_CHAIN_SQL = """SELECT version, storage, lyrics FROM lyrics_versions
+    WHERE lyrics_id = ? AND version >= ?
+      AND version <= coalesce((SELECT min(version) FROM lyrics_versions
+                               WHERE lyrics_id = ? AND version >= ? AND storage = 'full'), version)
+    ORDER BY version DESC;"""
+SONGS_CREATED_SINCE_SQL = "SELECT count(*) FROM lyrics_table WHERE created_at >= ?;"
+
+LYRICS_INDEXES_MIGRATION = [
+    "CREATE INDEX IF NOT EXISTS idx_lyrics_title_nocase ON lyrics_table (title COLLATE NOCASE);",
+    "CREATE INDEX IF NOT EXISTS idx_lyrics_created_at ON lyrics_table (created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_lyrics_updated_at ON lyrics_table (updated_at);",
+    # (cloud_owner_user_id, cloud_song_id) and (lyrics_id, version) already have
+    # the indexes behind their UNIQUE constraints
+    "CREATE INDEX IF NOT EXISTS idx_stats_created_at ON stats (created_at);",
+]
+
+# song listings: everything a list or card shows, never the lyrics body
+LISTING_COLUMNS = "id, title, artist, album, genre, mood, cloud_status, updated_at"
+FILTER_COLUMNS = ("title", "artist", "album", "genre", "mood")
+PREVIEW_CHARS = 200  # search results carry only the start of the lyrics, for card previews
+
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+_FTS_TERM = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def fts_query(text: str) -> str:
+    """
+    User search text -> FTS5 MATCH expression: "quoted words" stay a phrase,
+    every other word becomes a prefix term. Everything is quoted, so FTS5
+    syntax (AND, NEAR, column:, parentheses) in the input is searched for
+    literally instead of raising a syntax error.
+    """
+    terms = []
+    for phrase, word in _FTS_TERM.findall(text):
+        if phrase.strip():
+            terms.append('"' + phrase.replace('"', "") + '"')
+        elif word:
+            word = word.replace('"', "").rstrip("*")
+            if any(ch.isalnum() for ch in word):
+                terms.append(f'"{word}"*')
+    return " ".join(terms)
+
+
 class Lyrics():
     """A class that deals with storing and retrieving lyrics."""
 
-    def __init__(self):
-        self.db_path = Path(__file__).parent / "lyrical_lab.db"
-        self.conn = sqlite3.connect(self.db_path)
+    def __init__(self, db_path: Path | None = None):
+        self.db_path = Path(db_path or Path(__file__).parent / "lyrical_lab.db")
+        self.conn = get_connection(self.db_path)  # shared per thread, WAL (db_connection.py)
         self.conn_cursor = self.conn.cursor()
+        self.codec = LyricsCodec.load(self.conn)  # compresses version history once a dictionary is trained
         self.lyrics_table = "lyrics_table"
         self.lyrics_versions = "lyrics_versions"
         self.local_id = 1 #default
@@ -41,15 +223,112 @@ class Lyrics():
             logging.debug(e)
             return {"message": "Error - Please try again."}
 
+    def list_songs(self, query: str = "", fields: dict | None = None, limit: int = 200, after: tuple | None = None) -> list | dict:
+        """
+        One page of songs without their lyrics, most recently updated first.
+        Rows are LISTING_COLUMNS: (id, title, artist, album, genre, mood, cloud_status, updated_at).
+
+        query: text contained in any of title, artist, album, genre, mood.
+        fields: {"artist": "...", ...} text contained in that column (all must match).
+        after: (updated_at, id) of the last row of the previous page (keyset
+            pagination: the next page starts right after it, however deep it is).
+        """
+        try:
+            sql, params = self._listing_query(query, fields, limit, after)
+        except KeyError as e:
+            return {"message": f"Cannot filter on {e.args[0]}."}
+        try:
+            self.conn_cursor.execute(sql, params)
+            return self.conn_cursor.fetchall()
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+            return {"message": "Database Error - Please try again."}
+        except Exception as e:
+            logging.debug(e)
+            return {"message": "Error - Please try again."}
+
+    def _listing_query(self, query: str = "", fields: dict | None = None, limit: int = 200, after: tuple | None = None) -> tuple:
+        """(sql, params) for list_songs(); KeyError for a column that cannot be filtered on."""
+        where, params = [], []
+        if query and query.strip():
+            term = f"%{query.strip()}%"
+            where.append("(" + " OR ".join(f"{c} LIKE ?" for c in FILTER_COLUMNS) + ")")
+            params += [term] * len(FILTER_COLUMNS)
+        for column, value in (fields or {}).items():
+            if column not in FILTER_COLUMNS:
+                raise KeyError(column)
+            if value:
+                where.append(f"{column} LIKE ?")
+                params.append(f"%{value}%")
+        if after is not None:
+            where.append("(updated_at, id) < (?, ?)")
+            params += list(after)
+
+        sql = f"""
+            SELECT {LISTING_COLUMNS}
+            FROM {self.lyrics_table}
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY updated_at DESC, id DESC
+            LIMIT ?;
+        """
+        return sql, (*params, limit)
+
+    def check_query_plans(self) -> list:
+        """
+        EXPLAIN QUERY PLAN for each hot lookup. Returns one line per query that
+        scans a whole table or sorts in a temporary b-tree; empty when every
+        query is served by an index.
+        """
+        hot_queries = {
+            "_is_unique": (TITLE_TAKEN_SQL, ("title",)),
+            "_resolve_duplicate_title": (TITLES_STARTING_WITH_SQL, ("title%",)),
+            "save_downloaded_song": (CLOUD_SONG_EXISTS_SQL, (1, 1)),
+            "get_song_versions": (SONG_VERSIONS_SQL, (1,)),
+            "get_song_version": (SONG_VERSION_CHAIN_SQL, (1, 1, 1, 1)),
+            "get_latest_songs_count": (SONGS_CREATED_SINCE_SQL, ("2000-01-01",)),
+            "list_songs": self._listing_query(limit=1),
+            "list_songs (next page)": self._listing_query(limit=1, after=("9999-12-31", 0)),
+        }
+        problems = []
+        # a connection of its own: plans cached on the shared one can predate a schema change
+        conn = connect(self.db_path)
+        try:
+            for name, (sql, params) in hot_queries.items():
+                try:
+                    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+                except sqlite3.DatabaseError as e:
+                    problems.append(f"{name}: {e}")
+                    continue
+                # an ordered listing may walk an index ("SCAN t USING INDEX i", stopped
+                # by its LIMIT); any other SCAN reads every row of the table or index
+                ordered = "ORDER BY" in sql
+                bad = [step for step in plan
+                       if (step.startswith("SCAN ") and not (ordered and " USING " in step))
+                       or step.startswith("USE TEMP B-TREE")]
+                if bad:
+                    problems.append(f"{name}: {'; '.join(bad)}")
+        finally:
+            conn.close()
+        return problems
+
+    def get_recent_songs(self, limit: int = 6) -> list | dict:
+        """The `limit` most recently updated songs, without their lyrics."""
+        return self.list_songs(limit=limit)
+
+    def iter_lyrics(self):
+        """(id, lyrics) of every song, streamed, for whole-catalog passes (vocabulary, analysis)."""
+        try:
+            # own cursor: callers may use the class cursor while iterating
+            yield from self.conn.execute(f"SELECT id, lyrics FROM {self.lyrics_table};")
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+
     def get_latest_songs_count(self) -> dict:
 
         one_week_ago = datetime.now() - timedelta(days=7)
 
-        query = f"""SELECT count(*) from (
-            SELECT * FROM {self.lyrics_table} WHERE created_at >= "{one_week_ago}");"""
-        
         try:
-            self.conn_cursor.execute(query)
+            self.conn_cursor.execute(SONGS_CREATED_SINCE_SQL, (str(one_week_ago),))
             songs_num = self.conn_cursor.fetchone()
             return {"message": songs_num, "status": True}
         except sqlite3.DatabaseError as e:
@@ -88,21 +367,62 @@ class Lyrics():
             logging.debug(e)
             return {"message": "Error - Please try again."}
 
-    def search_songs(self, query_text: str) -> list | dict:
-        """Search songs by title, artist, or lyrics content."""
+    def search_songs(self, query_text: str, limit: int = 100) -> list | dict:
+        """
+        Search songs by title, artist, album, mood or lyrics through the
+        songs_fts index, best match first (bm25, title and artist weighted up).
+
+        Words match as prefixes ("fir" finds fire, firefly); "quoted words"
+        match as a phrase. Rows are (id, title, artist, album, genre, mood,
+        lyrics preview, snippet), where snippet is the best lyric fragment
+        with the matches between SNIPPET_START and SNIPPET_END. The full
+        lyrics come from get_song_by_id when a song is opened.
+        """
         if not query_text or not query_text.strip():
             return []
-        
+
+        match = fts_query(query_text)
+        if not match:
+            return []
+
+        query = f"""
+            SELECT l.id, l.title, l.artist, l.album, l.genre, l.mood, substr(l.lyrics, 1, {PREVIEW_CHARS}),
+                   snippet(songs_fts, 4, '{SNIPPET_START}', '{SNIPPET_END}', '…', 12)
+            FROM songs_fts
+            JOIN {self.lyrics_table} AS l ON l.id = songs_fts.rowid
+            WHERE songs_fts MATCH ?
+            ORDER BY bm25(songs_fts, 10.0, 5.0, 2.0, 2.0, 1.0)
+            LIMIT ?
+        """
+        try:
+            self.conn_cursor.execute(query, (match, limit))
+            results = self.conn_cursor.fetchall()
+            return results
+        except sqlite3.OperationalError as e:
+            if "no such table" not in str(e):
+                logging.debug(e)
+                return {"message": "Database Error - Please try again."}
+            # database from before migration 005
+            return self._search_songs_like(query_text, limit)
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+            return {"message": "Database Error - Please try again."}
+        except Exception as e:
+            logging.debug(e)
+            return {"message": "Error - Please try again."}
+
+    def _search_songs_like(self, query_text: str, limit: int) -> list | dict:
         search_term = f"%{query_text.strip()}%"
         
         query = f"""
-            SELECT id, title, artist, album, genre, mood, lyrics
+            SELECT id, title, artist, album, genre, mood, substr(lyrics, 1, {PREVIEW_CHARS}), NULL
             FROM {self.lyrics_table}
             WHERE title LIKE ? OR artist LIKE ? OR lyrics LIKE ?
             ORDER BY title ASC
+            LIMIT ?
         """
         try:
-            self.conn_cursor.execute(query, (search_term, search_term, search_term))
+            self.conn_cursor.execute(query, (search_term, search_term, search_term, limit))
             results = self.conn_cursor.fetchall()
             return results
         except sqlite3.DatabaseError as e:
@@ -164,6 +484,7 @@ class Lyrics():
             return {"message": "Song saved successfully", "state": True}
 
         except sqlite3.DatabaseError as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Error - Please try again", "state": False}
 
@@ -189,11 +510,7 @@ class Lyrics():
             if not self._is_unique(title):
                 title = self._resolve_duplicate_title(title)
 
-            query = f"""
-                SELECT 1 FROM {self.lyrics_table}
-                WHERE cloud_owner_user_id = ? AND cloud_song_id = ?
-            """
-            self.conn_cursor.execute(query, (cloud_owner_user_id, cloud_song_id))
+            self.conn_cursor.execute(CLOUD_SONG_EXISTS_SQL, (cloud_owner_user_id, cloud_song_id))
 
             if self.conn_cursor.fetchone():
                 return {"message": "Song already exists locally", "state": False}
@@ -237,6 +554,7 @@ class Lyrics():
             return {"message": "Song downloaded successfully", "state": True}
 
         except Exception as e:
+            rollback(self.conn)
             print(e)
             logging.exception("Error saving downloaded song")
             return {"message": "Error - Please try again", "state": False}
@@ -282,24 +600,28 @@ class Lyrics():
         lyrics_changed = new_lyrics_hash != current_lyrics_hash
 
         try:
-            self.conn_cursor.execute("BEGIN")
+            if not in_batch():  # a DBWriter batch already holds the transaction
+                self.conn_cursor.execute("BEGIN")
 
             if lyrics_changed:
-                # 1. Archive old HEAD into lyrics_versions
+                # 1. Archive old HEAD into lyrics_versions (as a diff against the new lyrics)
+                storage, payload = encode_version(current_version, current_lyrics or "", lyrics)
+                payload = self.codec.encode(payload)
                 version_query = f"""
                     INSERT INTO {self.lyrics_versions}
-                    (lyrics_id, version, lyrics, lyrics_hash, hash_algo, note)
-                    VALUES (?, ?, ?, ?, ?, ?);
+                    (lyrics_id, version, lyrics, lyrics_hash, hash_algo, note, storage)
+                    VALUES (?, ?, ?, ?, ?, ?, ?);
                 """
                 self.conn_cursor.execute(
                     version_query,
                     (
                         current_id,
                         current_version,
-                        current_lyrics,
+                        payload,
                         current_lyrics_hash,
                         "sha256",
                         "manual save",
+                        storage,
                     ),
                 )
 
@@ -370,12 +692,12 @@ class Lyrics():
             return {"message": "Song successfully updated", "state": True}
 
         except sqlite3.DatabaseError as e:
-            self.conn.rollback()
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Database Error - Please try again.", "state": False}
 
         except sqlite3.DataError as e:
-            self.conn.rollback()
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Error - Please ensure to provide all required fields.", "state": False}
     
@@ -395,12 +717,12 @@ class Lyrics():
             return {"message": "Song uploaded successfully.", "status": True}
         
         except sqlite3.DatabaseError as e:
-            self.conn.rollback()
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Database Error - Please try again.", "state": False}
 
         except sqlite3.DataError as e:
-            self.conn.rollback()
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Error - Please ensure to provide all required fields.", "state": False}
 
@@ -422,9 +744,11 @@ class Lyrics():
             self._commit_data()
             return {"message": f"Song successfully deleted.", "state": True}
         except sqlite3.DatabaseError as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Database Error - Please try again", "state": False}
         except Exception as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Error - Please try again", "state": False}
 
@@ -433,16 +757,11 @@ class Lyrics():
 #====================================================================================================
     
     def _normalize_lyrics(self, lyrics: str) -> str:
-        if not lyrics:
-            return ""
-        lyrics = lyrics.replace("\r\n", "\n").replace("\r", "\n")
-        lyrics = "\n".join(line.rstrip() for line in lyrics.split("\n"))
-        return lyrics.rstrip("\n")
+        return normalize_lyrics(lyrics)
 
     
     def _hash_lyrics(self, lyrics: str) -> str:
-        normalized = self._normalize_lyrics(lyrics)
-        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return hash_lyrics(lyrics)
 
     def _get_song_by_id(self, song_id: int):
         query = f"""
@@ -455,7 +774,7 @@ class Lyrics():
 
     def _commit_data(self):
         """Commits data to data base (does not close connection)"""
-        self.conn.commit()
+        commit(self.conn)
 
     def _is_unique(self, title:str) -> bool | dict:
         """Checks if the title of the song is unique when adding a new song
@@ -464,9 +783,8 @@ class Lyrics():
 
         """
 
-        query = f"SELECT * FROM {self.lyrics_table} WHERE title = ? COLLATE NOCASE;"
         try:
-            self.conn_cursor.execute(query, (title,))
+            self.conn_cursor.execute(TITLE_TAKEN_SQL, (title,))
             song = self.conn_cursor.fetchone()
             logging.debug(song)
             if not song:
@@ -479,21 +797,65 @@ class Lyrics():
             logging.debug(e)
             return {"message": "Error - Please try again"}
         
-    def get_song_versions(self, song_id: int) -> list:
-        """Get all versions of a song."""
-        query = f"SELECT id, lyrics_id, version, lyrics, created_at, lyrics_hash, hash_algo FROM {self.lyrics_versions} WHERE lyrics_id = ? ORDER BY version DESC;"
+    def get_song_versions(self, song_id: int, with_lyrics: bool = True) -> list:
+        """
+        All older versions of a song, newest first:
+        (id, song_id, version, lyrics, created_at, lyrics_hash, hash_algo).
+        with_lyrics=False leaves lyrics None (rebuild one with get_song_version).
+        """
         try:
-            self.conn_cursor.execute(query, (song_id,))
-            versions = self.conn_cursor.fetchall()
-            print("versions")
-            print(versions)
-            return versions
+            self.conn_cursor.execute(SONG_VERSIONS_SQL, (song_id,))
+            rows = self.conn_cursor.fetchall()
+            if not with_lyrics:
+                return [(id, lyrics_id, version, None, created_at, lyrics_hash, hash_algo)
+                        for id, lyrics_id, version, created_at, lyrics_hash, hash_algo, _, _ in rows]
+            head = self.conn.execute(
+                f"SELECT version, lyrics FROM {self.lyrics_table} WHERE id = ?;", (song_id,)
+            ).fetchone()
+            if not head:
+                return []
+            texts = dict(rebuild_versions([(r[2], r[6], self.codec.decode(r[7])) for r in rows], head[0], head[1] or ""))
+            return [(id, lyrics_id, version, texts[version], created_at, lyrics_hash, hash_algo)
+                    for id, lyrics_id, version, created_at, lyrics_hash, hash_algo, _, _ in rows]
         except sqlite3.DatabaseError as e:
             logging.debug(e)
             return []
+        except LookupError as e:  # a compressed row whose dictionary is gone
+            logging.error(e)
+            return []
         except Exception as e:
             logging.debug(e)
             return []
+
+    def get_song_version(self, song_id: int, version: int) -> str | None:
+        """The lyrics of one older version, rebuilt from its nearest snapshot (or HEAD)."""
+        try:
+            rows = [(v, storage, self.codec.decode(payload)) for v, storage, payload
+                    in self.conn.execute(SONG_VERSION_CHAIN_SQL, (song_id, version, song_id, version))]
+            if not rows or rows[-1][0] != version:
+                return None
+            if rows[0][1] == "full":
+                next_version, next_lyrics = rows[0][0] + 1, ""
+            else:
+                head = self.conn.execute(
+                    f"SELECT version, lyrics FROM {self.lyrics_table} WHERE id = ?;", (song_id,)
+                ).fetchone()
+                if not head:
+                    return None
+                next_version, next_lyrics = head[0], head[1] or ""
+            lyrics = None
+            for _, lyrics in rebuild_versions(rows, next_version, next_lyrics):
+                pass
+            return lyrics
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+            return None
+        except LookupError as e:
+            logging.error(e)
+            return None
+        except Exception as e:
+            logging.debug(e)
+            return None
         
     def _destructure_dict(self, data : dict) -> str:
         """Destructure dict with song detail"""
@@ -522,12 +884,7 @@ class Lyrics():
         """
 
         # Get all titles that start with this base title
-        query = f"""
-            SELECT title FROM {self.lyrics_table}
-            WHERE title LIKE ?;
-        """
-
-        self.conn_cursor.execute(query, (f"{title}%",))
+        self.conn_cursor.execute(TITLES_STARTING_WITH_SQL, (f"{title}%",))
         existing_titles = [row[0] for row in self.conn_cursor.fetchall()]
 
         # If no conflict, return original
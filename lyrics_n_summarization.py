@@ -2,8 +2,7 @@ import logging
 import requests
 from pathlib import Path
 import sys
-import pyphen
-import pronouncing
+from Rhyme_engine.phonetic_lexicon import get_lexicon
 logging.basicConfig(level=logging.DEBUG)
 
 
@@ -81,26 +80,8 @@ class OpenRouterClient:
 def get_stress_pattern(line):
     """Return a string of U (unstressed) and S (stressed) syllables for a line"""
 
-    words = line.lower().split()
-    pattern = []
-
-
-    for word in words:
-        phones = pronouncing.phones_for_word(word)
-
-        if phones:
-            logging.debug(phones[0])
-            stress = pronouncing.stresses(phones[0])
-            
-            for c in stress:
-                if c in '12': # If this syllable is primary stress or secondary stress
-                    pattern.append("S") # add stressed syllable
-                else:
-                    pattern.append('u') # c == 0, unstressed
-        else:
-            pattern.append("?") #unknown word
-    
-    return "".join(pattern)
+    # each word is resolved once per process by the shared lexicon
+    return get_lexicon().line_stress(line)
 
 def alignment_score(patterns):
     """Calculate how aligned the stressed syllables are across multiple lines"""
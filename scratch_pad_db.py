@@ -1,6 +1,7 @@
 import sqlite3
 from pathlib import Path
 import logging
+from db_connection import commit, get_connection, rollback
 logging.basicConfig(level=logging.DEBUG)
 
 
@@ -8,14 +9,14 @@ class ScratchPad():
 
     def __init__(self):
         self.db_path = Path(__file__).parent / "lyrical_lab.db"
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)  # shared per thread, WAL (db_connection.py)
         self.conn_cursor = self.conn.cursor()
         self.scratch_pad = "scratch_pad"
         self.local_profile_id = 1 #default
     
     def _commit_data(self):
         """Commits data to data base (does not close connection)"""
-        self.conn.commit()
+        commit(self.conn)
 
 
     
@@ -75,9 +76,11 @@ class ScratchPad():
             self._commit_data()
             return {"message": "Note saved successfully.", "state": True}
         except sqlite3.DatabaseError as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Database Error - Please try again", "state": True}
         except Exception as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Error - Please try again"}
         
@@ -111,9 +114,11 @@ class ScratchPad():
             self._commit_data()
             return {"message": "Note successfully updated.", "state": True}
         except sqlite3.DatabaseError as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Database Error - Please try again"}
         except Exception as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Error - Please try again"}
         
@@ -126,9 +131,11 @@ class ScratchPad():
             self._commit_data()
             return {"message": f"Note successfully deleted.", "state": True}
         except sqlite3.DatabaseError as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Database Error - Please try again", "state": False}
         except Exception as e:
+            rollback(self.conn)
             logging.debug(e)
             return {"message": "Error - Please try again", "state": False}
 
@@ -0,0 +1,46 @@
+"""
+Downsampling of line-chart series.
+
+lttb() (Largest-Triangle-Three-Buckets, Steinarsson 2013) keeps the first
+and last point and, from each of the buckets in between, the point forming
+the largest triangle with the point kept before it and the average of the
+next bucket. Peaks and dips survive, so a few hundred points draw years of
+daily data with the same shape.
+"""
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+Point = Tuple[float, float]
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """`points` (sorted by x) reduced to `threshold` points; unchanged if already that small."""
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0  # index of the point kept last
+    for i in range(threshold - 2):
+        # average of the next bucket (the last point for the final bucket)
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        bucket = points[next_start:next_end] or points[-1:]
+        avg_x = sum(p[0] for p in bucket) / len(bucket)
+        avg_y = sum(p[1] for p in bucket) / len(bucket)
+
+        ax, ay = points[a]
+        best, best_area = -1, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            x, y = points[j]
+            # twice the triangle's area; only the comparison matters
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled
@@ -4,6 +4,9 @@ from Rhyme_engine.rhyme_engine import find_rhymes_api
 import logging
 logging.basicConfig(level=logging.DEBUG)
 
+# fewer family rhymes than this for any word: score the whole store instead
+MIN_FAMILY_RHYMES = 10
+
 
 def find_rhymes(word: str):
     """
@@ -11,7 +14,14 @@ def find_rhymes(word: str):
     This function is safe to import into APIs, desktop apps, or other modules.
     """
     logging.debug("finding rhymes...")
-    return find_rhymes_api(word)
+    # scores only the words on the same stressed vowel (rhyme_families): interactive speed
+    results = find_rhymes_api(word, use_families=True)
+    if any(len(rhymes) < MIN_FAMILY_RHYMES for rhymes in results["word_rhymes"].values()):
+        # a rare vowel, or a word whose best rhymes only match on stress:
+        # the full stress-pattern search the families skip
+        logging.debug("few family rhymes, searching the whole store...")
+        results = find_rhymes_api(word)
+    return results
 
 
 
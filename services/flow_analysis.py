@@ -7,26 +7,16 @@ from __future__ import annotations
 
 import logging
 from typing import List, Optional
-import pronouncing
+
+from Rhyme_engine.phonetic_lexicon import get_lexicon
+from Rhyme_engine.rhyme_families import family_key
 
 logger = logging.getLogger(__name__)
 
 
 def get_stress_pattern(line: str) -> str:
     """Return a string of u (unstressed) and S (stressed) syllables for a line."""
-    words = line.lower().split()
-    pattern: List[str] = []
-
-    for word in words:
-        phones = pronouncing.phones_for_word(word)
-        if phones:
-            stress = pronouncing.stresses(phones[0])  # e.g. "010"
-            for c in stress:
-                pattern.append('S' if c in "12" else 'u')
-        else:
-            pattern.append('?')
-
-    return ''.join(pattern)
+    return get_lexicon().line_stress(line)
 
 
 def alignment_score(patterns: List[str]) -> Optional[float]:
@@ -50,33 +40,64 @@ def alignment_score(patterns: List[str]) -> Optional[float]:
     return aligned / total if total else 0.0
 
 
-def highlight_flow(patterns: List[str], lines: List[str]) -> str:
-    """Return HTML showing flow patterns with color coding."""
+def column_alignment(patterns: List[str]) -> List[Optional[bool]]:
+    """Per syllable column: True if every line that reaches it agrees, False if not, None if no line does."""
     max_len = max(len(p) for p in patterns) if patterns else 0
-    padded = [p.ljust(max_len) for p in patterns]
-
-    # Determine alignment per column
-    column_alignment: List[Optional[bool]] = []
+    out: List[Optional[bool]] = []
     for i in range(max_len):
-        column = [p[i] for p in padded if p[i] != ' ']
-        if not column:
-            column_alignment.append(None)
-        elif all(c == column[0] for c in column):
-            column_alignment.append(True)
-        else:
-            column_alignment.append(False)
+        column = {p[i] for p in patterns if i < len(p)}
+        out.append(None if not column else len(column) == 1)
+    return out
+
+
+def highlight_flow(patterns: List[str], lines: List[str]) -> str:
+    """Return HTML showing flow patterns with color coding."""
+    alignment = column_alignment(patterns)
 
     html_lines: List[str] = []
-    for line, pattern in zip(lines, padded):
-        colored_pattern = ""
-        for char, aligned in zip(pattern, column_alignment):
+    for line, pattern in zip(lines, patterns):
+        colored: List[str] = []
+        for char, aligned in zip(pattern, alignment):
             if char == 'S':
                 color = "green" if aligned else "red"
-                colored_pattern += f"<span style='color:{color};font-weight:bold'>{char}</span>"
+                colored.append(f"<span style='color:{color};font-weight:bold'>{char}</span>")
             elif char == 'u':
-                colored_pattern += "<span style='color:gray'>u</span>"
+                colored.append("<span style='color:gray'>u</span>")
             else:
-                colored_pattern += " "
-        html_lines.append(f"<b>{line}</b><br>{colored_pattern}<br><br>")
+                colored.append(" ")
+        html_lines.append(f"<b>{line}</b><br>{''.join(colored)}<br><br>")
 
     return "".join(html_lines)
+
+
+_SCHEME_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def rhyme_scheme(lines: List[str]) -> str:
+    """
+    Letters by end-word rhyme family, e.g. "AABB"; "-" when the last word is
+    unknown, and a space for blank lines (stanza breaks).
+    """
+    lex = get_lexicon()
+    letters: dict = {}
+    out: List[str] = []
+    for line in lines:
+        words = line.split()
+        if not words:
+            out.append(" ")
+            continue
+        last = words[-1].strip(".,;:!?\"()[]-").lower()
+        pros = lex.prosodies(last) if last else []
+        if not pros:
+            out.append("-")
+            continue
+        key = family_key(pros[0])
+        if key not in letters:
+            letters[key] = _SCHEME_LETTERS[len(letters)] if len(letters) < len(_SCHEME_LETTERS) else "*"
+        out.append(letters[key])
+    return "".join(out).strip()
+
+
+def document_flow(text: str) -> Optional[float]:
+    """alignment_score over every non-empty line of a document."""
+    return alignment_score([get_stress_pattern(line) for line in text.splitlines() if line.strip()])
@@ -5,13 +5,18 @@ Uses Lyrics from lyrics_db.py but provides a clearer interface for the UI.
 """
 from __future__ import annotations
 
+import logging
+import threading
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from lyrics_db import Lyrics
+from Rhyme_engine.rhyme_engine import split_phrase
 
 
-SongRow = Tuple[Any, ...]  # (id, title, artist, album, genre, mood, lyrics, ...)
+SongRow = Tuple[Any, ...]  # listing: (id, title, artist, album, genre, mood, cloud_status, updated_at)
 
 
 @dataclass
@@ -28,8 +33,18 @@ class LyricsLibrary:
     def __init__(self):
         self.db = Lyrics()
 
-    def list_songs(self) -> Union[List[SongRow], Dict[str, Any]]:
-        return self.db.get_all_songs()
+    def list_songs(
+        self, query: str = "", limit: int = 200, after: Optional[Tuple[str, int]] = None
+    ) -> Union[List[SongRow], Dict[str, Any]]:
+        """A page of (id, title, artist, album, genre, mood, cloud_status, updated_at), newest first."""
+        return self.db.list_songs(query, limit=limit, after=after)
+
+    def recent_songs(self, limit: int = 6) -> Union[List[SongRow], Dict[str, Any]]:
+        return self.db.get_recent_songs(limit)
+
+    def all_lyrics(self) -> Iterator[str]:
+        for _, lyrics in self.db.iter_lyrics():
+            yield lyrics or ""
 
     def create_song(self, song: Song) -> Dict[str, Any]:
         return self.db.save_new_song(song.__dict__)
@@ -40,8 +55,11 @@ class LyricsLibrary:
     def delete_song(self, song_id: int) -> Dict[str, Any]:
         return self.db.delete_song(song_id)
 
-    def get_song_versions(self, song_id: int) -> List[Tuple]:
-        return self.db.get_song_versions(song_id)
+    def get_song_versions(self, song_id: int, with_lyrics: bool = True) -> List[Tuple]:
+        return self.db.get_song_versions(song_id, with_lyrics)
+
+    def get_song_version(self, song_id: int, version: int) -> Optional[str]:
+        return self.db.get_song_version(song_id, version)
     
     def get_song_by_id(self, song_id:int) -> tuple | None:
         results =  self.db.get_song_by_id(song_id)
@@ -49,11 +67,70 @@ class LyricsLibrary:
             return results['message']
         return None
 
+    def catalog_vocabulary(self) -> Counter:
+        """Word -> count across every saved song's lyrics (the writer's own vocabulary)."""
+        counts: Counter = Counter()
+        for lyrics in self.all_lyrics():
+            counts.update(split_phrase(lyrics))
+        return counts
 
 
-testing = LyricsLibrary()
+class CatalogVocabulary:
+    """
+    catalog_vocabulary(), counted off the GUI thread and shared by everything
+    that wants the writer's own words (type-ahead, the line filler).
+    refresh_async() after a save or delete recounts; subscribers get the new
+    counts on the worker thread, so they should only swap references.
+    """
 
-
-# lst = testing.list_songs()
-# print(lst)
-# print(testing.get_song_by_id(2))
\ No newline at end of file
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._subscribers: List[Callable[[Counter], None]] = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._stale = False  # a refresh was asked for while one was running
+
+    def counts(self) -> Counter:
+        """The latest counts (empty until the first count finishes). Read-only."""
+        return self._counts
+
+    def subscribe(self, callback: Callable[[Counter], None]) -> None:
+        self._subscribers.append(callback)
+        if self._counts:
+            callback(self._counts)
+
+    def refresh(self) -> None:
+        """Recount (blocking); a worker thread gets its own DB connection."""
+        counts = LyricsLibrary().catalog_vocabulary()
+        self._counts = counts
+        for callback in list(self._subscribers):
+            callback(counts)
+
+    def refresh_async(self) -> None:
+        """Recount on a daemon thread; calls made during a count fold into one more count."""
+        with self._lock:
+            if self._running:
+                self._stale = True
+                return
+            self._running = True
+        threading.Thread(target=self._run, name="catalog-vocabulary", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.debug(f"Catalog vocabulary not counted: {e}")
+            with self._lock:
+                if not self._stale:
+                    self._running = False
+                    return
+                self._stale = False
+
+
+@lru_cache(maxsize=1)
+def shared_vocabulary() -> CatalogVocabulary:
+    """One vocabulary per process; the first count starts in the background."""
+    vocabulary = CatalogVocabulary()
+    vocabulary.refresh_async()
+    return vocabulary
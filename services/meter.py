@@ -0,0 +1,206 @@
+"""
+Meter detection and beat-grid alignment for flow analysis.
+
+Works on the stress patterns from flow_analysis.get_stress_pattern
+("uSuS?u..."), all lines at once as NumPy arrays:
+
+- fit_meters: agreement of every line with iambic / trochaic / anapestic /
+  dactylic feet (any phase), one vectorized pass per meter.
+- fit_grid: places each line's syllables on a 4/4 beat grid (8th or 16th
+  subdivisions) with a DP over (syllable, slot), rewarding stressed
+  syllables on strong beats and penalizing gaps. The DP loops over syllable
+  positions only; every step is vectorized over lines and slots.
+- analyze_meter: runs both, picks the grid that fits best and scores how
+  consistently stressed syllables land on the same beats across lines.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+METERS: Dict[str, str] = {
+    "iambic": "uS",
+    "trochaic": "Su",
+    "anapestic": "uuS",
+    "dactylic": "Suu",
+}
+
+# slots per 4/4 bar
+GRIDS: Dict[str, int] = {
+    "4/4 8th": 8,
+    "4/4 16th": 16,
+}
+
+GAP_PENALTY = 0.15
+_STRESS_VALUE = {"S": 1.0, "u": 0.0}  # anything else ("?") counts as 0.5
+
+
+@dataclass
+class LineMeter:
+    meter: str
+    meter_score: float
+    slots: List[int]        # grid slot of each syllable
+    beats: List[float]      # the same, in quarter-note beats from the start of the line's first bar
+    grid_score: float
+
+
+@dataclass
+class MeterReport:
+    grid: str
+    bars: int
+    lines: List[LineMeter]
+    dominant_meter: Optional[str]
+    consistency: float      # 0..1: stressed syllables landing on the same beats across lines
+
+
+# -----------------------------
+# Encoding
+# -----------------------------
+def encode(patterns: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """patterns -> (stress values L x N, mask L x N); values are 1 (S), 0 (u), 0.5 (unknown)."""
+    n = max((len(p) for p in patterns), default=0)
+    values = np.full((len(patterns), n), 0.5)
+    mask = np.zeros((len(patterns), n), dtype=bool)
+    for i, p in enumerate(patterns):
+        values[i, :len(p)] = [_STRESS_VALUE.get(c, 0.5) for c in p]
+        mask[i, :len(p)] = True
+    return values, mask
+
+
+def beat_strengths(slots_per_bar: int, bars: int) -> np.ndarray:
+    """Metrical weight of every slot: downbeat 1.0, beat 3 0.8, beats 2/4 0.6, 8ths 0.3, 16ths 0.1."""
+    per_beat = slots_per_bar // 4
+    pos = np.arange(slots_per_bar)
+    strength = np.where(pos % max(per_beat // 2, 1) == 0, 0.3, 0.1)
+    strength = np.where(pos % per_beat == 0, 0.6, strength)
+    strength[0] = 1.0
+    strength[2 * per_beat] = 0.8
+    return np.tile(strength, bars)
+
+
+# -----------------------------
+# Meter fit
+# -----------------------------
+def fit_meters(values: np.ndarray, mask: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """Best meter per line and its agreement (0..1), over every phase of every foot."""
+    lengths = np.maximum(mask.sum(axis=1), 1)
+    names = list(METERS)
+    best = np.zeros((len(names), values.shape[0]))
+    n = values.shape[1]
+    for m, name in enumerate(names):
+        foot = np.array([_STRESS_VALUE[c] for c in METERS[name]])
+        for phase in range(len(foot)):
+            template = np.resize(np.roll(foot, -phase), n)
+            agree = (1.0 - np.abs(values - template)) * mask
+            best[m] = np.maximum(best[m], agree.sum(axis=1) / lengths)
+    idx = best.argmax(axis=0)
+    return [names[i] for i in idx], best.max(axis=0)
+
+
+# -----------------------------
+# Beat-grid DP
+# -----------------------------
+def fit_grid(values: np.ndarray, mask: np.ndarray, strengths: np.ndarray, gap_penalty: float = GAP_PENALTY) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Place syllable i of every line on slot j (strictly increasing) maximizing
+    sum(1 - |stress_i - strength_j|) - gap_penalty * empty slots between syllables.
+
+    Returns (slots L x N, -1 past each line's end; score per syllable L).
+    Lines longer than the grid get score -inf.
+    """
+    L, N = values.shape
+    S = strengths.shape[0]
+    if N == 0:
+        return np.zeros((L, 0), dtype=int), np.zeros(L)
+
+    neg = -np.inf
+    slot = np.arange(S)
+    # gain[l, i, j]: syllable i of line l on slot j
+    gain = 1.0 - np.abs(values[:, :, None] - strengths[None, None, :])
+
+    dp = gain[:, 0, :].copy()
+    back = np.zeros((L, N, S), dtype=np.int32)
+    finals = np.full((L, S), neg)
+    lengths = mask.sum(axis=1)
+    finals[lengths == 1] = dp[lengths == 1]
+
+    for i in range(1, N):
+        # best predecessor k < j of (dp[k] + gap * k), via a running max and its argmax
+        vals = dp + gap_penalty * slot
+        run = np.maximum.accumulate(vals, axis=1)
+        arg = np.maximum.accumulate(np.where(vals == run, slot, 0), axis=1)
+        prev = np.full((L, S), neg)
+        prev[:, 1:] = run[:, :-1]
+        back[:, i, 1:] = arg[:, :-1]
+        dp = prev - gap_penalty * (slot - 1) + gain[:, i, :]
+        done = lengths == i + 1
+        finals[done] = dp[done]
+
+    end = finals.argmax(axis=1)
+    total = finals[np.arange(L), end]
+    slots = np.full((L, N), -1, dtype=np.int64)
+    for l in range(L):
+        n = int(lengths[l])
+        if n == 0 or not np.isfinite(total[l]):
+            continue
+        j = int(end[l])
+        for i in range(n - 1, -1, -1):
+            slots[l, i] = j
+            j = int(back[l, i, j])
+    score = np.where(lengths > 0, total / np.maximum(lengths, 1), 0.0)
+    return slots, score
+
+
+# -----------------------------
+# Whole-song analysis
+# -----------------------------
+def consistency_score(values: np.ndarray, slots: np.ndarray, slots_per_bar: int) -> float:
+    """How often a line's stressed syllables sit on slots that other lines stress too (0..1)."""
+    L = values.shape[0]
+    if L < 2:
+        return 1.0 if L else 0.0
+    stressed = np.zeros((L, slots_per_bar))
+    rows, cols = np.nonzero((values >= 1.0) & (slots >= 0))
+    np.add.at(stressed, (rows, slots[rows, cols] % slots_per_bar), 1.0)
+    stressed = np.minimum(stressed, 1.0)
+    per_line = stressed.sum(axis=1)
+    used = per_line > 0
+    if used.sum() < 2:
+        return 0.0
+    # share of the *other* lines stressing each of this line's slots
+    freq = (stressed[used].sum(axis=0)[None, :] - stressed[used]) / (used.sum() - 1)
+    return float(((stressed[used] * freq).sum(axis=1) / per_line[used]).mean())
+
+
+def analyze_meter(patterns: Sequence[str], grids: Optional[Dict[str, int]] = None) -> MeterReport:
+    grids = grids or GRIDS
+    values, mask = encode(patterns)
+    meters, meter_scores = fit_meters(values, mask)
+    longest = int(mask.sum(axis=1).max()) if len(patterns) else 0
+
+    best = None
+    for name, per_bar in grids.items():
+        bars = max(1, -(-longest // per_bar))
+        slots, score = fit_grid(values, mask, beat_strengths(per_bar, bars))
+        fitted = score[np.isfinite(score)]
+        mean = float(fitted.mean()) if fitted.size else 0.0
+        if best is None or mean > best[0]:
+            best = (mean, name, per_bar, bars, slots, score)
+
+    _, grid, per_bar, bars, slots, score = best
+    beats_per_slot = 4 / per_bar
+    lines = []
+    for l, n in enumerate(mask.sum(axis=1)):
+        line_slots = [int(s) for s in slots[l, :n]]
+        lines.append(LineMeter(
+            meter=meters[l],
+            meter_score=float(meter_scores[l]),
+            slots=line_slots,
+            beats=[s * beats_per_slot for s in line_slots],
+            grid_score=float(score[l]) if np.isfinite(score[l]) else 0.0,
+        ))
+
+    dominant = max(set(meters), key=meters.count) if meters else None
+    return MeterReport(grid, bars, lines, dominant, consistency_score(values, slots, per_bar))
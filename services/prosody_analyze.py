@@ -0,0 +1,289 @@
+"""
+prosody_analyze.py
+
+Headless batch analysis of a whole catalog: a directory of lyric files or the
+songs in lyrics_table, analyzed in a process pool.
+
+Per song: syllables and stress pattern of every line, alignment score of the
+whole song and of each stanza (services.flow_analysis), and the end-rhyme
+scheme with its groups of line numbers.
+
+Output streams as songs finish:
+- ndjson (default): one JSON object per song, appended to the output file.
+- parquet: one row per line, one part file per run in the output directory
+  (needs pyarrow).
+
+Songs whose (lyrics_hash, engine version) is already in the output are
+skipped, so re-running over a catalog only analyzes new or edited songs.
+Bump ENGINE_VERSION whenever the analysis output changes.
+
+Examples:
+    python -m services.prosody_analyze --db --out analysis.ndjson
+    python -m services.prosody_analyze --dir ~/lyrics --out analysis.ndjson --workers 8
+    python -m services.prosody_analyze --dir ~/lyrics --format parquet --out analysis_parquet/
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from lyrics_db import hash_lyrics
+from Rhyme_engine.phonetic_lexicon import get_lexicon
+from services.flow_analysis import alignment_score, get_stress_pattern, rhyme_scheme
+
+_PYARROW_AVAILABLE = False
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+    _PYARROW_AVAILABLE = True
+except Exception:
+    _PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ENGINE_VERSION = "1"
+DEFAULT_DB = Path(__file__).parent.parent / "lyrical_lab.db"
+LYRIC_SUFFIXES = (".txt", ".lrc", ".lyrics", ".md")
+
+Record = Dict[str, Any]
+
+
+class SongInput(NamedTuple):
+    source: str        # "db" or "file"
+    song_id: str       # lyrics_table id, or the path relative to --dir
+    title: str
+    lyrics: str
+    lyrics_hash: str
+
+
+# -----------------------------
+# Sources
+# -----------------------------
+def iter_directory(root: Path) -> Iterator[SongInput]:
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in LYRIC_SUFFIXES:
+            continue
+        try:
+            lyrics = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"skipping {path}: {e}")
+            continue
+        yield SongInput("file", str(path.relative_to(root)), path.stem, lyrics, hash_lyrics(lyrics))
+
+
+def iter_table(db_path: Path) -> Iterator[SongInput]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT id, title, lyrics, lyrics_hash FROM lyrics_table ORDER BY id;")
+        for song_id, title, lyrics, lyrics_hash in rows:
+            lyrics = lyrics or ""
+            yield SongInput("db", str(song_id), title or "", lyrics, lyrics_hash or hash_lyrics(lyrics))
+    finally:
+        conn.close()
+
+
+# -----------------------------
+# Analysis (runs in the worker processes)
+# -----------------------------
+def analyze_lyrics(lyrics: str) -> Record:
+    """Per-line syllables and stress, alignment (song and stanzas), rhyme scheme and groups."""
+    lex = get_lexicon()
+    lines = lyrics.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    patterns = [get_stress_pattern(line) for line in lines]
+
+    stanzas: List[List[str]] = [[]]
+    for line, pattern in zip(lines, patterns):
+        if line.strip():
+            stanzas[-1].append(pattern)
+        elif stanzas[-1]:
+            stanzas.append([])
+    stanzas = [s for s in stanzas if s]
+
+    # rhyme_scheme gives one letter per non-blank line when no blank lines are passed in
+    sung = [i for i, line in enumerate(lines) if line.strip()]
+    scheme = rhyme_scheme([lines[i] for i in sung])
+    groups: Dict[str, List[int]] = {}
+    for i, letter in zip(sung, scheme):
+        if letter != "-":
+            groups.setdefault(letter, []).append(i)
+
+    return {
+        "lines": [
+            {"text": line, "syllables": lex.line_syllables(line), "stress": pattern}
+            for line, pattern in zip(lines, patterns)
+        ],
+        "alignment": alignment_score([patterns[i] for i in sung]),
+        "stanza_alignment": [alignment_score(s) for s in stanzas],
+        "rhyme_scheme": scheme,
+        "rhyme_groups": {k: v for k, v in groups.items() if len(v) > 1},
+    }
+
+
+def analyze_song(song: SongInput) -> Record:
+    return {
+        "source": song.source,
+        "song_id": song.song_id,
+        "title": song.title,
+        "lyrics_hash": song.lyrics_hash,
+        "engine_version": ENGINE_VERSION,
+        **analyze_lyrics(song.lyrics),
+    }
+
+
+# -----------------------------
+# Writers
+# -----------------------------
+class NdjsonWriter:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def done_keys(self) -> Set[Tuple[str, str]]:
+        done: Set[Tuple[str, str]] = set()
+        if not self.path.exists():
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a run killed mid-write leaves a partial last line
+                done.add((rec.get("lyrics_hash"), rec.get("engine_version")))
+        return done
+
+    def __enter__(self) -> "NdjsonWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def write(self, rec: Record) -> None:
+        self._f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._f.flush()
+
+    def __exit__(self, *exc) -> None:
+        self._f.close()
+
+
+class ParquetWriter:
+    """One row per line; song-level fields repeated on each row."""
+
+    COLUMNS = (
+        "source", "song_id", "title", "lyrics_hash", "engine_version",
+        "line_no", "text", "syllables", "stress", "rhyme", "alignment",
+    )
+
+    def __init__(self, directory: Path, rows_per_group: int = 50_000):
+        if not _PYARROW_AVAILABLE:
+            raise RuntimeError("parquet output needs pyarrow (pip install pyarrow)")
+        self.directory = directory
+        self.rows_per_group = rows_per_group
+
+    def done_keys(self) -> Set[Tuple[str, str]]:
+        done: Set[Tuple[str, str]] = set()
+        for part in sorted(self.directory.glob("part-*.parquet")):
+            table = pq.read_table(part, columns=["lyrics_hash", "engine_version"])
+            done.update(zip(table.column("lyrics_hash").to_pylist(), table.column("engine_version").to_pylist()))
+        return done
+
+    def __enter__(self) -> "ParquetWriter":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path = self.directory / f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.parquet"
+        self._writer = None
+        self._buf: Dict[str, List[Any]] = {c: [] for c in self.COLUMNS}
+        return self
+
+    def write(self, rec: Record) -> None:
+        letters = _line_letters(rec)
+        for n, line in enumerate(rec["lines"]):
+            for c in ("source", "song_id", "title", "lyrics_hash", "engine_version", "alignment"):
+                self._buf[c].append(rec[c])
+            self._buf["line_no"].append(n)
+            self._buf["text"].append(line["text"])
+            self._buf["syllables"].append(line["syllables"])
+            self._buf["stress"].append(line["stress"])
+            self._buf["rhyme"].append(letters.get(n))
+        if len(self._buf["line_no"]) >= self.rows_per_group:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buf["line_no"]:
+            return
+        table = pa.table(self._buf)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+        self._buf = {c: [] for c in self.COLUMNS}
+
+    def __exit__(self, *exc) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _line_letters(rec: Record) -> Dict[int, str]:
+    return {i: letter for letter, rows in rec["rhyme_groups"].items() for i in rows}
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+def run(
+    songs: Iterable[SongInput],
+    writer: NdjsonWriter | ParquetWriter,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+) -> Tuple[int, int]:
+    """Analyze every song not already in the writer's output; returns (analyzed, skipped)."""
+    done = writer.done_keys()
+    todo: List[SongInput] = []
+    skipped = 0
+    for song in songs:
+        key = (song.lyrics_hash, ENGINE_VERSION)
+        if key in done:
+            skipped += 1
+            continue
+        done.add(key)  # duplicate files in one run are analyzed once
+        todo.append(song)
+
+    analyzed = 0
+    with writer, ProcessPoolExecutor(max_workers=workers) as pool:
+        for rec in pool.map(analyze_song, todo, chunksize=chunksize):
+            writer.write(rec)
+            analyzed += 1
+    return analyzed, skipped
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Batch prosody analysis of a lyrics catalog.")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--dir", type=Path, help=f"directory of lyric files ({', '.join(LYRIC_SUFFIXES)})")
+    src.add_argument("--db", nargs="?", const=DEFAULT_DB, type=Path, help="analyze lyrics_table (default: the app's database)")
+    p.add_argument("--out", type=Path, required=True, help="NDJSON file, or directory for parquet parts")
+    p.add_argument("--format", choices=("ndjson", "parquet"), default="ndjson")
+    p.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--chunksize", type=int, default=8)
+    args = p.parse_args()
+
+    songs = iter_directory(args.dir) if args.dir else iter_table(args.db)
+    try:
+        writer = NdjsonWriter(args.out) if args.format == "ndjson" else ParquetWriter(args.out)
+    except RuntimeError as e:
+        p.error(str(e))
+
+    start = time.perf_counter()
+    analyzed, skipped = run(songs, writer, workers=args.workers, chunksize=args.chunksize)
+    print(
+        f"analyzed {analyzed}, skipped {skipped} (engine {ENGINE_VERSION}) in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Cached whole-song prosody analysis for the studio.
+
+Results of prosody_analyze.analyze_lyrics are stored in analysis_cache under
+the song's lyrics_hash and ENGINE_VERSION, so opening a saved song reads its
+syllables, flow and rhyme scheme instead of recomputing them. Entries are
+written in the background: after a save, for a song opened before it was
+cached, and for the whole catalog at startup.
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from analysis_cache_db import AnalysisCache
+from lyrics_db import hash_lyrics
+from services.prosody_analyze import ENGINE_VERSION, Record, analyze_lyrics
+
+logger = logging.getLogger(__name__)
+
+ANALYZER = "prosody"
+
+
+class SongAnalysis:
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        self.cache = cache or AnalysisCache()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="song-analysis")
+        self._closed = False
+
+    def cached(self, lyrics: str) -> Optional[Record]:
+        return self.cache.get(hash_lyrics(lyrics), ANALYZER, ENGINE_VERSION)
+
+    def analyze(self, lyrics: str) -> Record:
+        """Cached result, else analyze now and cache it."""
+        lyrics_hash = hash_lyrics(lyrics)
+        record = self.cache.get(lyrics_hash, ANALYZER, ENGINE_VERSION)
+        if record is None:
+            record = analyze_lyrics(lyrics)
+            self.cache.put(lyrics_hash, ANALYZER, ENGINE_VERSION, record)
+        return record
+
+    def warm(self, lyrics: str) -> Optional[Future]:
+        """analyze() on the background thread."""
+        return self._submit(self.analyze, lyrics)
+
+    def warm_catalog(self, all_lyrics: Callable[[], Iterable[str]]) -> Optional[Future]:
+        """
+        Cache every song missing an entry for this engine version, then prune
+        stale rows. `all_lyrics` is called on the background thread, so the
+        catalog is read and hashed there (give it a reader that opens its own
+        connection, e.g. lambda: LyricsLibrary().all_lyrics()).
+        """
+        return self._submit(self._warm_catalog, all_lyrics)
+
+    def _warm_catalog(self, all_lyrics: Callable[[], Iterable[str]]) -> int:
+        texts: Dict[str, str] = {hash_lyrics(t): t for t in all_lyrics() if t}
+        missing = self.cache.missing(list(texts), ANALYZER, ENGINE_VERSION)
+        for lyrics_hash in missing:
+            self.cache.put(lyrics_hash, ANALYZER, ENGINE_VERSION, analyze_lyrics(texts[lyrics_hash]))
+        self.cache.prune(ANALYZER, ENGINE_VERSION)
+        return len(missing)
+
+    def _submit(self, fn, *args) -> Optional[Future]:
+        if self._closed:  # e.g. a save result arriving after the studio closed
+            return None
+        return self._pool.submit(self._guard, fn, *args)
+
+    @staticmethod
+    def _guard(fn, *args) -> Any:
+        try:
+            return fn(*args)
+        except Exception as e:
+            logger.debug(f"background analysis failed: {e}")
+            return None
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def stanza_scheme(record: Record) -> str:
+    """The record's rhyme scheme with a space per blank line, as flow_analysis.rhyme_scheme writes it."""
+    letters = iter(record["rhyme_scheme"])
+    return "".join(next(letters, "-") if line["text"].strip() else " " for line in record["lines"]).strip()
+
+
+def line_syllables(record: Record) -> Dict[str, int]:
+    return {line["text"]: line["syllables"] for line in record["lines"]}
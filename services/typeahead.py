@@ -0,0 +1,110 @@
+"""
+Typeahead over dictionary words plus the writer's own vocabulary.
+
+Prefix lookups are a bisect into sorted arrays, so a keystroke costs
+microseconds. Each suggestion says whether the word has a CMU
+pronunciation or will need G2P (slow) when searched.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import pronouncing
+
+from Rhyme_engine.candidate_store import common_words, usable_word
+from services.lyrics_library import shared_vocabulary
+
+Suggestion = Tuple[str, bool]  # (word, in_dictionary)
+
+
+@lru_cache(maxsize=1)
+def dictionary_words() -> Tuple[str, ...]:
+    """Sorted CMU words (same filter as the candidate store). ~1 s on first call."""
+    pronouncing.init_cmu()
+    return tuple(sorted({w for w, phones in pronouncing.pronunciations if usable_word(w, phones)}))
+
+
+def _prefix_range(words: Sequence[str], prefix: str) -> Iterable[str]:
+    i = bisect_left(words, prefix)
+    while i < len(words) and words[i].startswith(prefix):
+        yield words[i]
+        i += 1
+
+
+class TypeaheadIndex:
+    """
+    Suggestions in priority order: catalog words (most used first), common
+    words, then the rest of the dictionary alphabetically.
+    """
+
+    def __init__(self, catalog: Optional[Mapping[str, int]] = None):
+        self._ready = threading.Event()
+        self._words: Tuple[str, ...] = ()
+        self._known: frozenset = frozenset()
+        self._common: Tuple[str, ...] = ()
+        self.set_catalog(catalog or {})
+
+    def load(self) -> None:
+        """Build the dictionary arrays (blocking). Safe to call from a worker thread."""
+        words = dictionary_words()
+        self._known = frozenset(words)
+        self._common = tuple(sorted(w for w in common_words() if w in self._known))
+        self._words = words
+        self._ready.set()
+
+    def load_async(self) -> None:
+        threading.Thread(target=self.load, daemon=True).start()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def set_catalog(self, catalog: Mapping[str, int]) -> None:
+        """Swap in new catalog counts (safe from a worker thread)."""
+        words = {w.lower(): n for w, n in catalog.items() if w}
+        self._catalog_counts = words
+        self._catalog = tuple(sorted(words))
+
+    def in_dictionary(self, word: str) -> bool:
+        return word.lower() in self._known
+
+    def suggest(self, prefix: str, limit: int = 12) -> List[Suggestion]:
+        prefix = prefix.lower()
+        if not prefix or not self.ready:
+            return []
+        out: List[Suggestion] = []
+        seen = set()
+
+        def add(words: Iterable[str]) -> bool:
+            for w in words:
+                if w in seen or w == prefix:
+                    continue
+                seen.add(w)
+                out.append((w, w in self._known))
+                if len(out) >= limit:
+                    return True
+            return False
+
+        catalog = sorted(_prefix_range(self._catalog, prefix), key=lambda w: -self._catalog_counts.get(w, 0))
+        if add(catalog):
+            return out
+        if add(_prefix_range(self._common, prefix)):
+            return out
+        add(_prefix_range(self._words, prefix))
+        return out
+
+
+@lru_cache(maxsize=1)
+def shared_index() -> TypeaheadIndex:
+    """
+    One index per process for every input box. The dictionary loads in the
+    background; the catalog follows shared_vocabulary(), so saved songs
+    reach every box.
+    """
+    index = TypeaheadIndex()
+    index.load_async()
+    shared_vocabulary().subscribe(index.set_catalog)
+    return index
@@ -1,21 +1,168 @@
 import sqlite3
 from pathlib import Path
 import logging
+from db_connection import commit, get_connection, rollback
 from datetime import datetime, timedelta
 logging.basicConfig(level=logging.DEBUG)
 
+# one row per (local_profile_id, created_at day): writes are single upserts
+ADD_SESSION_SQL = """INSERT INTO stats ("writing time", sessions, created_at, local_profile_id)
+VALUES (0, 1, ?, ?)
+ON CONFLICT (local_profile_id, created_at) DO UPDATE SET sessions = sessions + 1
+RETURNING sessions;"""
+
+ADD_WRITING_TIME_SQL = """INSERT INTO stats ("writing time", sessions, created_at, local_profile_id)
+VALUES (?, 0, ?, ?)
+ON CONFLICT (local_profile_id, created_at) DO UPDATE SET "writing time" = "writing time" + excluded."writing time"
+RETURNING "writing time";"""
+
+# period -> (rollup table, date() modifiers giving the period's first day)
+ROLLUPS = {
+    "week": ("stats_weekly", "'weekday 0', '-6 days'"),   # Monday
+    "month": ("stats_monthly", "'start of month'"),
+}
+
+
+def _rollup_statements(table: str, start: str) -> list:
+    """Table, backfill and the triggers that keep `table` equal to stats summed per period."""
+    add = f"""INSERT INTO {table} (local_profile_id, period_start, writing_time, sessions)
+        VALUES (new.local_profile_id, date(new.created_at, {start}), new."writing time", new.sessions)
+        ON CONFLICT (local_profile_id, period_start) DO UPDATE SET
+            writing_time = writing_time + excluded.writing_time,
+            sessions = sessions + excluded.sessions;"""
+    remove = f"""UPDATE {table} SET
+            writing_time = writing_time - old."writing time",
+            sessions = sessions - old.sessions
+        WHERE local_profile_id = old.local_profile_id AND period_start = date(old.created_at, {start});"""
+    return [
+        f"""CREATE TABLE IF NOT EXISTS {table} (
+            local_profile_id INTEGER NOT NULL,
+            period_start TEXT NOT NULL,
+            writing_time INTEGER NOT NULL DEFAULT 0,
+            sessions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (local_profile_id, period_start)
+        ) WITHOUT ROWID;""",
+        f"""INSERT INTO {table} (local_profile_id, period_start, writing_time, sessions)
+        SELECT local_profile_id, date(created_at, {start}), sum("writing time"), sum(sessions)
+        FROM stats GROUP BY 1, 2;""",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON stats BEGIN {add} END;",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON stats BEGIN {remove} END;",
+        f"""CREATE TRIGGER IF NOT EXISTS {table}_au
+        AFTER UPDATE OF "writing time", sessions, created_at, local_profile_id ON stats
+        BEGIN {remove} {add} END;""",
+    ]
+
+
+# migration 008: merge duplicate days, make the day unique, add the rollups
+STATS_ROLLUPS_MIGRATION = [
+    """UPDATE stats SET
+        "writing time" = (SELECT sum(s."writing time") FROM stats s
+                          WHERE s.local_profile_id = stats.local_profile_id AND s.created_at = stats.created_at),
+        sessions = (SELECT sum(s.sessions) FROM stats s
+                    WHERE s.local_profile_id = stats.local_profile_id AND s.created_at = stats.created_at)
+    WHERE id IN (SELECT min(id) FROM stats GROUP BY local_profile_id, created_at HAVING count(*) > 1);""",
+    "DELETE FROM stats WHERE id NOT IN (SELECT min(id) FROM stats GROUP BY local_profile_id, created_at);",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_stats_profile_day ON stats (local_profile_id, created_at);",
+    *_rollup_statements(*ROLLUPS["week"]),
+    *_rollup_statements(*ROLLUPS["month"]),
+]
+
+
+# migration 009: everything the dashboard tiles show, kept current by triggers
+# so startup reads one row per table by primary key, however large the library
+DASHBOARD_COUNTERS_MIGRATION = [
+    """CREATE TABLE IF NOT EXISTS dashboard_counters (
+        local_profile_id INTEGER PRIMARY KEY,
+        total_songs INTEGER NOT NULL DEFAULT 0,
+        last_song_at TEXT,
+        last_activity_at TEXT
+    );""",
+    """CREATE TABLE IF NOT EXISTS songs_weekly (
+        local_profile_id INTEGER NOT NULL,
+        period_start TEXT NOT NULL,
+        songs INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (local_profile_id, period_start)
+    ) WITHOUT ROWID;""",
+    # the song triggers recompute max(created_at) per profile after a delete or move
+    "CREATE INDEX IF NOT EXISTS idx_lyrics_profile_created ON lyrics_table (local_profile_id, created_at);",
+    # backfill
+    """INSERT OR REPLACE INTO dashboard_counters (local_profile_id, total_songs, last_song_at, last_activity_at)
+    SELECT p.id,
+           (SELECT count(*) FROM lyrics_table l WHERE l.local_profile_id = p.id),
+           (SELECT max(created_at) FROM lyrics_table l WHERE l.local_profile_id = p.id),
+           (SELECT max(created_at) FROM stats s WHERE s.local_profile_id = p.id)
+    FROM (SELECT local_profile_id AS id FROM lyrics_table UNION SELECT local_profile_id FROM stats) p;""",
+    """INSERT OR REPLACE INTO songs_weekly (local_profile_id, period_start, songs)
+    SELECT local_profile_id, date(created_at, 'weekday 0', '-6 days'), count(*)
+    FROM lyrics_table GROUP BY 1, 2;""",
+    # songs
+    """CREATE TRIGGER IF NOT EXISTS dashboard_songs_ai AFTER INSERT ON lyrics_table BEGIN
+        INSERT INTO dashboard_counters (local_profile_id, total_songs, last_song_at)
+        VALUES (new.local_profile_id, 1, new.created_at)
+        ON CONFLICT (local_profile_id) DO UPDATE SET
+            total_songs = total_songs + 1,
+            last_song_at = max(coalesce(last_song_at, ''), excluded.last_song_at);
+        INSERT INTO songs_weekly (local_profile_id, period_start, songs)
+        VALUES (new.local_profile_id, date(new.created_at, 'weekday 0', '-6 days'), 1)
+        ON CONFLICT (local_profile_id, period_start) DO UPDATE SET songs = songs + 1;
+    END;""",
+    """CREATE TRIGGER IF NOT EXISTS dashboard_songs_ad AFTER DELETE ON lyrics_table BEGIN
+        UPDATE dashboard_counters SET
+            total_songs = total_songs - 1,
+            last_song_at = (SELECT max(created_at) FROM lyrics_table WHERE local_profile_id = old.local_profile_id)
+        WHERE local_profile_id = old.local_profile_id;
+        UPDATE songs_weekly SET songs = songs - 1
+        WHERE local_profile_id = old.local_profile_id
+          AND period_start = date(old.created_at, 'weekday 0', '-6 days');
+    END;""",
+    """CREATE TRIGGER IF NOT EXISTS dashboard_songs_au
+    AFTER UPDATE OF created_at, local_profile_id ON lyrics_table BEGIN
+        UPDATE dashboard_counters SET
+            total_songs = total_songs - 1,
+            last_song_at = (SELECT max(created_at) FROM lyrics_table WHERE local_profile_id = old.local_profile_id)
+        WHERE local_profile_id = old.local_profile_id;
+        UPDATE songs_weekly SET songs = songs - 1
+        WHERE local_profile_id = old.local_profile_id
+          AND period_start = date(old.created_at, 'weekday 0', '-6 days');
+        INSERT INTO dashboard_counters (local_profile_id, total_songs, last_song_at)
+        VALUES (new.local_profile_id, 1, new.created_at)
+        ON CONFLICT (local_profile_id) DO UPDATE SET
+            total_songs = total_songs + 1,
+            last_song_at = max(coalesce(last_song_at, ''), excluded.last_song_at);
+        INSERT INTO songs_weekly (local_profile_id, period_start, songs)
+        VALUES (new.local_profile_id, date(new.created_at, 'weekday 0', '-6 days'), 1)
+        ON CONFLICT (local_profile_id, period_start) DO UPDATE SET songs = songs + 1;
+    END;""",
+    # writing activity
+    """CREATE TRIGGER IF NOT EXISTS dashboard_stats_ai AFTER INSERT ON stats BEGIN
+        INSERT INTO dashboard_counters (local_profile_id, last_activity_at)
+        VALUES (new.local_profile_id, new.created_at)
+        ON CONFLICT (local_profile_id) DO UPDATE SET
+            last_activity_at = max(coalesce(last_activity_at, ''), excluded.last_activity_at);
+    END;""",
+]
+
+# the four tiles for one profile and week, by primary key only
+DASHBOARD_SQL = """SELECT coalesce(st.writing_time, 0), coalesce(st.sessions, 0), coalesce(sw.songs, 0), c.total_songs
+FROM dashboard_counters c
+LEFT JOIN stats_weekly st
+    ON st.local_profile_id = c.local_profile_id AND st.period_start = date(?, 'weekday 0', '-6 days')
+LEFT JOIN songs_weekly sw
+    ON sw.local_profile_id = c.local_profile_id AND sw.period_start = date(?, 'weekday 0', '-6 days')
+WHERE c.local_profile_id = ?;"""
+
 class Stats:
 
     def __init__(self):
         self.db_path = self.db_path = Path(__file__).parent / "lyrical_lab.db"
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)  # shared per thread, WAL (db_connection.py)
         self.conn_cursor = self.conn.cursor()
         self.stats = "stats"
         self.local_id = 1 #default
 
     def _commit_data(self):
         """Commits data to data base (does not close connection)"""
-        self.conn.commit()
+        commit(self.conn)
 
     def get_stats(self) -> list | dict:
         """
@@ -41,10 +188,10 @@ class Stats:
         
     def get_res_stats(self) -> tuple:
         
-        query = f""" SELECT * from {self.stats} ORDER by created_at DESC;"""
+        query = f"""SELECT * FROM {self.stats} WHERE local_profile_id = ? ORDER BY created_at DESC LIMIT 1;"""
 
         try:
-            self.conn_cursor.execute(query)
+            self.conn_cursor.execute(query, (self.local_id,))
             stats_data = self.conn_cursor.fetchone()
             return stats_data
         except sqlite3.DatabaseError as e:
@@ -54,82 +201,103 @@ class Stats:
             logging.debug(e)
             return {"message": "Error - Please try again", "state": False}
 
-    def add_session(self, session):
-        
+    def add_session(self, session=None):
+        """
+        Count one more writing session today (one upsert). `session` is
+        ignored: the count comes from the stored row.
+        """
         date_today = datetime.now().date()
-        if self._today_stats():
-            #session exists
-            session += 1
-            query = f"""UPDATE stats
-set sessions = ? WHERE created_at = "{date_today}";"""
-            try:
-                self.conn_cursor.execute(query, (session,))
-                self._commit_data()
-                return {"message": "Session successfully updated", "status": True, "new_ses": session}
-            except sqlite3.DatabaseError as e:
-                logging.debug(e)
-                return {"message": "Database Error - Please try again", "state": False}
-            except Exception as e:
-                logging.debug(e)
-                return {"message": "Error - Please try again", "state": False}
-        else:
-            #create new session
-            query = f"""INSERT INTO stats ("writing time", "sessions", "created_at", "local_profile_id") VALUES (
-	?, ?, ?, ?
-);"""
-            try:
-                self.conn_cursor.execute(query, (0, 1, date_today, self.local_id))
-                self._commit_data()
-                return {"message": "Session successfully created", "status": True, "new_ses": 1}
-            except sqlite3.DatabaseError as e:
-                logging.debug(e)
-                return {"message": "Database Error - Please try again", "state": False}
-            except Exception as e:
-                logging.debug(e)
-                return {"message": "Error - Please try again", "state": False}
+        try:
+            self.conn_cursor.execute(ADD_SESSION_SQL, (str(date_today), self.local_id))
+            sessions = self.conn_cursor.fetchone()[0]
+            self._commit_data()
+            return {"message": "Session successfully updated", "status": True, "new_ses": sessions}
+        except sqlite3.DatabaseError as e:
+            rollback(self.conn)
+            logging.debug(e)
+            return {"message": "Database Error - Please try again", "state": False}
+        except Exception as e:
+            rollback(self.conn)
+            logging.debug(e)
+            return {"message": "Error - Please try again", "state": False}
 
     def add_writing_time(self, seconds):
-       
+        """Add `seconds` to today's writing time (one upsert)."""
         date_today = datetime.now().date()
-        if self._today_stats():
-            #writing sessions exists
-            query = f"""UPDATE stats
-set 'writing time' = ? WHERE created_at = "{date_today}";"""
-            seconds = seconds + self.get_writing_time()
-            try:
-                self.conn_cursor.execute(query, (seconds,))
-                self._commit_data()
-                return {"message": "Writing time updated", "status": True, "writing_time": seconds}
-            except sqlite3.DatabaseError as e:
-                logging.debug(e)
-                return {"message": "Database Error - Please try again", "state": False}
-            except Exception as e:
-                logging.debug(e)
-                return {"message": "Error - Please try again", "state": False}
+        try:
+            self.conn_cursor.execute(ADD_WRITING_TIME_SQL, (seconds, str(date_today), self.local_id))
+            writing_time = self.conn_cursor.fetchone()[0]
+            self._commit_data()
+            return {"message": "Writing time updated", "status": True, "writing_time": writing_time}
+        except sqlite3.DatabaseError as e:
+            rollback(self.conn)
+            logging.debug(e)
+            return {"message": "Database Error - Please try again", "state": False}
+        except Exception as e:
+            rollback(self.conn)
+            logging.debug(e)
+            return {"message": "Error - Please try again", "state": False}
+
+    def get_period_totals(self, period: str = "week", day=None) -> tuple:
+        """
+        (writing time, sessions) of the week or month containing `day`
+        (default today), read from its rollup table; (0, 0) if nothing was written.
+        """
+        table, start = ROLLUPS[period]
+        day = str(day or datetime.now().date())
+        query = f"""SELECT writing_time, sessions FROM {table}
+WHERE local_profile_id = ? AND period_start = date(?, {start});"""
+        try:
+            self.conn_cursor.execute(query, (self.local_id, day))
+            return self.conn_cursor.fetchone() or (0, 0)
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+            return (0, 0)
+
+    def get_dashboard(self, day=None) -> tuple:
+        """
+        (writing time, sessions, new songs, total songs) for the dashboard
+        tiles, the first three for the week containing `day` (default today).
+        One fetch from the trigger-maintained counters (migration 009).
+        """
+        day = str(day or datetime.now().date())
+        try:
+            self.conn_cursor.execute(DASHBOARD_SQL, (day, day, self.local_id))
+            return self.conn_cursor.fetchone() or (0, 0, 0, 0)
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+            return (0, 0, 0, 0)
+
+    def get_series(self, period: str = "day", local_profile_id: int | None = None,
+                   start: str | None = None, end: str | None = None) -> list:
+        """
+        [(period_start, writing time, sessions)] oldest first, one row per
+        day, week or month with any activity (weeks and months from the rollups).
+        start/end: 'YYYY-MM-DD' bounds (inclusive) on period_start, read as an
+        index range.
+        """
+        if period == "day":
+            query = f"""SELECT created_at, "writing time", sessions FROM {self.stats}
+WHERE local_profile_id = ? AND created_at BETWEEN ? AND ? ORDER BY created_at;"""
         else:
-            #create new writing time
-            query = f"""INSERT INTO stats ("writing time", "sessions", "created_at", "local_profile_id") VALUES (
-	?, ?, ?, ?
-);"""
-            try:
-                self.conn_cursor.execute(query, (seconds, 0, date_today, self.local_id))
-                self._commit_data()
-                return {"message": "Writing successfully added", "status": True, "writing_time": seconds}
-            except sqlite3.DatabaseError as e:
-                logging.debug(e)
-                return {"message": "Database Error - Please try again", "state": False}
-            except Exception as e:
-                logging.debug(e)
-                return {"message": "Error - Please try again", "state": False}
+            table, _ = ROLLUPS[period]
+            query = f"""SELECT period_start, writing_time, sessions FROM {table}
+WHERE local_profile_id = ? AND period_start BETWEEN ? AND ? ORDER BY period_start;"""
+        try:
+            self.conn_cursor.execute(query, (local_profile_id or self.local_id, start or "", end or "9999-12-31"))
+            return self.conn_cursor.fetchall()
+        except sqlite3.DatabaseError as e:
+            logging.debug(e)
+            return []
 
 
     def get_writing_time(self) -> int:
         
         date_today = datetime.now().date()
-        query = f"SELECT * FROM {self.stats} WHERE created_at = '{date_today}';"
+        query = f"SELECT * FROM {self.stats} WHERE created_at = ?;"
 
         try:
-            self.conn_cursor.execute(query)
+            self.conn_cursor.execute(query, (str(date_today),))
             writing_time = self.conn_cursor.fetchone()
             return writing_time[1]
         except sqlite3.DatabaseError as e:
@@ -138,32 +306,8 @@ set 'writing time' = ? WHERE created_at = "{date_today}";"""
         except Exception as e:
             logging.debug(e)
             return 0
-        
-    def _today_stats(self) -> bool | dict:
-        """
-        Docstring for today_stats
-        Checks if the session for today's date exits.
-        """
-
-        date_today = datetime.now().date()
-        query = f"""SELECT * FROM {self.stats}
-WHERE created_at = "{date_today}";"""
-        try:
-            self.conn_cursor.execute(query)
-            session_exists = self.conn_cursor.fetchone()
-            if session_exists:
-                return True
-            else:
-                return False
-        except sqlite3.DatabaseError as e:
-            logging.debug(e)
-            return {"message": "Database Error - Please try again", "state": False}
-        except Exception as e:
-            logging.debug(e)
-            return {"message": "Error - Please try again", "state": False}
 
 
-        
 if __name__ == "__main__":
     from datetime import datetime, timedelta
     stats = Stats()
@@ -0,0 +1,26 @@
+import os
+import sys
+from pathlib import Path
+
+# the app's modules are top-level (lyrics_db, ui.block_tally, ...): import them from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Qt widgets and documents without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_exitstatus = 0
+
+
+def pytest_sessionfinish(session, exitstatus):
+    global _exitstatus
+    _exitstatus = int(exitstatus)
+
+
+def pytest_unconfigure(config):
+    # PySide6 6.12 on Python 3.11 drops a reference to True on every Signal.emit
+    # (and to None on every void call); a few thousand edits later the interpreter
+    # aborts while finalizing. The results are reported by now: leave without it.
+    if "PySide6" in sys.modules:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(_exitstatus)
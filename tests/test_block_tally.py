@@ -0,0 +1,34 @@
+"""BlockTally against full recounts while a large document is edited."""
+import random
+
+import pytest
+from PySide6.QtGui import QTextCursor, QTextDocument
+from PySide6.QtWidgets import QApplication
+
+from ui.block_tally import BlockTally, count_words
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def test_tally_matches_a_full_recount_after_edits(qapp, lines=20000, edits=2000, seed=7):
+    """Random typing, pastes, deletions and multi-line replacements."""
+    rng = random.Random(seed)
+    vocab = ["fire", "desire", "the", "night", "we", "run", "alone", "", "  ", "\n", "\n\n", "\u2028"]
+    doc = QTextDocument()
+    doc.setPlainText("\n".join(" ".join(rng.choice(vocab[:7]) for _ in range(rng.randrange(9))) for _ in range(lines)))
+    tally = BlockTally(doc, count_words)
+
+    for i in range(edits):
+        cursor = QTextCursor(doc)
+        end = doc.characterCount() - 1
+        a = rng.randrange(end + 1)
+        b = min(end, a + rng.choice([0, 0, 1, 5, 40, 400, 5000]))
+        cursor.setPosition(a)
+        cursor.setPosition(b, QTextCursor.KeepAnchor)
+        cursor.insertText(" ".join(rng.choice(vocab) for _ in range(rng.choice([0, 1, 3, 30]))))
+        if i % 100 == 0 or i == edits - 1:
+            assert tally.total == len(doc.toPlainText().split()), i
+            assert len(tally.values) == doc.blockCount(), i
@@ -0,0 +1,37 @@
+"""
+Hot lyrics lookups must stay on an index once the migrations have run
+(Lyrics.check_query_plans: no whole-table SCAN, no temporary sort b-tree).
+"""
+import shutil
+from pathlib import Path
+
+import pytest
+
+from db_connection import close_connection, connect
+from db_migration_table import MIGRATIONS, MigrationManager
+from lyrics_db import Lyrics
+
+SHIPPED_DB = Path(__file__).resolve().parent.parent / "lyrical_lab.db"
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    db = tmp_path / "lyrical_lab.db"
+    shutil.copy(SHIPPED_DB, db)
+    MigrationManager(str(db)).migrate(MIGRATIONS)
+    yield db
+    close_connection(db)
+
+
+def test_hot_queries_use_an_index(migrated_db):
+    assert Lyrics(migrated_db).check_query_plans() == []
+
+
+def test_a_dropped_index_is_reported_as_a_scan(migrated_db):
+    conn = connect(migrated_db)
+    conn.execute("DROP INDEX idx_lyrics_title_nocase;")
+    conn.commit()
+    conn.close()
+
+    problems = Lyrics(migrated_db).check_query_plans()
+    assert any(p.startswith("_is_unique:") and "SCAN" in p for p in problems)
@@ -1,6 +1,7 @@
 import sqlite3
 from pathlib import Path
 import logging
+from db_connection import commit, get_connection, rollback
 logging.basicConfig(level=logging.DEBUG)
 
 class Themes():
@@ -8,13 +9,13 @@ class Themes():
 
     def __init__(self):
         self.db_path = Path(__file__).parent / "lyrical_lab.db"
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)  # shared per thread, WAL (db_connection.py)
         self.conn_cursor = self.conn.cursor()
         self.themes_table_name = 'themes'
 
     def _commit_data(self):
         """Commits data to the data base (does not close connection)"""
-        self.conn.commit()
+        commit(self.conn)
 
     def get_theme_mode(self, theme:str) -> str:
         """Get theme"""
@@ -39,6 +40,7 @@ class Themes():
             self._commit_data()
             return
         except Exception as e:
+            rollback(self.conn)
             logging.debug(f"An error occurred: {e}")
     
     def get_chosen_theme(self) -> str:
@@ -0,0 +1,97 @@
+"""
+Per-line (per-block) tallies of a QTextDocument, kept up to date from
+contentsChange deltas instead of re-reading the whole document.
+
+Only the blocks an edit touched are re-measured, and measurements are cached
+by line text, so re-typing or pasting a known line costs a dict lookup.
+tests/test_block_tally.py checks the tally against full recounts.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, List
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QTextDocument
+
+
+def count_words(line: str) -> int:
+    """Whitespace-separated words, the same rule as len(toPlainText().split())."""
+    return len(line.split())
+
+
+class BlockTally(QObject):
+    """values[i] = measure(text of block i); total = sum(values)."""
+
+    changed = Signal(int, int)  # first block number, number of blocks re-measured
+
+    def __init__(
+        self,
+        document: QTextDocument,
+        measure: Callable[[str], int],
+        cache_size: int = 4096,
+        parent: QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.document = document
+        self.measure = measure
+        self.cache_size = cache_size
+        self._cache: Dict[str, int] = {}
+        self.values: List[int] = []
+        self.total = 0
+        self.rebuild()
+        document.documentLayout()  # Qt only emits contentsChange once the document has a layout
+        document.contentsChange.connect(self._on_contents_change)
+
+    def _measure(self, text: str) -> int:
+        value = self._cache.get(text)
+        if value is None:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            value = self._cache[text] = self.measure(text)
+        return value
+
+    def prime(self, values: Dict[str, int]) -> None:
+        """Seed the per-text cache with known measurements (e.g. a cached song analysis)."""
+        if len(self._cache) + len(values) > self.cache_size:
+            self._cache.clear()
+        self._cache.update(values)
+
+    def value(self, block_number: int) -> int:
+        return self.values[block_number] if 0 <= block_number < len(self.values) else 0
+
+    def rebuild(self) -> None:
+        values: List[int] = []
+        block = self.document.begin()
+        while block.isValid():
+            values.append(self._measure(block.text()))
+            block = block.next()
+        self.values = values
+        self.total = sum(values)
+        self.changed.emit(0, len(values))
+
+    def _on_contents_change(self, position: int, removed: int, added: int) -> None:
+        doc = self.document
+        first = doc.findBlock(position)
+        last = doc.findBlock(position + added)
+        if not first.isValid():
+            self.rebuild()
+            return
+        if not last.isValid():
+            last = doc.lastBlock()
+
+        start = first.blockNumber()
+        now = last.blockNumber() - start + 1  # blocks covering the edit after it
+        before = now - (doc.blockCount() - len(self.values))  # ... and before it
+        if before < 1 or start + before > len(self.values):
+            self.rebuild()
+            return
+
+        fresh: List[int] = []
+        block = first
+        for _ in range(now):
+            fresh.append(self._measure(block.text()))
+            block = block.next()
+
+        self.total += sum(fresh) - sum(self.values[start:start + before])
+        self.values[start:start + before] = fresh
+        self.changed.emit(start, now)
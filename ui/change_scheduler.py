@@ -0,0 +1,137 @@
+"""
+Debounced change pipeline for the writing editor.
+
+A keystroke only bumps a generation counter and restarts an idle timer.
+When typing pauses, the document is read once and the snapshot is handed to
+every registered analyzer on a worker pool. Results come back to the GUI
+thread; a result whose snapshot is older than the latest edit is dropped.
+
+Each analyzer has at most one job in flight: if it is still busy when the
+next snapshot is taken, it runs once more on the newest text when it
+finishes, instead of queueing every intermediate state.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QTextEdit
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Analyzer:
+    name: str
+    run: Callable[[str], Any]                        # worker thread
+    on_result: Optional[Callable[[Any], None]]       # GUI thread
+    busy: bool = False
+    pending: bool = False
+    runs: int = 0
+    dropped: int = 0
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.runs if self.runs else 0.0
+
+
+class ChangeScheduler(QObject):
+    latency = Signal(str, float)  # analyzer name, milliseconds
+    idle = Signal()               # typing paused: the snapshot was just taken
+    _finished = Signal(str, int, object, float, object)  # name, generation, result, ms, error
+
+    def __init__(self, editor: QTextEdit, idle_ms: int = 300, max_workers: int = 2, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.editor = editor
+        self.analyzers: Dict[str, Analyzer] = {}
+        self.generation = 0
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(idle_ms)
+        self._timer.timeout.connect(self.flush)
+
+        self._finished.connect(self._on_finished)
+        editor.textChanged.connect(self._on_text_changed)
+
+    def register(self, name: str, run: Callable[[str], Any], on_result: Optional[Callable[[Any], None]] = None) -> None:
+        self.analyzers[name] = Analyzer(name, run, on_result)
+
+    def _on_text_changed(self) -> None:
+        self.generation += 1
+        self._timer.start()
+
+    def cancel(self) -> None:
+        """
+        Drop the snapshot a change is waiting for, when the text was set with
+        its results already known (a song loaded with a cached analysis).
+        """
+        self._timer.stop()
+
+    def flush(self) -> None:
+        """Snapshot the document now and start every idle analyzer on it."""
+        self._timer.stop()
+        text = self.editor.toPlainText()
+        for analyzer in self.analyzers.values():
+            if analyzer.busy:
+                analyzer.pending = True
+            else:
+                self._submit(analyzer, text)
+        self.idle.emit()
+
+    def _submit(self, analyzer: Analyzer, text: str) -> None:
+        if self._closed:  # a finishing job's rerun, or an edit, after shutdown()
+            return
+        analyzer.busy = True
+        analyzer.pending = False
+        generation = self.generation
+
+        def job() -> None:
+            start = time.perf_counter()
+            result, error = None, None
+            try:
+                result = analyzer.run(text)
+            except Exception as e:  # reported on the GUI thread
+                error = e
+            self._finished.emit(analyzer.name, generation, result, (time.perf_counter() - start) * 1000, error)
+
+        self._pool.submit(job)
+
+    def _on_finished(self, name: str, generation: int, result: Any, ms: float, error: Any) -> None:
+        analyzer = self.analyzers.get(name)
+        if analyzer is None:
+            return
+        analyzer.busy = False
+        analyzer.runs += 1
+        analyzer.last_ms = ms
+        analyzer.total_ms += ms
+        self.latency.emit(name, ms)
+
+        if error is not None:
+            logger.debug(f"analyzer {name} failed: {error}")
+        elif generation != self.generation:
+            analyzer.dropped += 1
+        elif analyzer.on_result is not None:
+            analyzer.on_result(result)
+
+        if analyzer.pending:
+            self._submit(analyzer, self.editor.toPlainText())
+
+    def latency_report(self) -> str:
+        return "\n".join(
+            f"{a.name}: last {a.last_ms:.1f} ms, avg {a.avg_ms:.1f} ms, runs {a.runs}, dropped {a.dropped}"
+            for a in self.analyzers.values()
+        )
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self._timer.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -7,6 +7,7 @@ from PySide6.QtWidgets import (
     QListWidget, QListWidgetItem, QTextEdit, QScrollArea, QSizePolicy
 )
 from typing import Optional, Callable, List, Any, Dict
+from concurrent.futures import Future
 from pathlib import Path
 from ui.notifications import NotificationToast
 from ui.songs_display import SongsDisplayWidget
@@ -15,9 +16,12 @@ from services.models import Note, SongPreview
 from services.preferences import ThemeManager, Preferences
 from services.fetch_rhymes import find_rhymes
 from stats_db import Stats
+from db_writer import get_writer
 from autodidex_cache import DictionaryCache
 from themes_db import Themes
 from ui.stats_chart import WritingStatsChart
+from ui.word_completer import WordCompleter
+from ui.write_results import WriteResults
 
 CONFIG_FILE = Path(__file__).parent.parent / "noteworthy files/config.json"
 
@@ -43,6 +47,7 @@ class LLDashboard(QWidget):
         self.theme_mgr.load_themes()
         prefs = self.prefs.load()
         self.stats = Stats()
+        self.writes = WriteResults(self)  # write-behind results (stats, notes) back on this thread
         self.theme = prefs.theme
 
         self.setStyleSheet(self.theme_mgr.stylesheet_for(self.theme))
@@ -51,7 +56,7 @@ class LLDashboard(QWidget):
         self.on_open_studio: Optional[Callable[[], None]] = None
         self.on_open_studio_with_song: Optional[Callable[[tuple], None]] = None
         self.on_fetch_rhymes: Optional[Callable[[str], List[str]]] = None
-        self.on_save_note: Optional[Callable[[str, str], Dict[str, Any]]] = None
+        self.on_save_note: Optional[Callable[[str], Future]] = None  # resolves to the result dict
         self.on_update_note: Optional[Callable[[str, str], Dict[str, Any]]] = None
         self.on_delete_note: Optional[Callable[[str], Dict[str, Any]]] = None
         self.on_refresh_notes: Optional[Callable[[], List[Note]]] = None
@@ -266,6 +271,7 @@ class LLDashboard(QWidget):
         rs_card, rs, _ = glass_card("<h2>Rime Search</h2>")
         self.rhyme_input = QLineEdit()
         self.rhyme_input.setPlaceholderText("Enter a word to rhyme…")
+        self.rhyme_completer = WordCompleter(self.rhyme_input)
 
         rs_row = QHBoxLayout()
         rs_row.setSpacing(10)
@@ -300,10 +306,13 @@ class LLDashboard(QWidget):
         stats_row = QHBoxLayout()
         stats_row.setSpacing(10)
 
-        self.stat_writing_time = self._stat_tile("<h4>Writing time (recently)</h4>", "0")
-        self.stat_sessions = self._stat_tile("<h4>Sessions (recently)</h4>", "0")
-        self.stat_new_songs = self._stat_tile("<h4>New songs</h4>", "0")
+        # calendar week (stats_db.ROLLUPS), not the last 7 days
+        self.stat_writing_time = self._stat_tile("<h4>Writing time (since Monday)</h4>", "0")
+        self.stat_sessions = self._stat_tile("<h4>Sessions (since Monday)</h4>", "0")
+        self.stat_new_songs = self._stat_tile("<h4>New songs (since Monday)</h4>", "0")
         self.stat_num_songs = self._stat_tile("<h4>Total songs</h4>", "0")
+        for tile in (self.stat_writing_time, self.stat_sessions, self.stat_new_songs):
+            tile.setToolTip("this calendar week, Monday to Sunday")
 
         stats_row.addWidget(self.stat_writing_time)
         stats_row.addWidget(self.stat_sessions)
@@ -398,29 +407,34 @@ class LLDashboard(QWidget):
         s = writing_time % 60
         writing_time = f"{h:02d}:{m:02d}:{s:02d}"
 
-        res = self.stats.add_session(sessions)
-        sessions = res.get("new_ses", sessions)
-        self.set_stats(writing_time=writing_time, writing_sessions=sessions, new_songs=songs_num, num_songs=total_songs_num)
-        self.chart.fetch_data()
+        def session_added(res):
+            # the tile shows the week's sessions: read the rollup again now the session is counted
+            week_sessions = self.on_get_stats()[1] if res.get("status") else sessions
+            self.set_stats(writing_time=writing_time, writing_sessions=week_sessions,
+                           new_songs=songs_num, num_songs=total_songs_num)
+            self.chart.fetch_data()
+
+        self.writes.watch(get_writer().submit(Stats, "add_session", sessions), session_added)
 
     def save_writing_time(self, seconds):
-                
-        res = self.stats.add_writing_time(seconds)
 
-        if res.get("status"):
-            writing_time, sessions, songs_num, total_songs_num = self.on_get_stats()
+        def time_added(res):
+            if res.get("status"):
+                writing_time, sessions, songs_num, total_songs_num = self.on_get_stats()
 
-            h = writing_time // 3600
-            m = (writing_time % 3600) // 60
-            s = writing_time % 60
+                h = writing_time // 3600
+                m = (writing_time % 3600) // 60
+                s = writing_time % 60
 
-            writing_time = f"{h:02d}:{m:02d}:{s:02d}"
+                writing_time = f"{h:02d}:{m:02d}:{s:02d}"
 
-            self.set_stats(writing_time=writing_time, writing_sessions=sessions, new_songs=songs_num, num_songs=total_songs_num)
-            self.chart.refresh()
-            print(f"writing time: {seconds}")
-        
-        self.toast.show_toast(res.get("message"), "error")
+                self.set_stats(writing_time=writing_time, writing_sessions=sessions, new_songs=songs_num, num_songs=total_songs_num)
+                self.chart.refresh()
+                print(f"writing time: {seconds}")
+
+            self.toast.show_toast(res.get("message"), "error")
+
+        self.writes.watch(get_writer().submit(Stats, "add_writing_time", seconds), time_added)
 
     def set_recent_songs(self, songs: List[SongPreview]):
         """Convert SongPreview objects to tuples and display them."""
@@ -477,22 +491,22 @@ class LLDashboard(QWidget):
             self.toast.show_toast("Save note clicked (wire handler).", "info")
             return
         
-        if self._current_note_id:
-            res = self.on_update_note(self._current_note_id, content)
-            ok = bool(res.get("state", False))
-            print(ok)
-            msg = res.get("message", "Saved." if ok else "Could not save.")
-        else:
-            res = self.on_save_note(content)
+        def saved(res):
             ok = bool(res.get("state", False))
             print(ok)
             msg = res.get("message", "Saved." if ok else "Could not save.")
 
-        self.toast.show_toast(msg, "success" if ok else "error")
+            self.toast.show_toast(msg, "success" if ok else "error")
 
-        # refresh list after save
-        if self.on_refresh_notes:
-            self.set_notes(self.on_refresh_notes())
+            # refresh list after save
+            if self.on_refresh_notes:
+                self.set_notes(self.on_refresh_notes())
+
+        if self._current_note_id:
+            saved(self.on_update_note(self._current_note_id, content))
+        else:
+            # a write-behind Future: the toast and refresh follow the commit
+            self.writes.watch(self.on_save_note(content), saved)
 
     def delete_selected_note(self):
         item = self.notes_list.currentItem()
@@ -10,13 +10,14 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QTextCursor
 from PySide6.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QSplitter, QTextEdit, QVBoxLayout, QWidget
 
+from ui.block_tally import BlockTally, count_words
+from ui.line_gutter import LineGutter
+
 
 class EditorPanel(QWidget):
     def __init__(
         self,
-        autosave_cb: Callable[[], None],
-        update_word_count_cb: Callable[[], None],
-        update_syllables_cb: Callable[[], None],
+        line_syllables: Callable[[str], int],
         wc_icon_path: Path,
         parent: Optional[QWidget] = None,
     ):
@@ -56,17 +57,36 @@ class EditorPanel(QWidget):
         self.writing_editor = QTextEdit()
         self.writing_editor.setMinimumSize(400, 300)
         self.writing_editor.setPlaceholderText("Type your lyrics here")
-        self.writing_editor.textChanged.connect(update_word_count_cb)
-        self.writing_editor.textChanged.connect(update_syllables_cb)
-        self.writing_editor.textChanged.connect(autosave_cb)
-        self.splitter.addWidget(self.writing_editor)
+
+        # syllables per line, re-measured only for the lines an edit touches
+        self.syllable_tally = BlockTally(self.writing_editor.document(), line_syllables, parent=self)
+        self.syllable_gutter = LineGutter(self.writing_editor, self.syllable_tally)
+
+        writing_row = QWidget()
+        writing_layout = QHBoxLayout(writing_row)
+        writing_layout.setContentsMargins(0, 0, 0, 0)
+        writing_layout.setSpacing(0)
+        writing_layout.addWidget(self.writing_editor, 1)
+        writing_layout.addWidget(self.syllable_gutter)
+        self.splitter.addWidget(writing_row)
 
         self.word_count_label = QLabel(
             f'<img src="{str(self.wc_icon_path)}" width="40" height="40">'
             f'<span style="font-size: 20px;"> ⁚ 0</span>'
         )
         self.word_count_label.setToolTip("word count")
-        self.layout.addWidget(self.word_count_label)
+
+        # per-line word counts, updated from the edited lines only
+        self.word_tally = BlockTally(self.writing_editor.document(), count_words, parent=self)
+        self.word_tally.changed.connect(lambda *_: self.set_word_count(self.word_tally.total))
+
+        # filled in by the change scheduler once typing pauses
+        self.analysis_label = QLabel("")
+        status_row = QHBoxLayout()
+        status_row.addWidget(self.word_count_label)
+        status_row.addStretch(1)
+        status_row.addWidget(self.analysis_label)
+        self.layout.addLayout(status_row)
 
         self.display_editor = QTextEdit()
         self.display_editor.setReadOnly(True)
@@ -81,6 +101,10 @@ class EditorPanel(QWidget):
             f'<span style="font-size: 20px;"> ⁚ {count}</span>'
         )
 
+    def set_analysis_status(self, text: str, details: str = "") -> None:
+        self.analysis_label.setText(text)
+        self.analysis_label.setToolTip(details)
+
     def load_song_fields(self, title: str, artist: str, album: str, genre: str, mood: str) -> None:
         self.song_title_input.setText(title or "")
         self.song_artist_input.setText(artist or "")
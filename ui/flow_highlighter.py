@@ -0,0 +1,171 @@
+"""
+Always-on stress and rhyme highlighting for the writing editor.
+
+- Stressed syllables are bold and coloured; words CMU does not know get a
+  dotted underline. With a G2PResolver, request_unknown() sends them off
+  for a guess once typing pauses (ChangeScheduler.idle), skipping the block
+  being typed in so half-typed words never reach the model. Once a guess
+  lands only the blocks containing it are re-highlighted (the guessed stress
+  is shown, the dotted underline stays).
+- The last word of every line is underlined in a colour picked from its
+  rhyme family, so lines that rhyme share a colour.
+
+Everything a block needs is in its own text, so the block state never changes
+and an edit only re-highlights the edited block. Formats are cached per line
+text; word phonetics come from the shared lexicon.
+"""
+from __future__ import annotations
+
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextDocument
+
+from Rhyme_engine.phonetic_lexicon import get_lexicon
+from Rhyme_engine.rhyme_families import family_key
+from ui.g2p_resolver import G2PResolver
+
+_WORD = re.compile(r"[A-Za-z']+")
+_VOWEL_GROUP = re.compile(r"[aeiouy]+", re.IGNORECASE)
+
+STRESS_COLOR = QColor("#2e7d32")
+RHYME_COLORS = [QColor(c) for c in (
+    "#e53935", "#1e88e5", "#8e24aa", "#fb8c00", "#00897b",
+    "#d81b60", "#3949ab", "#7cb342", "#6d4c41", "#00acc1",
+)]
+
+Span = Tuple[int, int, str]  # (start, length, format name)
+
+
+@lru_cache(maxsize=8192)
+def syllable_spans(word: str, syllables: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Rough character spans for each syllable of `word`: one per vowel group
+    (each taking the consonant before it), else an even split.
+    """
+    n = len(word)
+    if syllables <= 1 or n == 0:
+        return ((0, n),)
+    groups = [m.start() for m in _VOWEL_GROUP.finditer(word)]
+    if len(groups) > syllables and word.lower().endswith("e") and groups[-1] == n - 1:
+        groups.pop()  # silent final e
+    if len(groups) == syllables:
+        starts = [0] + [max(g - 1, groups[i] + 1) for i, g in enumerate(groups[1:])]
+    else:
+        starts = [round(i * n / syllables) for i in range(syllables)]
+    ends = starts[1:] + [n]
+    return tuple((s, e - s) for s, e in zip(starts, ends))
+
+
+# formats merged over what is already there instead of replacing it
+_OVERLAYS = ("r", "?")
+
+
+class FlowHighlighter(QSyntaxHighlighter):
+    def __init__(self, document: QTextDocument, cache_size: int = 4096, resolver: Optional[G2PResolver] = None):
+        super().__init__(document)
+        self.cache_size = cache_size
+        self._cache: Dict[str, List[Span]] = {}
+        self._unknown: Dict[str, Tuple[str, ...]] = {}  # line text -> words CMU lacks
+        self.resolver = resolver
+        if resolver is not None:
+            resolver.resolved.connect(self._on_resolved)
+
+        self.formats: Dict[str, QTextCharFormat] = {}
+        stressed = QTextCharFormat()
+        stressed.setFontWeight(QFont.Bold)
+        stressed.setForeground(STRESS_COLOR)
+        self.formats["S"] = stressed
+        unknown = QTextCharFormat()
+        unknown.setUnderlineStyle(QTextCharFormat.DotLine)
+        self.formats["?"] = unknown
+        for i, color in enumerate(RHYME_COLORS):
+            fmt = QTextCharFormat()
+            fmt.setUnderlineStyle(QTextCharFormat.SingleUnderline)
+            fmt.setUnderlineColor(color)
+            self.formats[f"r{i}"] = fmt
+
+    def spans(self, text: str) -> List[Span]:
+        spans = self._cache.get(text)
+        if spans is None:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+                self._unknown.clear()
+            spans = self._cache[text] = self._compute(text)
+        return spans
+
+    def _compute(self, text: str) -> List[Span]:
+        lex = get_lexicon()
+        spans: List[Span] = []
+        unknown: List[str] = []
+        last: Optional[Tuple[int, int, str]] = None
+        for m in _WORD.finditer(text):
+            word = m.group(0).strip("'")
+            if not word:
+                continue
+            start = m.start() + m.group(0).index(word[0])
+            entry = lex.lookup(word)
+            last = (start, len(word), word)
+            if not entry.phones and not entry.guessed:
+                spans.append((start, len(word), "?"))
+                unknown.append(word)
+                continue
+            for (s, n), mark in zip(syllable_spans(word, len(entry.stress)), entry.stress):
+                if mark == "S":
+                    spans.append((start + s, n, "S"))
+            if entry.guessed:
+                spans.append((start, len(word), "?"))
+
+        if last is not None:
+            start, n, word = last
+            pros = lex.prosodies(word)
+            if pros:
+                key = family_key(pros[0])
+                spans.append((start, n, f"r{zlib.crc32(key.encode()) % len(RHYME_COLORS)}"))
+        if unknown:
+            self._unknown[text] = tuple(unknown)
+        return spans
+
+    def request_unknown(self, skip_block: int = -1) -> None:
+        """
+        Send the unknown words of every block but `skip_block` (the one
+        holding the cursor, still being typed) to the resolver.
+        """
+        if self.resolver is None:
+            return
+        words: List[str] = []
+        block = self.document().begin()
+        while block.isValid():
+            if block.blockNumber() != skip_block:
+                words.extend(self._unknown.get(block.text(), ()))
+            block = block.next()
+        if words:
+            self.resolver.request(words)
+
+    def _on_resolved(self, words: Iterable[str]) -> None:
+        resolved: Set[str] = set(words)
+        self._cache = {t: s for t, s in self._cache.items() if not self._mentions(t, resolved)}
+        self._unknown = {t: w for t, w in self._unknown.items() if t in self._cache}
+        block = self.document().begin()
+        while block.isValid():
+            if self._mentions(block.text(), resolved):
+                self.rehighlightBlock(block)
+            block = block.next()
+
+    @staticmethod
+    def _mentions(text: str, words: Set[str]) -> bool:
+        return any(m.group(0).strip("'").lower() in words for m in _WORD.finditer(text))
+
+    def highlightBlock(self, text: str) -> None:
+        for start, n, name in self.spans(text):
+            fmt = self.formats[name]
+            if name.startswith(_OVERLAYS):
+                # keep the stress colouring underneath, add the underline
+                for i in range(start, start + n):
+                    merged = QTextCharFormat(self.format(i))
+                    merged.merge(fmt)
+                    self.setFormat(i, 1, merged)
+            else:
+                self.setFormat(start, n, fmt)
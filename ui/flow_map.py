@@ -0,0 +1,77 @@
+"""
+Flow map renderer: writes lines and their stress patterns straight into a
+QTextEdit document with QTextCursor/QTextCharFormat, instead of building an
+HTML string for setHtml.
+
+Consecutive marks with the same format are inserted as one run, all inside a
+single edit block, so a 200-line song is a few hundred insertions. append()
+adds more lines to the map already on screen.
+"""
+from __future__ import annotations
+
+from itertools import groupby
+from typing import List, Optional, Sequence
+
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+from PySide6.QtWidgets import QTextEdit
+
+from services.flow_analysis import column_alignment
+
+
+def _char_format(color: Optional[str] = None, bold: bool = False) -> QTextCharFormat:
+    fmt = QTextCharFormat()
+    if color:
+        fmt.setForeground(QColor(color))
+    fmt.setFontWeight(QFont.Bold if bold else QFont.Normal)
+    return fmt
+
+
+class FlowMapRenderer:
+    def __init__(self, view: QTextEdit):
+        self.view = view
+        self.alignment: List[Optional[bool]] = []
+        self.formats = {
+            "line": _char_format(bold=True),
+            "aligned": _char_format("green", bold=True),
+            "misaligned": _char_format("red", bold=True),
+            "u": _char_format("gray"),
+            "plain": _char_format(),
+        }
+
+    def _mark_format(self, char: str, column: int) -> str:
+        if char == "S":
+            aligned = self.alignment[column] if column < len(self.alignment) else None
+            return "aligned" if aligned else "misaligned"
+        return "u" if char == "u" else "plain"
+
+    def _write_line(self, cursor: QTextCursor, line: str, pattern: str) -> None:
+        if not cursor.atStart():
+            cursor.insertBlock()
+        cursor.insertText(line, self.formats["line"])
+        cursor.insertBlock()
+        runs = groupby(enumerate(pattern), key=lambda ic: self._mark_format(ic[1], ic[0]))
+        for name, chars in runs:
+            text = "".join(c if c in "Su" else " " for _, c in chars)
+            cursor.insertText(text, self.formats[name])
+        cursor.insertBlock()
+
+    def render(self, patterns: Sequence[str], lines: Sequence[str], footer: str = "") -> None:
+        """Replace the view's content with the flow map of `lines`."""
+        self.alignment = column_alignment(list(patterns))
+        self.view.clear()
+        self.append(patterns, lines, footer)
+
+    def append(self, patterns: Sequence[str], lines: Sequence[str], footer: str = "") -> None:
+        """
+        Add lines below the current map. Columns are coloured with the
+        alignment from the last render(); call render() to recompute it.
+        """
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for line, pattern in zip(lines, patterns):
+            self._write_line(cursor, line, pattern)
+        if footer:
+            cursor.insertBlock()
+            cursor.insertText(footer, self.formats["line"])
+        cursor.endEditBlock()
@@ -0,0 +1,75 @@
+"""
+Background G2P for words CMU does not know.
+
+Views render right away with the "?" placeholder and call request() with the
+unknown words they saw. Requests are batched, resolved on one worker thread
+(PhoneticLexicon.resolve_g2p: the G2P caches, then the model), and
+`resolved` fires on the GUI thread with the words that now have a guess, so
+views re-render only what contained them.
+
+Guesses stay in memory unless requested with persist=True (words of saved
+lyrics, explicit lookups): only those reach the user's g2p_cache.json.
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Set
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from Rhyme_engine.phonetic_lexicon import PhoneticLexicon, get_lexicon
+
+logger = logging.getLogger(__name__)
+
+
+class G2PResolver(QObject):
+    resolved = Signal(list)  # words whose lexicon entry changed
+
+    def __init__(self, lexicon: Optional[PhoneticLexicon] = None, batch_ms: int = 150, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.lexicon = lexicon or get_lexicon()
+        self._queued: Set[str] = set()
+        self._seen: Set[str] = set()  # requested once already (resolved or not resolvable)
+        self._queued_persist: Set[str] = set()
+        self._persisted: Set[str] = set()
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="g2p")
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(batch_ms)
+        self._timer.timeout.connect(self._flush)
+
+    def request(self, words: Iterable[str], persist: bool = False) -> None:
+        words = {w.lower() for w in words}
+        fresh = words - self._seen
+        keep = words - self._persisted if persist else set()
+        if not fresh and not keep:
+            return
+        self._seen |= fresh
+        self._queued |= fresh
+        self._persisted |= keep
+        self._queued_persist |= keep
+        self._timer.start()
+
+    def _flush(self) -> None:
+        if self._closed:
+            return
+        batch = sorted(self._queued | self._queued_persist)
+        persist, self._queued, self._queued_persist = self._queued_persist, set(), set()
+        self._pool.submit(self._run, batch, persist)
+
+    def _run(self, batch: List[str], persist: Set[str]) -> None:
+        try:
+            changed = self.lexicon.resolve_g2p(batch, persist=persist)
+        except Exception as e:
+            logger.debug(f"G2P batch failed: {e}")
+            return
+        if changed:
+            self.resolved.emit(changed)
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self._timer.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,49 @@
+"""
+Narrow gutter beside a QTextEdit that shows one number per line (block),
+e.g. the syllable count from a BlockTally. Only visible lines are painted.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from PySide6.QtCore import QPoint, QRect, QSize, Qt
+from PySide6.QtGui import QPainter
+from PySide6.QtWidgets import QTextEdit, QWidget
+
+from ui.block_tally import BlockTally
+
+
+class LineGutter(QWidget):
+    def __init__(self, editor: QTextEdit, tally: BlockTally, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.editor = editor
+        self.tally = tally
+        self.setToolTip("syllables per line")
+
+        tally.changed.connect(lambda *_: self.update())
+        editor.verticalScrollBar().valueChanged.connect(lambda *_: self.update())
+        editor.document().documentLayout().documentSizeChanged.connect(lambda *_: self.update())
+
+    def sizeHint(self) -> QSize:
+        return QSize(self.fontMetrics().horizontalAdvance("999") + 12, 0)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.setPen(self.palette().placeholderText().color())
+
+        layout = self.editor.document().documentLayout()
+        viewport = self.editor.viewport()
+        # editor viewport coordinates -> gutter coordinates
+        dy = self.mapFromGlobal(viewport.mapToGlobal(QPoint(0, 0))).y() - self.editor.verticalScrollBar().value()
+
+        block = self.editor.cursorForPosition(QPoint(0, 0)).block()
+        while block.isValid():
+            top = int(layout.blockBoundingRect(block).top()) + dy
+            if top > self.height():
+                break
+            value = self.tally.value(block.blockNumber())
+            if block.text().strip() and value:
+                line = block.layout().lineAt(0)
+                height = int(line.height()) if line.isValid() else self.fontMetrics().height()
+                painter.drawText(QRect(0, top, self.width() - 6, height), Qt.AlignRight | Qt.AlignVCenter, str(value))
+            block = block.next()
@@ -9,12 +9,14 @@ from __future__ import annotations
 import logging
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 import requests
 from Rhyme_engine.rhyme_engine import find_rhymes_api
+from Rhyme_engine.mondegreen import find_mondegreens, phone_trie_ready, warm_phone_trie
+from Rhyme_engine.line_filler import fill_line
+from Rhyme_engine.rhyme_families import load_families
+from Rhyme_engine.phonetic_lexicon import get_lexicon
 import numpy as np
-import pyphen
-import pronouncing
 import sounddevice as sd
 from scipy.io.wavfile import write
 
@@ -25,18 +27,28 @@ from PySide6.QtWidgets import (
     QSplitter, QWidget, QStackedWidget, QPushButton, QVBoxLayout, QLabel
 )
 
+from db_writer import get_writer
+from lyrics_db import Lyrics
 from services.autosave import Autosaver
-from services.flow_analysis import alignment_score, get_stress_pattern, highlight_flow
+from services.flow_analysis import alignment_score, document_flow, get_stress_pattern, rhyme_scheme
 from services.generation import GenerationService
 from services.lexicon import LexiconService
-from services.lyrics_library import LyricsLibrary, Song
+from services.meter import analyze_meter
+from services.lyrics_library import LyricsLibrary, Song, shared_vocabulary
 from services.preferences import Preferences, ThemeManager
+from services.song_analysis import SongAnalysis, line_syllables, stanza_scheme
+from ui.change_scheduler import ChangeScheduler
 from ui.editor import EditorPanel
+from ui.flow_highlighter import FlowHighlighter
+from ui.flow_map import FlowMapRenderer
+from ui.g2p_resolver import G2PResolver
 from ui.sidebar_rail import SidebarRail
-from ui.sidebar_songs import SongsSidebar
+from ui.sidebar_songs import SONG_ORIGIN_ROLE, SongsSidebar
 from ui.sidebar_tools import ToolsSidebar
 from ui.timer import FloatingTimer
 from ui.versions_window import VersionsWindow
+from ui.word_completer import WordCompleter
+from ui.write_results import WriteResults
 from online_features import LyricalLabAPI  # file
 from services.online_gate import OnlineFeatureGate
 
@@ -51,7 +63,7 @@ logging.disable()
 
 CONFIG_FILE = Path(__file__).parent.parent / "noteworthy files/config.json"
 TEMP_FILE = Path(__file__).parent.parent / "noteworthy files/temp.txt"
-dic = pyphen.Pyphen(lang="en")
+SONG_PAGE_SIZE = 100
 
 
 class RecorderThread(QThread):
@@ -115,6 +127,9 @@ class MProsody(QWidget):
         self.sidebar_expanded_width = 200 #340
 
         self.current_song_id: Optional[int] = None
+        self._songs_query = ""
+        self._songs_after = None  # (updated_at, id) keyset of the next songs page
+        self._local_song_count = 0
         self.current_sidebar_face = SidebarMode.TOOLS
 
         # --- services ---
@@ -124,6 +139,9 @@ class MProsody(QWidget):
         self.generation = GenerationService()
         self.lexicon = LexiconService()
         self.library = LyricsLibrary()
+        self.writes = WriteResults(self)  # write-behind results back on the GUI thread
+        self.song_analysis = SongAnalysis()
+        warm_phone_trie()  # mondegreen queries; ~1.5 s of CMU indexing kept off the GUI thread
 
         # recorder thread (legacy)
         self.m_recorder = RecorderThread()
@@ -162,16 +180,43 @@ class MProsody(QWidget):
         # show on startup
         self.online_gate.run_startup_prompt_if_needed()
 
+        # fill the analysis cache for songs saved before it existed (background thread)
+        QTimer.singleShot(2000, self.warm_analysis_cache)
+
     # UI building
     def _build_editor(self):
         wc_icon = Path(__file__).parent / "Icons/icons8-word-file-64.png"
         self.editor = EditorPanel(
-            autosave_cb=self.autosave,
-            update_word_count_cb=self.update_word_count,
-            update_syllables_cb=self.update_syllable_counts,
+            line_syllables=self.line_syllable_count,
             wc_icon_path=wc_icon,
         )
 
+        self.flow_map = FlowMapRenderer(self.editor.display_editor)
+        self._flow_map_lines: List[str] = []
+
+        # unknown words get a G2P guess in the background; views re-render what contained them
+        self.g2p_resolver = G2PResolver(parent=self)
+        self.g2p_resolver.resolved.connect(self.on_g2p_resolved)
+
+        # live stress / rhyme colouring, re-highlighting only the edited line
+        self.flow_highlighter = FlowHighlighter(self.editor.writing_editor.document(), resolver=self.g2p_resolver)
+
+        # analysis runs off the GUI thread once typing pauses
+        self.changes = ChangeScheduler(self.editor.writing_editor, parent=self)
+        self.changes.register("flow", document_flow, self.show_flow_status)
+        self.changes.register("rhyme scheme", lambda text: rhyme_scheme(text.splitlines()), self.show_rhyme_scheme)
+        self.changes.register("autosave", self.autosaver.maybe_save)
+        # G2P only for words in lines the writer has moved on from
+        self.changes.idle.connect(
+            lambda: self.flow_highlighter.request_unknown(self.editor.writing_editor.textCursor().blockNumber())
+        )
+        self._flow_status = ""
+        self._scheme_status = ""
+
+        # the worker pools are not daemon threads: drop their queued jobs when the studio
+        # closes, or when the app quits with it still open, so exit never waits on them
+        QApplication.instance().aboutToQuit.connect(self.shutdown_workers)
+
     def _build_sidebars(self):
         icons_dir = Path(__file__).parent / "Icons"
 
@@ -188,6 +233,7 @@ class MProsody(QWidget):
             on_about=self.about_app,
             on_new_song=self.start_new_song
         )
+        self.word_completer = WordCompleter(self.tools.prompt2_area)
         # hook mode radio buttons
         self.tools.lyric_gen_mode.toggled.connect(self.update_search_mode)
         self.tools.fos_gen_mode.toggled.connect(self.update_search_mode)
@@ -199,7 +245,8 @@ class MProsody(QWidget):
             on_delete=self.on_delete_song,
             on_view_versions=self.view_song_versions,
             on_upload_song=self.upload_song,
-            on_download=self.download_song_from_cloud
+            on_download=self.download_song_from_cloud,
+            on_scrolled_to_end=self.load_more_songs,
         )
 
         # stacked (tools/songs)
@@ -491,8 +538,13 @@ class MProsody(QWidget):
         opt = self.tools.options_list
         
         if part == opt[0]:
-            # Handle rhymes with formatted HTML output
-            res = find_rhymes_api(word)
+            # Handle rhymes with formatted HTML output; "desire :verb" filters by part of speech
+            word, _, pos = word.partition(":")
+            try:
+                res = find_rhymes_api(word.strip(), pos=pos.strip() or None)
+            except ValueError as e:
+                self.editor.display_editor.setPlainText(str(e))
+                return
             html_output = self._format_rhymes_result(res)
             self.editor.display_editor.setHtml(html_output)
         elif part == opt[1]:
@@ -540,6 +592,38 @@ class MProsody(QWidget):
                 return
             res = f"More general than '{word}': {self.lexicon.hypernyms(word)}"
             self.editor.display_editor.setPlainText(res)
+        elif part == opt[11]:
+            # offline: re-segments the phrase against the CMU phone trie
+            if not phone_trie_ready():
+                self.editor.display_editor.setPlainText("Still indexing pronunciations for mondegreens; try again in a moment.")
+                return
+            found = find_mondegreens(word)
+            lines = [f"{phrase}  (cost: {cost:.1f})" for phrase, cost in found]
+            res = f"Mondegreens / puns for '{word}':\n" + ("\n".join(lines) if lines else "None found.")
+            self.editor.display_editor.setPlainText(res)
+        elif part == opt[12]:
+            # "<stress template> [rhyme word]", biased toward the user's own catalog
+            # (counted in the background and refreshed on save, never scanned here)
+            template, _, rhyme = word.partition(" ")
+            try:
+                found = fill_line(template, rhyme_with=rhyme.strip() or None, catalog=shared_vocabulary().counts())
+            except ValueError as e:
+                self.editor.display_editor.setPlainText(str(e))
+                return
+            lines = [line for line, _ in found]
+            res = f"Lines for '{word}':\n" + ("\n".join(lines) if lines else "None found.")
+            self.editor.display_editor.setPlainText(res)
+        elif part == opt[13]:
+            # a word lists its families; a family id (e.g. AY1-ER0) lists its members,
+            # a slant tier (e.g. EY1-AH0) its families
+            families = load_families()
+            if families.size(word.upper()):
+                fids = [word.upper()]
+            else:
+                fids = families.families_in_tier(word) or families.families_of(word)
+            lines = [f"{fid} ({families.size(fid)} words): {', '.join(families.members(fid)[:60])}" for fid in fids]
+            res = f"Rhyme families for '{word}':\n" + ("\n\n".join(lines) if lines else "None found.")
+            self.editor.display_editor.setPlainText(res)
         else:
             if not self.online_gate.require_online("Homophones Query"):
                 return
@@ -613,64 +697,37 @@ class MProsody(QWidget):
     # -------------------------
     # Word count / syllables / autosave
     # -------------------------
-    def update_word_count(self):
-        words_num = len(self.editor.writing_editor.toPlainText().split())
-        self.editor.set_word_count(words_num)
+    def show_flow_status(self, score) -> None:
+        self._flow_status = f"flow {score:.2f}" if score is not None else ""
+        self._update_analysis_status()
+
+    def show_rhyme_scheme(self, scheme: str) -> None:
+        # the last stanza is what the writer is working on
+        self._scheme_status = f"scheme {scheme.split()[-1][-12:]}" if scheme.strip() else ""
+        self._update_analysis_status()
+
+    def _update_analysis_status(self) -> None:
+        text = "  ·  ".join(s for s in (self._flow_status, self._scheme_status) if s)
+        self.editor.set_analysis_status(text, self.changes.latency_report())
 
     def syllable_count(self, word: str) -> int:
-        phones = pronouncing.phones_for_word(word)
-        if not phones:
-            return len(dic.inserted(word).split("-"))
-        return pronouncing.syllable_count(phones[0])
-
-    def update_syllable_counts(self):
-        lines = self.editor.writing_editor.toPlainText().splitlines()
-        results = []
-        # print ("you're writing")
-        for line in lines:
-            words = line.split()
-            results.append(f"{line}({sum(self.syllable_count(w) for w in words)})")
-        self.editor.display_editor.setPlainText("\n".join(results) if results else "")
-
-    def autosave(self):
-        self.autosaver.maybe_save(self.editor.writing_editor.toPlainText())
+        # CMU count, else pyphen; memoized per word by the shared lexicon
+        return get_lexicon().syllables(word)
+
+    def line_syllable_count(self, line: str) -> int:
+        return sum(self.syllable_count(w) for w in line.split())
 
     # Songs sidebar + DB
     def refresh_song_list(self, query: str):
 
         self.songs.clear()
-       
+        self._songs_query = query or ""
+        self._songs_after = None
+        self._local_song_count = 0
 
-
-        songs = self.library.list_songs()
-        if isinstance(songs, dict):
-            self.songs.add_item(QListWidgetItem(f"{songs.get('message', 'DB error')}"))
+        if not self.load_more_songs():
             return
 
-        q = (query or "").strip().lower()   
-        for row in songs:
-            if len(row) < 7:
-                continue
-
-            song_id, title, artist, album, genre, mood, lyrics, version, lyrics_hash, hash_algo, local_id, cloud_owner_id, cloud_song_id, cloud_status = row[:14]
-            hay = " ".join([str(title or ""), str(artist or ""), str(album or ""), str(genre or ""), str(mood or "")]).lower()
-            if q and q not in hay:
-                continue
-
-            print(f"cloud status: {cloud_status}")
-
-            label = f"{title} — {artist}"
-            if mood:
-                label += f"  ·  {mood}"
-            if cloud_status == "uploaded":
-                label += f"  ·  {cloud_status}"
-            elif cloud_status == "dirty": #downloaded
-                label += f"  ·  downloaded"
-
-            item = QListWidgetItem(label)
-            item.setData(Qt.UserRole, row)
-            self.songs.add_item(item, state=cloud_status)
-
         #cloud songs
         if not self.online_gate.require_online("Load cloud songs"):
             return
@@ -698,6 +755,7 @@ class MProsody(QWidget):
 
                     item = QListWidgetItem(label)
                     item.setData(Qt.UserRole, row)
+                    item.setData(SONG_ORIGIN_ROLE, "cloud")
                     self.songs.add_item(item, source=source)
                 print(f'row: {row}')
 
@@ -706,20 +764,82 @@ class MProsody(QWidget):
 
                 
 
+    def load_more_songs(self) -> bool:
+        """
+        Append the next page of local songs (title/artist/album/genre/mood
+        filtered in SQL, no lyrics) above the cloud songs. False on a DB error.
+        """
+        if self._local_song_count and self._songs_after is None:
+            return True  # no more pages
+        songs = self.library.list_songs(self._songs_query, limit=SONG_PAGE_SIZE, after=self._songs_after)
+        if isinstance(songs, dict):
+            self.songs.add_item(QListWidgetItem(f"{songs.get('message', 'DB error')}"))
+            return False
+
+        for row in songs:
+            song_id, title, artist, album, genre, mood, cloud_status, updated_at = row
+
+            label = f"{title} — {artist}"
+            if mood:
+                label += f"  ·  {mood}"
+            if cloud_status == "uploaded":
+                label += f"  ·  {cloud_status}"
+            elif cloud_status == "dirty": #downloaded
+                label += f"  ·  downloaded"
+
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, row)
+            self.songs.add_item(item, state=cloud_status, index=self._local_song_count)
+            self._local_song_count += 1
+
+        # keyset: the next page starts after the last row of this one
+        self._songs_after = (songs[-1][7], songs[-1][0]) if len(songs) == SONG_PAGE_SIZE else None
+        return True
+
     def on_song_clicked(self, item):
         row = item.data(Qt.UserRole)
-        if not row or len(row) < 7:
+        if not row:
+            return
+        if item.data(SONG_ORIGIN_ROLE) == "cloud":
+            if len(row) >= 7:
+                self.load_song(*row[:7])
             return
-        song_id, title, artist, album, genre, mood, lyrics = row[:7]
+        # listings carry no lyrics; fetch the song when it is opened
+        song = self.library.get_song_by_id(row[0])
+        if song:
+            self.load_song(*song[:7])
+
+    def load_song(self, song_id, title, artist, album, genre, mood, lyrics) -> None:
+        lyrics = lyrics or ""
+        record = self.song_analysis.cached(lyrics)
+        if record is not None:
+            # the syllable gutter measures every line on load; hand it the cached counts
+            self.editor.syllable_tally.prime(line_syllables(record))
+
         self.current_song_id = song_id
         self.editor.load_song_fields(title or "", artist or "", album or "", genre or "", mood or "")
-        self.editor.load_lyrics(lyrics or "")
+        self.editor.load_lyrics(lyrics)
+
+        if record is not None:
+            # the cached analysis is current: no re-run once the load's textChanged settles
+            self.changes.cancel()
+            self.flow_highlighter.request_unknown()
+            self.show_flow_status(record["alignment"])
+            self.show_rhyme_scheme(stanza_scheme(record))
+        else:
+            self.changes.flush()
+            self.song_analysis.warm(lyrics)
+
+    def warm_analysis_cache(self) -> None:
+        # read and hashed on the analysis thread, on its own connection
+        self.song_analysis.warm_catalog(lambda: LyricsLibrary().all_lyrics())
 
     def upload_song(self, song_id:int):
 
         if not self.online_gate.require_online("uploading songs"):
             return
 
+        get_writer().flush()  # upload what was saved, not what is still queued
         song_data = self.library.get_song_by_id(song_id)
         if not song_data:
             QMessageBox.warning(self, "Error", "Song not found.")
@@ -758,12 +878,18 @@ class MProsody(QWidget):
                 # print(response.json())
                 # print(f"Cloud song ID: {cloud_song_id}")
                 # print(f"owner_id {owner_id}")
-                res = self.library.db.update_after_upload(owner_id, cloud_song_id, client_uid, id)
-                if res['status']:
-                    QMessageBox.information(self, "Success", f"{response.json()['message']}")
-                    return
-                else:
-                    print(res['message'])
+                message = response.json()['message']
+
+                def uploaded(res):
+                    if res.get('status'):
+                        QMessageBox.information(self, "Success", f"{message}")
+                    else:
+                        print(res['message'])
+
+                self.writes.watch(
+                    get_writer().submit(Lyrics, "update_after_upload", owner_id, cloud_song_id, client_uid, id),
+                    uploaded,
+                )
             else:
                 QMessageBox.warning(self, "Error", f"Upload failed: {response}")
         except Exception as e:
@@ -780,6 +906,7 @@ class MProsody(QWidget):
         if reply == QMessageBox.Yes:
             result = self.library.delete_song(song_id)
             if result.get("state"):
+                shared_vocabulary().refresh_async()
                 self.refresh_song_list(self.songs.query())
                 if self.current_song_id == song_id:
                     self.editor.load_song_fields("", "", "", "", "")
@@ -794,6 +921,7 @@ class MProsody(QWidget):
         msg = self.library.db.save_downloaded_song(song_data)    
         print(f"The state is {msg}")
         if msg['state']:
+            shared_vocabulary().refresh_async()
             QMessageBox.information(self, "Download complete", msg['message'])
             self.refresh_song_list(self.songs.query())
             return
@@ -804,9 +932,13 @@ class MProsody(QWidget):
 
     def view_song_versions(self, song_id: int) -> None:
         """Open a window showing versions of the song."""
-        versions = self.library.get_song_versions(song_id)
+        # list only; each version is rebuilt from its diffs when selected
+        versions = self.library.get_song_versions(song_id, with_lyrics=False)
         if versions:
-            window = VersionsWindow(versions, self)
+            window = VersionsWindow(
+                versions, self,
+                load_lyrics=lambda version: self.library.get_song_version(song_id, version),
+            )
             window.exec()
         else:
             QMessageBox.information(self, "No Versions", "This song has no older versions.")
@@ -835,18 +967,25 @@ class MProsody(QWidget):
             lyrics=lyrics,
         )
        
-        if self.current_song_id is not None:
-            msg = self.library.update_song(self.current_song_id, song)
-            self.new_song_saved.emit()
-        else:
-            msg = self.library.create_song(song)
+        def saved(msg):
+            if msg.get("state"):
+                self.song_analysis.warm(lyrics)
+                # guesses for this song's words are worth keeping across sessions
+                lex = get_lexicon()
+                self.g2p_resolver.request((w for w in lyrics.split() if not lex.in_dictionary(w)), persist=True)
+                shared_vocabulary().refresh_async()
+                QMessageBox.information(self, "Done", msg.get("message", "Saved."))
+                self.refresh_song_list(self.songs.query())
+                self.new_song_saved.emit()
+            else:
+                QMessageBox.critical(self, "Error", msg.get("message", "Something went wrong."))
 
-        if msg.get("state"):
-            QMessageBox.information(self, "Done", msg.get("message", "Saved."))
-            self.refresh_song_list(self.songs.query())
-            self.new_song_saved.emit()
+        # written behind the GUI: the confirmation shows once the save is committed
+        if self.current_song_id is not None:
+            future = get_writer().submit(LyricsLibrary, "update_song", self.current_song_id, song)
         else:
-            QMessageBox.critical(self, "Error", msg.get("message", "Something went wrong."))
+            future = get_writer().submit(LyricsLibrary, "create_song", song)
+        self.writes.watch(future, saved)
 
     def start_new_song(self):
 
@@ -913,12 +1052,43 @@ class MProsody(QWidget):
             self.editor.display_editor.setPlainText("⚠️ No text selected.")
             return
 
-        lines = selected.splitlines()
+        self._flow_map_lines = selected.splitlines()
+        self._render_flow_map(self._flow_map_lines)
+        # words CMU lacks show as "?" now; the map is redrawn once G2P has guessed them
+        lex = get_lexicon()
+        self.g2p_resolver.request(
+            (w for line in self._flow_map_lines for w in line.split() if not lex.in_dictionary(w)), persist=True
+        )
+
+    def _render_flow_map(self, lines: List[str]):
         patterns = [get_stress_pattern(line) for line in lines]
-        html = highlight_flow(patterns, lines)
 
+        footer: List[str] = []
         score = alignment_score(patterns)
         if score is not None:
-            html += f"<b>Flow Alignment Score: {score:.2f}</b>"
+            footer.append(f"Flow Alignment Score: {score:.2f}")
+
+        meter = analyze_meter([p for p in patterns if p])
+        if meter.lines:
+            footer.append(
+                f"Meter: {meter.dominant_meter} · Grid: {meter.grid} "
+                f"({meter.bars} bar{'s' if meter.bars > 1 else ''}) · "
+                f"Beat consistency: {meter.consistency:.2f}"
+            )
+
+        self.flow_map.render(patterns, lines, "\n".join(footer))
+
+    def closeEvent(self, event):
+        self.shutdown_workers()
+        super().closeEvent(event)
+
+    def shutdown_workers(self):
+        self.changes.shutdown()
+        self.g2p_resolver.shutdown()
+        self.song_analysis.shutdown()
 
-        self.editor.display_editor.setHtml(html)
+    def on_g2p_resolved(self, words: List[str]):
+        # column alignment spans every line, so the whole map is redrawn (a few ms)
+        resolved = set(words)
+        if any(w.lower() in resolved for line in self._flow_map_lines for w in line.split()):
+            self._render_flow_map(self._flow_map_lines)
@@ -13,6 +13,11 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QAction, QColor, QIcon, QPixmap
 
+# item data: Qt.UserRole holds the row; this role says where it came from
+# ("cloud" for API rows, unset for local listing rows, see Lyrics.list_songs)
+SONG_ORIGIN_ROLE = Qt.UserRole + 1
+LOCAL_CLOUD_STATUS = 6  # index of cloud_status in a local listing row
+
 
 class SongsSidebar(QWidget):
     def __init__(
@@ -24,6 +29,7 @@ class SongsSidebar(QWidget):
         on_view_versions: Callable[[int], None],
         on_upload_song: Callable[[int], None],
         on_download: Callable[[], None],
+        on_scrolled_to_end: Optional[Callable[[], None]] = None,
         parent: Optional[QWidget] = None,
     ):
         super().__init__(parent)
@@ -88,32 +94,34 @@ class SongsSidebar(QWidget):
         self.list.itemClicked.connect(on_item_clicked)
         self.list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.list.customContextMenuRequested.connect(self._show_context_menu)
+        if on_scrolled_to_end is not None:
+            # the list is paged: reaching the bottom asks for the next page
+            bar = self.list.verticalScrollBar()
+            bar.valueChanged.connect(lambda value: value == bar.maximum() and on_scrolled_to_end())
         layout.addWidget(self.list, stretch=1)
 
     def clear(self) -> None:
         self.list.clear()
 
-    def add_item(self, item: QListWidgetItem, state=None, source=None) -> None:
+    def add_item(self, item: QListWidgetItem, state=None, source=None, index: Optional[int] = None) -> None:
     
         if state == "uploaded":
             item.setBackground(QColor("#a855f7"))  # Neon primary purple
-            self.list.addItem(item)
         
         elif state == "dirty":
             item.setBackground(QColor("#432064")) 
-            self.list.addItem(item)
 
             
         elif source == 'web':
             item.setBackground(QColor("#7c3aed"))  # Deep purple
-            self.list.addItem(item)
 
         elif source == 'desktop':
             item.setBackground(QColor("#c084fc"))  # Light purple
-            self.list.addItem(item)
 
-        else:
+        if index is None:
             self.list.addItem(item)
+        else:
+            self.list.insertItem(index, item)
 
 
 
@@ -166,8 +174,9 @@ class SongsSidebar(QWidget):
         row = item.data(Qt.UserRole)
 
         try:
-            source = row[13]
-            # cloud_status = 
+            if item.data(SONG_ORIGIN_ROLE) == "cloud":
+                raise LookupError("cloud row")
+            source = row[LOCAL_CLOUD_STATUS]
             print(f"source value {source}")
 
             if source == "uploaded":
@@ -183,7 +192,7 @@ class SongsSidebar(QWidget):
                 return
             
 
-        except IndexError as e:
+        except LookupError as e:
             #This is from cloud songs
             #check main_window.py, method -> refresh_song_list
             source = row[7]
@@ -104,9 +104,10 @@ class ToolsSidebar(QWidget):
         self.search_btn.clicked.connect(on_search_lexicon)
 
         self.options_list: List[str] = [
-            "Rhymes","Synonyms","Antonyms","Homophones","Related",
+            "Rhymes (e.g. desire :verb)","Synonyms","Antonyms","Homophones","Related",
             "Adjectives described by","Nouns described by","Spelling pattern match",
-            "hyponyms","Hypernyms","Sound alike"
+            "hyponyms","Hypernyms","Sound alike","Mondegreens / puns",
+            "Line filler (e.g. u-S-u-u-S fire)","Rhyme family (e.g. nation or AY1-ER0)"
         ]
         self.rhymes_n_lexicon = QComboBox()
         self.rhymes_n_lexicon.addItems(self.options_list)
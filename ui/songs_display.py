@@ -3,6 +3,7 @@ Songs display widget for showing songs in a card-based grid or list layout.
 """
 from __future__ import annotations
 
+import html
 from pathlib import Path
 from typing import Callable, List, Optional
 
@@ -13,6 +14,7 @@ from PySide6.QtWidgets import (
     QScrollArea, QGridLayout, QSpacerItem, QSizePolicy
 )
 from ui.glass_qss import SONGS_DISLAY_STYLE
+from lyrics_db import SNIPPET_END, SNIPPET_START
 
 class SongCard(QFrame):
     """Individual song card with title, artist, metadata, and actions."""
@@ -63,8 +65,16 @@ class SongCard(QFrame):
             meta_label.setWordWrap(True)
             layout.addWidget(meta_label)
         
-        # Lyrics preview
-        if lyrics:
+        # Lyrics preview: the matching fragment for search results, else the first line
+        snippet = song_data[7] if len(song_data) >= 8 else None
+        if snippet:
+            preview = html.escape(snippet.replace("\n", " / "))
+            preview = preview.replace(SNIPPET_START, "<b>").replace(SNIPPET_END, "</b>")
+            preview_label = QLabel(f"<i>\"{preview}\"</i>")
+            preview_label.setStyleSheet("font-size: 10px; color: #666; margin-top: 6px;")
+            preview_label.setWordWrap(True)
+            layout.addWidget(preview_label)
+        elif lyrics:
             preview = (lyrics.strip().splitlines()[0])[:80]
             preview_label = QLabel(f"<i>\"{preview}{'...' if len(lyrics) > 80 else ''}\"</i>")
             preview_label.setStyleSheet("font-size: 10px; color: #666; margin-top: 6px;")
@@ -4,9 +4,9 @@ from dataclasses import dataclass
 from datetime import datetime, date
 from typing import List, Tuple, Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QPointF, QTimer
 from PySide6.QtGui import QPainter
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
 
 from PySide6.QtCharts import (
     QChart,
@@ -17,6 +17,8 @@ from PySide6.QtCharts import (
 )
 from PySide6.QtCore import QDateTime
 
+from services.downsample import lttb
+
 @dataclass(frozen=True)
 class WritingStatRow:
     writing_time: int  
@@ -24,12 +26,19 @@ class WritingStatRow:
     created_at: date
 
 
+MIN_POINTS = 50
+MAX_POINTS = 1000
+
+# combo label -> Stats.get_series period (weeks and months come from the rollup tables)
+PERIODS = {"Daily": "day", "Weekly": "week", "Monthly": "month"}
+
+
 class WritingStatsChart(QWidget):
     """
     Charts:
-      - Sessions per day (left Y axis)
-      - Writing time per day (right Y axis)
-    X axis: date
+      - Sessions per day, week or month (left Y axis)
+      - Writing time per day, week or month (right Y axis)
+    X axis: date (first day of the period)
     """
 
     def __init__(self, stats):
@@ -38,6 +47,15 @@ class WritingStatsChart(QWidget):
         self.title = QLabel("Writing Stats (Sessions & Writing Time)")
         self.title.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
 
+        self.period = "day"
+        self.period_box = QComboBox()
+        self.period_box.addItems(list(PERIODS))
+        self.period_box.currentTextChanged.connect(self._period_changed)
+
+        header = QHBoxLayout()
+        header.addWidget(self.title, 1)
+        header.addWidget(self.period_box)
+
         self.chart = QChart()
         self.chart.setAnimationOptions(QChart.SeriesAnimations)
         self.chart.legend().setVisible(True)
@@ -47,7 +65,7 @@ class WritingStatsChart(QWidget):
         self.chart_view.setRenderHint(QPainter.Antialiasing)
 
         layout = QVBoxLayout(self)
-        layout.addWidget(self.title)
+        layout.addLayout(header)
         layout.addWidget(self.chart_view)
 
         # Series
@@ -88,57 +106,70 @@ class WritingStatsChart(QWidget):
 
         self.stats = stats
 
+        # drag to zoom into a date range (right click zooms out); the visible
+        # range is then reloaded and downsampled again
+        self.chart_view.setRubberBand(QChartView.HorizontalRubberBand)
+        self._rendering = False
+        self._visible: Tuple[str, str] = ("", "")
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(120)
+        self._reload_timer.timeout.connect(lambda: self.refresh(start=self._visible[0], end=self._visible[1]))
+        self.axis_x.rangeChanged.connect(self._visible_range_changed)
+
         # Initial render
         self.refresh()
 
-    def fetch_data(self, local_profile_id: int = 1) -> List[WritingStatRow]:
-        raw_rows = self.stats.get_stats()
+    def _period_changed(self, label: str):
+        self.period = PERIODS[label]
+        self.refresh()
 
-        rows: List[WritingStatRow] = []
-        for _id, writing_time, sessions, created_at, pid in raw_rows:
-            if pid != local_profile_id:
-                continue
-            d = datetime.strptime(created_at, "%Y-%m-%d").date()
-            rows.append(WritingStatRow(writing_time=writing_time, sessions=sessions, created_at=d))
+    def _visible_range_changed(self, start: QDateTime, end: QDateTime):
+        # zoom/pan: reload just the visible dates at full detail (debounced)
+        if self._rendering:
+            return
+        self._visible = (start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd"))
+        self._reload_timer.start()
 
-        # sort by date ascending for a nice line
-        rows.sort(key=lambda r: r.created_at)
-        return rows
+    def fetch_data(self, local_profile_id: int = 1, start: Optional[str] = None, end: Optional[str] = None) -> List[WritingStatRow]:
+        # already filtered, summed per period and ordered by date in SQL
+        raw_rows = self.stats.get_series(self.period, local_profile_id, start=start, end=end)
+        return [
+            WritingStatRow(writing_time=writing_time, sessions=sessions, created_at=date.fromisoformat(created_at))
+            for created_at, writing_time, sessions in raw_rows
+        ]
 
     # Chart rendering
-    def refresh(self, local_profile_id: int = 1):
-        rows = self.fetch_data(local_profile_id=local_profile_id)
-
-        # Clear old points
-        self.series_sessions.clear()
-        self.series_time.clear()
+    def refresh(self, local_profile_id: int = 1, start: Optional[str] = None, end: Optional[str] = None):
+        rows = self.fetch_data(local_profile_id=local_profile_id, start=start, end=end)
 
         if not rows:
+            self.series_sessions.clear()
+            self.series_time.clear()
             self.chart.setTitle("No data")
             return
 
-        # Convert dates to milliseconds since epoch via QDateTime
-        # Use noon time to avoid DST edge weirdness
-        xs: List[QDateTime] = []
-        max_sessions = 0
-        max_time = 0
-
-        for r in rows:
-            qdt = QDateTime(r.created_at.year, r.created_at.month, r.created_at.day, 12, 0, 0)
-            x = qdt.toMSecsSinceEpoch()
-            xs.append(qdt)
+        # x: milliseconds since epoch at local noon (avoids DST edge weirdness)
+        xs = [datetime(r.created_at.year, r.created_at.month, r.created_at.day, 12).timestamp() * 1000 for r in rows]
 
-            self.series_sessions.append(x, r.sessions)
-            self.series_time.append(x, r.writing_time)
+        # about one point per horizontal pixel; LTTB keeps the peaks
+        target = min(max(self.chart_view.width(), MIN_POINTS), MAX_POINTS)
+        sessions = lttb(list(zip(xs, (r.sessions for r in rows))), target)
+        writing_time = lttb(list(zip(xs, (r.writing_time for r in rows))), target)
 
-            max_sessions = max(max_sessions, r.sessions)
-            max_time = max(max_time, r.writing_time)
+        self._rendering = True
+        try:
+            # one bulk replace per series instead of an append (and repaint) per point
+            self.series_sessions.replace([QPointF(x, y) for x, y in sessions])
+            self.series_time.replace([QPointF(x, y) for x, y in writing_time])
 
-        # X range
-        self.axis_x.setRange(xs[0], xs[-1])
+            # X range
+            self.axis_x.setRange(QDateTime.fromMSecsSinceEpoch(int(xs[0])), QDateTime.fromMSecsSinceEpoch(int(xs[-1])))
 
-        # Y ranges with a little headroom
-        self.axis_y_left.setMax(max(1, int(max_sessions * 1.2)))
-        self.axis_y_right.setMax(max(1, int(max_time * 1.2)))
+            # Y ranges with a little headroom
+            self.axis_y_left.setMax(max(1, int(max(r.sessions for r in rows) * 1.2)))
+            self.axis_y_right.setMax(max(1, int(max(r.writing_time for r in rows) * 1.2)))
+        finally:
+            self._rendering = False
 
-        self.chart.setTitle("Writing Stats")
\ No newline at end of file
+        self.chart.setTitle("Writing Stats")
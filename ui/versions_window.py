@@ -2,8 +2,13 @@ from PySide6.QtWidgets import QDialog, QVBoxLayout, QListWidget, QListWidgetItem
 from PySide6.QtCore import Qt
 
 class VersionsWindow(QDialog):
-    def __init__(self, versions, parent=None):
+    def __init__(self, versions, parent=None, load_lyrics=None):
+        """
+        load_lyrics(version_num) -> str rebuilds a version's lyrics when it is
+        selected, for versions listed without them (lyrics None).
+        """
         super().__init__(parent)
+        self.load_lyrics = load_lyrics
         self.setWindowTitle("Song Versions")
         self.setMinimumSize(600, 400)
         
@@ -39,4 +44,7 @@ class VersionsWindow(QDialog):
     def on_version_selected(self, item):
         if item:
             version = item.data(Qt.UserRole)
-            self.lyrics_text.setPlainText(version[3])  # lyrics</content>
+            lyrics = version[3]
+            if lyrics is None and self.load_lyrics:
+                lyrics = self.load_lyrics(version[2])
+            self.lyrics_text.setPlainText(lyrics or "")  # lyrics</content>
@@ -0,0 +1,72 @@
+"""
+Typeahead popup for word inputs (rhyme box, lexicon search box).
+
+Completes the last word of the line, so phrases and "desire :verb" style
+queries keep working. The writer's own words (shared_index() keeps them
+current) come first. Words without a dictionary pronunciation are marked
+"(G2P)": searching them works, but is slower.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QCompleter, QLineEdit
+
+from services.typeahead import TypeaheadIndex, shared_index
+
+_LAST_WORD = re.compile(r"[A-Za-z']+$")
+WORD_ROLE = Qt.UserRole + 1
+
+
+class WordCompleter(QCompleter):
+    def __init__(
+        self,
+        line_edit: QLineEdit,
+        index: Optional[TypeaheadIndex] = None,
+        min_chars: int = 2,
+        limit: int = 12,
+    ):
+        super().__init__(line_edit)
+        self.index = index or shared_index()
+        self.min_chars = min_chars
+        self.limit = limit
+
+        self._model = QStandardItemModel(self)
+        self.setModel(self._model)
+        self.setCompletionRole(WORD_ROLE)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setWidget(line_edit)
+        self.activated[str].connect(self._insert)
+
+        self._edit = line_edit
+        line_edit.textEdited.connect(self._update)
+
+    def _update(self, text: str) -> None:
+        m = _LAST_WORD.search(text)
+        prefix = m.group(0) if m else ""
+        self._model.clear()
+        if len(prefix) < self.min_chars:
+            self.popup().hide()
+            return
+
+        for word, known in self.index.suggest(prefix, self.limit):
+            item = QStandardItem(word if known else f"{word}  (G2P)")
+            item.setData(word, WORD_ROLE)
+            if not known:
+                item.setToolTip("No dictionary pronunciation: will be guessed with G2P")
+            self._model.appendRow(item)
+
+        if self._model.rowCount():
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def _insert(self, word: str) -> None:
+        text = self._edit.text()
+        m = _LAST_WORD.search(text)
+        head = text[:m.start()] if m else text
+        self._edit.setText(head + word)
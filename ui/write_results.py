@@ -0,0 +1,37 @@
+"""
+Results of write-behind DB writes (db_writer.py), delivered on the GUI thread.
+
+A DBWriter Future resolves on the writer thread; watch(future, callback)
+calls callback(result) on the GUI thread once the write is committed, with
+the DB method's usual {"message": ..., "state"/"status": ...} dict (an
+error dict if the call itself failed).
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+logger = logging.getLogger(__name__)
+
+
+class WriteResults(QObject):
+    _done = Signal(object, object)  # callback, future
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._done.connect(self._deliver)
+
+    def watch(self, future: Future, callback: Callable[[Any], None]) -> None:
+        future.add_done_callback(lambda f: self._done.emit(callback, f))
+
+    @staticmethod
+    def _deliver(callback: Callable[[Any], None], future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.debug(f"write failed: {e}")
+            result = {"message": "Error - Please try again", "state": False, "status": False}
+        callback(result)